@@ -0,0 +1,89 @@
+'''
+Memory and construction time of the order instructions: the slotted classes
+against the same dataclasses with __dict__ (the instructions before the slots).
+
+Run from the repository root:
+python benchmarks/instructions_memory.py
+'''
+from dataclasses import dataclass
+import os
+import sys
+import timeit
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from betfair_python_rest.forms import PlaceInstruction, LimitOrder, CancelInstruction  # noqa: E402
+
+COUNT = 20000
+
+
+@dataclass
+class DictLimitOrder:
+    size: float
+    price: float
+    persistence_type: str
+    time_in_force: str = None
+    min_fill_size: float = None
+    bet_target_type: str = None
+    bet_target_size: float = None
+
+
+@dataclass
+class DictPlaceInstruction:
+    selection_id: int
+    order_type: str
+    side: str
+    handicap: float = None
+    limit_order: DictLimitOrder = None
+    limit_on_close_order: object = None
+    market_on_close_order_liability: object = None
+    customer_order_ref: str = None
+
+    def __post_init__(self):
+        pass
+
+
+@dataclass
+class DictCancelInstruction:
+    bet_id: str
+    size_reduction: float = None
+
+
+def place_instructions(place_instruction_class, limit_order_class):
+    return [place_instruction_class(selection_id=index, order_type='LIMIT', side='BACK',
+                                    limit_order=limit_order_class(2.0, 1.5, 'LAPSE'))
+            for index in range(COUNT)]
+
+
+def cancel_instructions(cancel_instruction_class):
+    return [cancel_instruction_class(str(index), 1.0) for index in range(COUNT)]
+
+
+def measure(function, *args):
+    '''
+    :return: microseconds per instruction, bytes per instruction
+    '''
+    seconds = min(timeit.repeat(lambda: function(*args), number=1, repeat=5))
+    tracemalloc.start()
+    result = function(*args)
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del result
+    return seconds / COUNT * 1e6, size / COUNT
+
+
+def main():
+    print('{} instructions'.format(COUNT))
+    cases = (
+        ('PlaceInstruction + LimitOrder, __dict__', place_instructions, DictPlaceInstruction, DictLimitOrder),
+        ('PlaceInstruction + LimitOrder, slots', place_instructions, PlaceInstruction, LimitOrder),
+        ('CancelInstruction, __dict__', cancel_instructions, DictCancelInstruction),
+        ('CancelInstruction, slots', cancel_instructions, CancelInstruction),
+    )
+    for name, function, *args in cases:
+        print('{:42} {:6.2f} us, {:6.0f} bytes per instruction'.format(name, *measure(function, *args)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,85 @@
+'''
+Serialization of placeOrders request with 200 instructions: the generated serializers
+(form.data) against the hand-written data properties, which were used before them
+(each property built the dict with all keys and prune_empty() removed the None values).
+
+Run from the repository root:
+python benchmarks/serialize_forms.py
+'''
+import os
+import sys
+import timeit
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from betfair_python_rest.forms import PlaceOrderForm, PlaceInstruction, LimitOrder  # noqa: E402
+from betfair_python_rest.serialization import prune_empty, serialize_form  # noqa: E402
+
+INSTRUCTIONS = 200
+NUMBER = 500
+
+
+def legacy_limit_order_data(limit_order):
+    return {'size': limit_order.size, 'price': limit_order.price,
+            'persistenceType': limit_order.persistence_type, 'timeInForce': limit_order.time_in_force,
+            'minFillSize': limit_order.min_fill_size, 'betTargetType': limit_order.bet_target_type,
+            'betTargetSize': limit_order.bet_target_size}
+
+
+def legacy_place_instruction_data(instruction):
+    if instruction.market_on_close_order_liability:
+        market_close = {'liability': instruction.market_on_close_order_liability}
+    else:
+        market_close = None
+    return {'orderType': instruction.order_type, 'selectionId': instruction.selection_id,
+            'handicap': instruction.handicap, 'side': instruction.side,
+            'limitOrder': legacy_limit_order_data(instruction.limit_order) if instruction.limit_order else None,
+            'limitOnCloseOrder': None, 'marketOnCloseOrder': market_close,
+            'customerOrderRef': instruction.customer_order_ref}
+
+
+def legacy_place_order_data(form):
+    return {'marketId': form.market_id,
+            'instructions': [legacy_place_instruction_data(instruction) for instruction in form.instructions],
+            'customerRef': form.customer_ref, 'marketVersion': {'version': form.market_version},
+            'customerStrategyRef': form.customer_strategy_refs, 'async': form.is_async}
+
+
+def legacy(form):
+    return prune_empty(legacy_place_order_data(form))
+
+
+def make_form():
+    instructions = [PlaceInstruction(selection_id=1000 + index, order_type='LIMIT', side='BACK',
+                                     limit_order=LimitOrder(size=2.0, price=1.01 + index / 100,
+                                                            persistence_type='LAPSE'),
+                                     customer_order_ref='order-{}'.format(index))
+                    for index in range(INSTRUCTIONS)]
+    return PlaceOrderForm(market_id='1.234567', instructions=instructions, customer_ref='benchmark')
+
+
+def peak_memory(function, form):
+    '''
+    The peak of memory allocated by one call (the result and the temporary objects), KiB
+    '''
+    function(form)
+    tracemalloc.start()
+    function(form)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak / 1024
+
+
+def main():
+    form = make_form()
+    assert serialize_form(form) == legacy(form)
+    print('PlaceOrderForm with {} instructions, {} calls'.format(INSTRUCTIONS, NUMBER))
+    for name, function in (('data properties + prune_empty', legacy), ('generated serializer', serialize_form)):
+        seconds = min(timeit.repeat(lambda: function(form), number=NUMBER, repeat=5))
+        print('{:32} {:8.1f} us per call, peak memory {:6.1f} KiB'.format(
+            name, seconds / NUMBER * 1e6, peak_memory(function, form)))
+
+
+if __name__ == '__main__':
+    main()
@@ -57,6 +57,27 @@ class APINGExceptionsEnum(Enum):
      provided a valid grant_type, or the grant_type they have
       passed does not match the parameters (authCode/refreshToken)'''
 
+    # Certificate login statuses
+    INVALID_USERNAME_OR_PASSWORD = '''The username or password are invalid'''
+    ACCOUNT_NOW_LOCKED = '''The account was just locked'''
+    ACCOUNT_ALREADY_LOCKED = '''The account is already locked'''
+    PENDING_AUTH = '''Pending authentication'''
+    SUSPENDED = '''The account is suspended'''
+    CLOSED = '''The account is closed'''
+    SELF_EXCLUDED = '''The account has been self-excluded'''
+    CERT_AUTH_REQUIRED = '''Certificate required or certificate 
+    present but could not authenticate with it'''
+    CHANGE_PASSWORD_REQUIRED = '''Change password required'''
+    TEMPORARY_BAN_TOO_MANY_REQUESTS = '''The limit for successful login 
+    requests per minute has been exceeded. New login attempts 
+    will be banned for 20 minutes'''
+    SECURITY_RESTRICTED_LOCATION = '''The account is accessed from 
+    a location where it is not permitted'''
+    BETTING_RESTRICTED_LOCATION = '''The account is accessed from 
+    a location where betting is restricted'''
+
     @classmethod
     def get_description(cls, status):
+        if status not in cls.__members__:
+            return status
         return getattr(cls, status).value
@@ -0,0 +1,5 @@
+from .keys import canonical_key
+from .ttl_cache import TTLCache, ResponseCache, NAVIGATION_TTLS
+from .single_flight import (SingleFlight, AsyncSingleFlight, READ_OPERATIONS, ORDER_READ_OPERATIONS,
+                            ACCOUNT_READ_OPERATIONS)
+from .currency_rates import CurrencyRates
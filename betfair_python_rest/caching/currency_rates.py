@@ -0,0 +1,145 @@
+import threading
+import time
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# The rates of listCurrencyRates are computed from GBP
+BASE_CURRENCY = 'GBP'
+HOUR = 3600
+
+
+class CurrencyRates:
+    '''
+    Cache of listCurrencyRates response. Betfair updates the rates once every hour a few
+    seconds after the hour, so the cached rates are valid until the next hour + refresh_delay
+    and the background thread (start()) refreshes them right after the update.
+    The conversion of whole arrays (numpy is needed) is done by one vectorized operation:
+    ___
+    rates = CurrencyRates(accounts_api_manager).start()
+    profit_in_eur = rates.convert_array(profits, currencies, 'EUR')
+    ___
+    With the async manager request the rates yourself and pass the response to update()
+    '''
+
+    def __init__(self, api_manager=None, refresh_delay=30, retry_interval=60):
+        '''
+        :param api_manager: BetFairAPIManagerAccounts object, which is used for the requests
+        :param refresh_delay: seconds after the hour, when the new rates are requested
+        :param retry_interval: seconds between the attempts, if the request failed
+        '''
+        self.api_manager = api_manager
+        self.refresh_delay = refresh_delay
+        self.retry_interval = retry_interval
+        self.updated_at = None
+        self.expires_at = 0.0
+        self._rates = {BASE_CURRENCY: 1.0}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    @property
+    def rates(self):
+        '''
+        dict {currency code: rate from GBP}, the rates are requested, if they are expired
+        (without api_manager the rates of the last update() are returned)
+        '''
+        if self.api_manager is not None and time.time() >= self.expires_at:
+            self.refresh()
+        return self._rates
+
+    def rate(self, currency):
+        return self._get(self.rates, currency)
+
+    def next_refresh_time(self, now=None):
+        '''
+        The timestamp of the next rates update: the next hour + refresh_delay
+        '''
+        now = time.time() if now is None else now
+        return (now - self.refresh_delay) // HOUR * HOUR + HOUR + self.refresh_delay
+
+    def refresh(self):
+        '''
+        Request the rates from the server
+        '''
+        with self._lock:
+            if time.time() < self.expires_at:
+                # The rates were refreshed by another thread
+                return
+            self.update(self.api_manager.list_currency_rates(from_currency=BASE_CURRENCY))
+
+    def update(self, response):
+        '''
+        Replace the rates by listCurrencyRates response
+        '''
+        if not isinstance(response, list):
+            raise ValueError('The response is not a list of rates: {}'.format(response))
+        rates = {BASE_CURRENCY: 1.0}
+        rates.update((item['currencyCode'], float(item['rate'])) for item in response)
+        self._rates = rates
+        self.updated_at = time.time()
+        self.expires_at = self.next_refresh_time(self.updated_at)
+
+    def convert(self, amount, from_currency, to_currency):
+        if from_currency == to_currency:
+            return amount
+        rates = self.rates
+        return amount / self._get(rates, from_currency) * self._get(rates, to_currency)
+
+    def convert_array(self, amounts, from_currencies, to_currencies):
+        '''
+        Convert the array of amounts by one vectorized operation
+        :param amounts: array (or list) of amounts
+        :param from_currencies: currency code of all amounts or array of codes of each amount
+        :param to_currencies: currency code or array of codes of each amount
+        :return: numpy array of the converted amounts
+        '''
+        if np is None:
+            raise ImportError('The conversion of arrays requires numpy package. '
+                              'Install it with: pip install betfair_python_rest[numpy]')
+        rates = self.rates
+        amounts = np.asarray(amounts, dtype=float)
+        return amounts / self._rates_array(rates, from_currencies) * self._rates_array(rates, to_currencies)
+
+    def _rates_array(self, rates, currencies):
+        if isinstance(currencies, str):
+            return self._get(rates, currencies)
+        # Each currency is looked up once, the rates are taken by the indexes of codes
+        codes, indexes = np.unique(np.asarray(currencies), return_inverse=True)
+        return np.array([self._get(rates, code) for code in codes.tolist()])[indexes].reshape(np.shape(currencies))
+
+    @staticmethod
+    def _get(rates, currency):
+        try:
+            return rates[currency]
+        except KeyError:
+            raise ValueError('Unknown currency: {}'.format(currency)) from None
+
+    def start(self):
+        '''
+        Start the background thread, which refreshes the rates after each hourly update
+        '''
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._loop, daemon=True, name='CurrencyRates')
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join()
+        self._thread = None
+
+    def _loop(self):
+        wait = 0.0
+        while not self._stop.wait(wait):
+            try:
+                self.refresh()
+                wait = max(0.0, self.expires_at - time.time())
+            except Exception as exc:
+                if getattr(self.api_manager, 'log_mode', False):
+                    print('Currency rates refresh failed: {!r}'.format(exc))
+                wait = self.retry_interval
@@ -0,0 +1,15 @@
+from ..serialization import prune_empty
+
+import hashlib
+import json
+
+
+def canonical_key(relative_url, data):
+    '''
+    The key of request: the operation and the hash of its data.
+    The data is pruned the same way as before sending and dumped with the sorted keys,
+    so the forms with the same content give the same key
+    '''
+    content = json.dumps(prune_empty(data if data is not None else {}), sort_keys=True,
+                         separators=(',', ':'), default=str)
+    return relative_url, hashlib.sha1(content.encode('utf-8')).hexdigest()
@@ -0,0 +1,115 @@
+from concurrent.futures import Future
+import asyncio
+import threading
+
+# The market data operations without side effects, the identical concurrent calls
+# of them can share one request. They are coalesced by default
+READ_OPERATIONS = (
+    'listEventTypes', 'listCompetitions', 'listTimeRanges', 'listEvents', 'listMarketTypes',
+    'listCountries', 'listVenues', 'listMarketCatalogue', 'listMarketBook', 'listRunnerBook',
+)
+# The reads of orders and account. The shared response can be a bit older, than the order
+# placed just before the call, so they are coalesced only on demand:
+# SingleFlight(READ_OPERATIONS + ORDER_READ_OPERATIONS + ACCOUNT_READ_OPERATIONS)
+ORDER_READ_OPERATIONS = ('listMarketProfitAndLoss', 'listCurrentOrders', 'listClearedOrders')
+ACCOUNT_READ_OPERATIONS = ('getAccountFunds', 'getAccountDetails', 'getAccountStatement', 'listCurrencyRates')
+
+
+class BaseSingleFlight:
+    '''
+    Base class of the request coalescing: while the request with some key
+    (see canonical_key) is in flight, the identical requests don't go to the server,
+    they wait for the first one and get its result (or its exception)
+    '''
+
+    def __init__(self, operations=READ_OPERATIONS):
+        '''
+        :param operations: the operations, which are coalesced (READ_OPERATIONS by default,
+         add ORDER_READ_OPERATIONS and ACCOUNT_READ_OPERATIONS to coalesce the orders and account reads)
+        '''
+        self.operations = frozenset(operations)
+        self._flights = {}
+        self._stats = {}
+        self._stats_lock = threading.Lock()
+
+    def is_coalesced(self, relative_url):
+        return relative_url in self.operations
+
+    @property
+    def stats(self):
+        '''
+        The counters by operations: {operation: {'calls': ..., 'coalesced': ...}},
+        coalesced is the number of calls, which got the result of another call
+        '''
+        with self._stats_lock:
+            return {operation: dict(values) for operation, values in self._stats.items()}
+
+    def _record(self, key, coalesced):
+        values = self._stats.setdefault(key[0], {'calls': 0, 'coalesced': 0})
+        values['calls'] += 1
+        if coalesced:
+            values['coalesced'] += 1
+
+
+class SingleFlight(BaseSingleFlight):
+    '''
+    Request coalescing of the blocking managers. Thread-safe. Example:
+    ___
+    api_manager = BetFairAPIManagerBetting(login, password, api_key, single_flight=SingleFlight())
+    ___
+    '''
+
+    def do(self, key, function):
+        '''
+        Call the function or wait for the call with the same key, which is in flight
+        '''
+        with self._stats_lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = Future()
+            self._record(key, not leader)
+        if not leader:
+            return flight.result()
+
+        try:
+            result = function()
+        except BaseException as exc:
+            flight.set_exception(exc)
+            raise
+        else:
+            flight.set_result(result)
+            return result
+        finally:
+            with self._stats_lock:
+                del self._flights[key]
+
+
+class AsyncSingleFlight(BaseSingleFlight):
+    '''
+    Request coalescing of the asyncio managers. The flights are shared
+    by the coroutines of one event loop
+    '''
+
+    async def do(self, key, coroutine_function):
+        '''
+        Await the coroutine_function() or the call with the same key, which is in flight.
+        The request runs in its own task, so the cancelled caller (the first one too)
+        doesn't cancel it for the others
+        '''
+        with self._stats_lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = asyncio.ensure_future(coroutine_function())
+                flight.add_done_callback(lambda done: self._land(key, done))
+            self._record(key, not leader)
+        return await asyncio.shield(flight)
+
+    def _land(self, key, flight):
+        with self._stats_lock:
+            if self._flights.get(key) is flight:
+                del self._flights[key]
+        if not flight.cancelled():
+            # Mark the exception as retrieved, if all callers were cancelled
+            flight.exception()
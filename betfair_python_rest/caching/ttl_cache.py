@@ -0,0 +1,142 @@
+from collections import OrderedDict
+import threading
+import time
+
+# Seconds, for which the responses of navigation operations are kept by default
+NAVIGATION_TTLS = {
+    'listEventTypes': 3600,
+    'listCompetitions': 900,
+    'listCountries': 3600,
+    'listVenues': 3600,
+    'listMarketTypes': 3600,
+    'listTimeRanges': 300,
+}
+
+
+class TTLCache:
+    '''
+    Thread-safe dict with the limited size and the time to live of each value.
+    The least recently used value is removed, when the size is exceeded
+    '''
+    _missing = object()
+
+    def __init__(self, maxsize=1024, ttl=300):
+        '''
+        :param maxsize: maximum number of values
+        :param ttl: default time to live of values in seconds
+        '''
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._values = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._values)
+
+    def get(self, key, default=None):
+        with self._lock:
+            item = self._values.get(key, self._missing)
+            if item is self._missing:
+                return default
+            value, expires = item
+            if expires <= time.monotonic():
+                del self._values[key]
+                return default
+            self._values.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl=None):
+        expires = time.monotonic() + (ttl if ttl is not None else self.ttl)
+        with self._lock:
+            self._values[key] = (value, expires)
+            self._values.move_to_end(key)
+            while len(self._values) > self.maxsize:
+                self._values.popitem(last=False)
+
+    def pop(self, key, default=None):
+        with self._lock:
+            item = self._values.pop(key, self._missing)
+        return default if item is self._missing else item[0]
+
+    def clear(self):
+        with self._lock:
+            self._values.clear()
+
+    def remove_where(self, predicate):
+        '''
+        Remove the values, which keys match the predicate function
+        '''
+        with self._lock:
+            for key in [key for key in self._values if predicate(key)]:
+                del self._values[key]
+
+    def expire(self):
+        '''
+        Remove the expired values
+        '''
+        now = time.monotonic()
+        with self._lock:
+            for key in [key for key, (value, expires) in self._values.items() if expires <= now]:
+                del self._values[key]
+
+
+class ResponseCache:
+    '''
+    Cache of responses by the operation and the canonical hash of request data
+    (see canonical_key) with per operation TTLs and hit/miss counters.
+    Only the successful responses are kept. The cached response is returned
+    to all callers as is, so it shouldn't be changed. Example:
+    ___
+    api_manager = BetFairAPIManagerBetting(login, password, api_key, response_cache=ResponseCache())
+    api_manager.list_event_types(form)  # the request
+    api_manager.list_event_types(form)  # the cached response
+    print(api_manager.response_cache.stats)
+    ___
+    '''
+
+    def __init__(self, ttls=None, maxsize=1024):
+        '''
+        :param ttls: dict {operation: seconds}, NAVIGATION_TTLS by default.
+         The managers cache only the operations of this dict
+        :param maxsize: maximum number of responses
+        '''
+        self.ttls = dict(NAVIGATION_TTLS if ttls is None else ttls)
+        self._cache = TTLCache(maxsize)
+        self._stats = {}
+        self._stats_lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._cache)
+
+    def is_cached(self, relative_url):
+        return relative_url in self.ttls
+
+    @property
+    def stats(self):
+        '''
+        The counters by operations: {operation: {'hits': ..., 'misses': ...}}
+        '''
+        with self._stats_lock:
+            return {operation: dict(values) for operation, values in self._stats.items()}
+
+    def get(self, key, default=None):
+        '''
+        :param key: canonical_key of request
+        '''
+        value = self._cache.get(key, TTLCache._missing)
+        with self._stats_lock:
+            values = self._stats.setdefault(key[0], {'hits': 0, 'misses': 0})
+            values['hits' if value is not TTLCache._missing else 'misses'] += 1
+        return default if value is TTLCache._missing else value
+
+    def set(self, key, value):
+        self._cache.set(key, value, self.ttls.get(key[0]))
+
+    def invalidate(self, relative_url=None):
+        '''
+        Remove the responses of operation, or all responses, if relative_url is None
+        '''
+        if relative_url is None:
+            self._cache.clear()
+            return
+        self._cache.remove_where(lambda key: key[0] == relative_url)
@@ -7,6 +7,7 @@ from .list_market_profit_and_loss import ListMarketProfitAndLossForm
 from .list_current_orders import ListCurrentOrdersForm
 from .list_cleared_order import ListClearedOrdersForm
 from .place_orders import PlaceOrderForm
+from .bulk_place_orders import BulkPlaceOrderForm
 from .cancel_orders import CancelOrdersForm
 from .replace_orders import ReplaceOrdersForm
 from .update_orders import UpdateOrdersForm
@@ -14,3 +15,5 @@ from .update_orders import UpdateOrdersForm
 from .abstract_forms import (PlaceInstruction, CancelInstruction,
                              ReplaceInstruction, UpdateInstruction,
                              LimitOrder, LimitOrderOnClose)
+
+from .frozen_form import FrozenForm, freeze
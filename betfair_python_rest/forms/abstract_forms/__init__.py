@@ -18,6 +18,7 @@ from .replace_instruction import ReplaceInstruction
 from .update_instruction import UpdateInstruction
 
 from .place_instructions_list_field import PlaceInstructionsField
+from .place_instructions_columns import PlaceInstructionsColumns
 from .replace_instructions_list_field import ReplaceInstructionsField
 from .place_replace_fields import PlaceAndReplaceOrdersFields
 from .update_instructions_list_field import UpdateInstructionsField
@@ -1,8 +1,12 @@
-from abc import abstractmethod
+from ...serialization.compiled import serialize_form
 
 
 class BaseForm:
+    '''
+    The data of request is built by the serializer, which is generated once for each form class
+    from its dataclass fields (see serialization.compile_serializer).
+    The forms with the irregular API keys describe them in the data_keys class attribute
+    '''
+    __slots__ = ()
 
-    @abstractmethod
-    def data(self):
-        raise AttributeError('the data attribute is required')
+    data = property(serialize_form, doc='The request data without None and empty values')
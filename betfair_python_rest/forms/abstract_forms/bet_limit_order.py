@@ -1,10 +1,13 @@
 from dataclasses import dataclass
+from .base import BaseForm
+from .slotted import slotted
 from datetime import datetime
 from . import SelectionIdField
 
 
+@slotted
 @dataclass
-class LimitOrder:
+class LimitOrder(BaseForm):
     '''
     Place a new LIMIT order (simple exchange bet for immediate execution)
     :param size: The size of the bet. Please note:
@@ -61,15 +64,3 @@ class LimitOrder:
     min_fill_size: float = None
     bet_target_type: str = None
     bet_target_size: float = None
-
-    @property
-    def data(self):
-        return {
-            'size': self.size,
-            'price': self.price,
-            'persistenceType': self.persistence_type,
-            'timeInForce': self.time_in_force,
-            'minFillSize': self.min_fill_size,
-            'betTargetType': self.bet_target_type,
-            'betTargetSize': self.bet_target_size,
-        }
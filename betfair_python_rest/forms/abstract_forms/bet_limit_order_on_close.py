@@ -1,22 +1,20 @@
 from dataclasses import dataclass
+from .base import BaseForm
+from .slotted import slotted
 from datetime import datetime
 from . import SelectionIdField
 
 
+@slotted
 @dataclass
-class LimitOrderOnClose(SelectionIdField):
+class LimitOrderOnClose(BaseForm, SelectionIdField):
     '''
     Place a new LIMIT order (simple exchange bet for immediate execution)
     :param liability: The size of the bet. See Min BSP Liability
     :param price: The limit price of the bet if LOC
 
     '''
+    data_keys = {'selection_id': None}
+
     liability: float
     price: float
-
-    @property
-    def data(self):
-        return {
-            'liability': self.liability,
-            'price': self.price,
-        }
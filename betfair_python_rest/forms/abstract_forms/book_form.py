@@ -38,13 +38,3 @@ class BookForm(LocaleField, StrategyRefs, PriceProjection, OrderProjectionField,
 
     currency_code: str = None
     matched_since: datetime.date = None
-
-    @property
-    def data(self):
-        return {'priceProjection': self.price_projection_data,
-                'orderProjection': self.order_projection, 'matchProjection': self.match_projection,
-                'includeOverallPosition': self.include_overall_position,
-                'partitionMatchedByStrategyRef': self.partition_matched_by_strategy_ref,
-                'customerStrategyRefs': self.customer_strategy_refs,
-                'currencyCode': self.currency_code, 'locale': self.locale,
-                'matchedSince': self.matched_since, 'betIds': self.bet_ids}
@@ -1,8 +1,11 @@
 from dataclasses import dataclass
+from .base import BaseForm
+from .slotted import slotted
 
 
+@slotted
 @dataclass
-class CancelInstruction:
+class CancelInstruction(BaseForm):
     '''
     Instruction to place a new order
     :param bet_id:
@@ -13,10 +16,3 @@ class CancelInstruction:
     '''
     bet_id: str
     size_reduction: float = None
-
-    @property
-    def data(self):
-        return {
-            'betId': self.bet_id,
-            'sizeReduction': self.size_reduction
-        }
@@ -45,13 +45,3 @@ class ExBestOffersOverrides:
     rollup_limit: int = None
     rollup_liability_threshold: float = None
     rollup_liability_factor: int = None
-
-    @property
-    def ex_best_offers_overrides_data(self):
-        return {
-            'bestPricesDepth': self.best_prices_depth,
-            'rollupModel': self.rollup_model,
-            'rollupLimit': self.rollup_limit,
-            'rollupLiabilityThreshold': self.rollup_liability_threshold,
-            'rollupLiabilityFactor': self.rollup_liability_factor,
-        }
@@ -9,4 +9,6 @@ class BetIdsField:
     depends on the amount of data you
     request via the price projection.
     '''
+    __slots__ = ()
+
     bet_ids: list = None
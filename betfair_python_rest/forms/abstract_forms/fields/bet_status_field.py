@@ -6,4 +6,6 @@ class BetStatusField:
     '''
     Restricts the results to the specified status.
     '''
+    __slots__ = ()
+
     bet_status: str
@@ -14,4 +14,6 @@ class CustomerRefField:
       submissions which is 60 seconds.
 
     '''
+    __slots__ = ()
+
     customer_ref: str = None
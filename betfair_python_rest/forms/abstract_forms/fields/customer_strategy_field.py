@@ -12,4 +12,6 @@ class CustomerStrategyRefsField:
      be treated as if the parameter has been omitted (or null passed).
 
     '''
+    __slots__ = ()
+
     customer_strategy_refs: str = None
@@ -7,4 +7,6 @@ class LocaleField:
     The language used for the response.
     If not specified, the default is returned.
     '''
+    __slots__ = ()
+
     locale: str = None
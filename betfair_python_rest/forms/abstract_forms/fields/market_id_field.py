@@ -6,4 +6,6 @@ class MarketIdField:
     '''
     The unique id for the market.
     '''
+    __slots__ = ()
+
     market_id: str
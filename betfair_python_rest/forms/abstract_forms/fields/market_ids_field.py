@@ -9,4 +9,6 @@ class MarketIdsField:
     depends on the amount of data you
     request via the price projection.
     '''
+    __slots__ = ()
+
     market_ids: list
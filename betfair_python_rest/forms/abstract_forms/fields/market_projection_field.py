@@ -9,4 +9,6 @@ class MarketProjectionField:
          amount of data returned about the market.
          The variables listed in MarketProjection enum
     '''
+    __slots__ = ()
+
     market_projection: list = None
@@ -5,4 +5,6 @@ from dataclasses import dataclass
 class MarketSortField:
     '''
     '''
+    __slots__ = ()
+
     market_sort: str = None
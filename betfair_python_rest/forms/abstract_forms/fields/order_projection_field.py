@@ -11,4 +11,6 @@ class OrderProjectionField:
     :param order_projection:  Optionally restricts the results to the specified order
 
     '''
+    __slots__ = ()
+
     order_projection: str = None
@@ -6,4 +6,6 @@ class RunnerIdsField:
     '''
     The unique id for the market.
     '''
+    __slots__ = ()
+
     runner_ids: list = None
@@ -6,4 +6,6 @@ class SelectionIdField:
     '''
     The unique id for the market.
     '''
+    __slots__ = ()
+
     selection_id: int
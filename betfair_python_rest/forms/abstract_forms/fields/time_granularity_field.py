@@ -8,4 +8,6 @@ class TimeGranularityField:
      markets selected by the market filter.
      The possible options listed in TimeGranularity enum
     '''
+    __slots__ = ()
+
     time_granularity: str
@@ -56,6 +56,14 @@ class MarketFilter(EventAndEventTypeIds):
         :param race_types: list of strings.	Restrict by race
         type (i.e. Hurdle, Flat, Bumper, Harness, Chase)
     '''
+    data_keys = {'filter': {'event_type_ids': 'eventTypeIds', 'event_ids': 'eventIds', 'text_query': 'textQuery',
+                            'competitions_ids': 'competitionIds', 'market_ids': 'marketIds', 'venues': 'venues',
+                            'bsp_only': 'bspOnly', 'in_play_enabled': 'turnInPlayEnabled',
+                            'in_play_only': 'inPlayOnly', 'market_betting_types': 'marketBettingTypes',
+                            'market_countries': 'marketCountries', 'market_type_codes': 'marketTypeCodes',
+                            'market_start_time': 'marketStartTime', 'with_orders': 'withOrders',
+                            'race_types': 'raceTypes'}}
+
     text_query: str = None
     competitions_ids: list = None
     market_ids: list = None
@@ -69,16 +77,3 @@ class MarketFilter(EventAndEventTypeIds):
     market_start_time: datetime.time = None
     with_orders: bool = None
     race_types: list = None
-
-    @property
-    def market_filter_data(self):
-        data = {
-            'textQuery': self.text_query, 'eventTypeIds': self.event_type_ids,
-            'eventIds': self.event_ids, 'competitionIds': self.competitions_ids,
-            'marketIds': self.market_ids, 'venues': self.venues, 'bspOnly': self.bsp_only,
-            'turnInPlayEnabled': self.in_play_enabled, 'inPlayOnly': self.in_play_only,
-            'marketBettingTypes': self.market_betting_types, 'marketCountries': self.market_countries,
-            'marketTypeCodes': self.market_type_codes, 'marketStartTime': self.market_start_time,
-            'withOrders': self.with_orders, 'raceTypes': self.race_types
-        }
-        return data
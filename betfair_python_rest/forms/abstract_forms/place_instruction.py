@@ -1,9 +1,13 @@
 from dataclasses import dataclass
+from .base import BaseForm
+from .slotted import slotted
 from . import SelectionIdField, LimitOrder, LimitOrderOnClose
+from ...trading.ticks import check_price
 
 
+@slotted
 @dataclass
-class PlaceInstruction(SelectionIdField):
+class PlaceInstruction(BaseForm, SelectionIdField):
     '''
     Instruction to place a new order
     :param order_type: string, see OrderType enum
@@ -47,7 +51,15 @@ class PlaceInstruction(SelectionIdField):
      No validation will be done on uniqueness
      and the string is limited to 32 characters. If an empty
       string is provided it will be treated as null.
+
+    Set validate_price = True (on the class or your subclass) to check the prices
+    of limit_order and limit_on_close_order by the Betfair price ladder before
+    the request, the off-ladder price raises ValueError. It's off by default,
+    because the prices of LINE markets are the line values, not the odds
     '''
+    data_keys = {'market_on_close_order_liability': ('marketOnCloseOrder', 'liability')}
+    validate_price = False
+
     order_type: str
     side: str
     handicap: float = None
@@ -56,19 +68,9 @@ class PlaceInstruction(SelectionIdField):
     market_on_close_order_liability: object = None
     customer_order_ref: str = None
 
-    @property
-    def data(self):
-        if self.market_on_close_order_liability:
-            market_close = {'liability': self.market_on_close_order_liability}
-        else:
-            market_close = None
-        return {
-            'orderType': self.order_type,
-            'selectionId': self.selection_id,
-            'handicap': self.handicap,
-            'side': self.side,
-            'limitOrder': self.limit_order.data if self.limit_order else None,
-            'limitOnCloseOrder': self.limit_on_close_order.data if self.limit_on_close_order else None,
-            'marketOnCloseOrder': market_close,
-            'customerOrderRef': self.customer_order_ref,
-        }
+    def __post_init__(self):
+        if self.validate_price:
+            if self.limit_order is not None:
+                check_price(self.limit_order.price)
+            if self.limit_on_close_order is not None:
+                check_price(self.limit_on_close_order.price)
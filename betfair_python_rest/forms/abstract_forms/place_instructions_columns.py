@@ -0,0 +1,17 @@
+from dataclasses import dataclass
+
+
+@dataclass(eq=False)
+class PlaceInstructionsColumns:
+    '''
+    The LIMIT orders as the parallel arrays (numpy arrays or lists), the item i of each array
+    describes the order i. The side can be one string for all orders
+    :param selection_ids: The selection ids of orders
+    :param sides: BACK or LAY
+    :param prices: The limit prices, they should be on the Betfair price ladder
+    :param sizes: The sizes of bets
+    '''
+    selection_ids: object
+    sides: object
+    prices: object
+    sizes: object
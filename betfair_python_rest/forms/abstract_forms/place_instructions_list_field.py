@@ -11,7 +11,3 @@ class PlaceInstructionsField:
     200 for the Global Exchange and 50 for the Italian Exchange.
     '''
     instructions: List[PlaceInstruction]
-
-    @property
-    def instructions_data(self):
-        return [bet.data for bet in self.instructions]
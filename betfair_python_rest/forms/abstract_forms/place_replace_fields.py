@@ -28,6 +28,8 @@ class PlaceAndReplaceOrdersFields(CustomerRefField, MarketIdField):
     version is higher than that sent on an order,
     the bet will be lapsed.
     '''
+    data_keys = {'is_async': 'async', 'market_version': ('marketVersion', 'version')}
+
     is_async: bool = None
     customer_ref: str = None
     market_version: str = None
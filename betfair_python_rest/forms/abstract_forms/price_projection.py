@@ -27,16 +27,17 @@ class PriceProjection(ExBestOffersOverrides):
      If unspecified defaults to false. Applicable to EX_BEST_OFFERS
       and EX_ALL_OFFERS price projections. Not supported as yet.
     '''
+    data_keys = {'priceProjection': {'price_data': 'priceData', 'virtualise': 'virtualise',
+                                     'rollover_stakes': 'rolloverStakes',
+                                     'exBestOffersOverrides': {'best_prices_depth': 'bestPricesDepth',
+                                                               'rollup_model': 'rollupModel',
+                                                               'rollup_limit': 'rollupLimit',
+                                                               'rollup_liability_threshold': 'rollupLiabilityThreshold',
+                                                               'rollup_liability_factor': 'rollupLiabilityFactor'}},
+                 # The overrides are taken from the fields above
+                 'ex_best_offers_overrides': None}
+
     price_data: list = None
     ex_best_offers_overrides: ExBestOffersOverrides = None
     virtualise: bool = None
     rollover_stakes: bool = None
-
-    @property
-    def price_projection_data(self):
-        return {
-            'priceData': self.price_data,
-            'exBestOffersOverrides': self.ex_best_offers_overrides_data,
-            'virtualise': self.virtualise,
-            'rolloverStakes': self.rollover_stakes,
-        }
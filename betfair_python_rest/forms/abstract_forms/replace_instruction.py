@@ -1,20 +1,25 @@
 from dataclasses import dataclass
+from .base import BaseForm
+from .slotted import slotted
+from ...trading.ticks import check_price
 
 
+@slotted
 @dataclass
-class ReplaceInstruction:
+class ReplaceInstruction(BaseForm):
     '''
     Instruction to place a new order
     :param bet_id:
     :param new_price: The price to replace the bet at
 
+    Set validate_price = True to check new_price by the Betfair price ladder
+    before the request (see PlaceInstruction)
     '''
+    validate_price = False
+
     bet_id: str
     new_price: float
 
-    @property
-    def data(self):
-        return {
-            'betId': self.bet_id,
-            'newPrice': self.new_price
-        }
+    def __post_init__(self):
+        if self.validate_price:
+            check_price(self.new_price, 'new_price')
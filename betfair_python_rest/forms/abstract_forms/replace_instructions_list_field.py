@@ -10,7 +10,3 @@ class ReplaceInstructionsField:
     The limit of replace instructions per request is 60.
     '''
     instructions: List[ReplaceInstruction]
-
-    @property
-    def instructions_data(self):
-        return [bet.data for bet in self.instructions]
@@ -0,0 +1,34 @@
+from dataclasses import fields
+
+
+def slotted(dataclass_type):
+    '''
+    Recreate the dataclass with __slots__ of its fields, like dataclass(slots=True) of python 3.10+.
+    The objects don't have __dict__, so they are smaller and faster to create.
+    All base classes should have __slots__ too (the empty one for the field classes),
+    otherwise the objects get __dict__ anyway. Apply it above @dataclass:
+    ___
+    @slotted
+    @dataclass
+    class LimitOrder(BaseForm):
+        ...
+    ___
+    Note: the methods of class can't use super() without arguments
+    '''
+    inherited = set()
+    for base in dataclass_type.__mro__[1:]:
+        base_slots = vars(base).get('__slots__', ())
+        inherited.update((base_slots,) if isinstance(base_slots, str) else base_slots)
+
+    namespace = dict(vars(dataclass_type))
+    names = [field.name for field in fields(dataclass_type)]
+    namespace['__slots__'] = tuple(name for name in names if name not in inherited)
+    # The defaults are kept by __init__ and dataclass fields, the class attributes would conflict with slots
+    for name in names:
+        namespace.pop(name, None)
+    namespace.pop('__dict__', None)
+    namespace.pop('__weakref__', None)
+
+    slotted_type = type(dataclass_type)(dataclass_type.__name__, dataclass_type.__bases__, namespace)
+    slotted_type.__qualname__ = dataclass_type.__qualname__
+    return slotted_type
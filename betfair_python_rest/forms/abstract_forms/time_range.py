@@ -13,12 +13,7 @@ class TimeRange:
     list_current_orders_response = api_manager.list_current_orders(time_range=time_range_obj)
     ___
     '''
+    data_keys = {'from_date': 'from', 'to_date': 'to'}
+
     from_date: datetime.date
     to_date: datetime.date
-
-    @property
-    def time_range_data(self):
-        return {
-            'from': self.from_date,
-            'to': self.to_date
-        }
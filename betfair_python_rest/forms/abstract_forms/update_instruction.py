@@ -1,8 +1,11 @@
 from dataclasses import dataclass
+from .base import BaseForm
+from .slotted import slotted
 
 
+@slotted
 @dataclass
-class UpdateInstruction:
+class UpdateInstruction(BaseForm):
     '''
     Instruction to update LIMIT bet's
     persistence of an order that do not affect exposure
@@ -13,10 +16,3 @@ class UpdateInstruction:
     '''
     bet_id: str
     new_persistence_type: str
-
-    @property
-    def data(self):
-        return {
-            'betId': self.bet_id,
-            'newPersistenceType': self.new_persistence_type
-        }
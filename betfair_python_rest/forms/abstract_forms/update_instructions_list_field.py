@@ -10,7 +10,3 @@ class UpdateInstructionsField:
      The limit of update instructions per request is 60
     '''
     instructions: List[UpdateInstruction]
-
-    @property
-    def instructions_data(self):
-        return [bet.data for bet in self.instructions]
@@ -0,0 +1,210 @@
+from .abstract_forms.base import BaseForm
+from .abstract_forms import (CustomerStrategyRefsField,
+                             PlaceAndReplaceOrdersFields,
+                             PlaceInstructionsColumns)
+from ..serialization import register_serializer
+from ..trading.ticks import valid_prices
+from dataclasses import dataclass, fields, replace
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+SIDES = ('BACK', 'LAY')
+PERSISTENCE_TYPES = ('LAPSE', 'PERSIST', 'MARKET_ON_CLOSE')
+MAX_CUSTOMER_ORDER_REF_LENGTH = 32
+MAX_CUSTOMER_REF_LENGTH = 32
+# The limit of placeOrders instructions in one request
+MAX_PLACE_INSTRUCTIONS = 200
+
+
+def _bulk_place_order_data(form):
+    data = {'marketId': form.market_id, 'instructions': form.instructions}
+    if form.customer_ref:
+        data['customerRef'] = form.customer_ref
+    if form.market_version is not None:
+        data['marketVersion'] = {'version': form.market_version}
+    if form.customer_strategy_refs:
+        data['customerStrategyRef'] = form.customer_strategy_refs
+    if form.is_async is not None:
+        data['async'] = form.is_async
+    return data
+
+
+def _chunk_customer_ref(customer_ref, index):
+    '''
+    The unique customerRef of chunk: Betfair de-dupes the requests with the same customerRef,
+    so the chunks can't share the ref of form
+    '''
+    suffix = '-{}'.format(index)
+    return customer_ref[:MAX_CUSTOMER_REF_LENGTH - len(suffix)] + suffix
+
+
+def _columns_equal(value, other):
+    if isinstance(value, np.ndarray) or isinstance(other, np.ndarray):
+        return isinstance(value, np.ndarray) and isinstance(other, np.ndarray) and np.array_equal(value, other)
+    return value == other
+
+
+@dataclass(eq=False)
+class BulkPlaceOrderForm(BaseForm, CustomerStrategyRefsField,
+                         PlaceAndReplaceOrdersFields, PlaceInstructionsColumns):
+    '''
+    The placeOrders request with many LIMIT orders, which are given by the parallel arrays
+    instead of PlaceInstruction objects. The arrays are validated at once (numpy is needed):
+    the prices on the ladder, the sizes not less than min_size and the customer order refs
+    up to 32 chars. The instructions of request are built directly from the arrays:
+    ___
+    prices = ticks_away_array(np.full(100, best_back_price), np.arange(100))
+    form = BulkPlaceOrderForm(market_id='1.170000000', selection_ids=np.full(100, selection_id),
+                              sides='BACK', prices=prices, sizes=np.full(100, 2.0))
+    for chunk in form.split():
+        api_manager.place_orders(chunk)
+    ___
+    Betfair accepts up to 200 instructions in one request, split() gives the forms within the limit
+    (the customer_ref of form gets the suffix -0, -1, ... of chunk, so the chunks aren't de-duped).
+    The slice of form (form[10:20]) is the new request, it has no customer_ref.
+    After the creation the arrays are numpy arrays, don't change them (use dataclasses.replace)
+
+    :param persistence_types: LAPSE, PERSIST or MARKET_ON_CLOSE, one string for all orders or array
+    :param customer_order_refs: The array of refs, the empty string (or None) means the order without ref
+    :param handicaps: The array of handicaps (for Asian handicap markets)
+    You can find details about other params in parent classes
+    '''
+    # The minimal size of bet (for GBP), change it for the other currencies
+    min_size = 1.0
+
+    persistence_types: object = 'LAPSE'
+    customer_order_refs: object = None
+    handicaps: object = None
+    is_async: bool = None
+    market_version: str = None
+
+    data = property(_bulk_place_order_data, doc='The request data without None and empty values')
+
+    def __post_init__(self):
+        if np is None:
+            raise ImportError('The bulk orders require numpy package. '
+                              'Install it with: pip install betfair_python_rest[numpy]')
+        self.selection_ids = np.asarray(self.selection_ids, dtype=np.int64).ravel()
+        count = len(self.selection_ids)
+        self.prices = self._column(self.prices, count, 'prices', float)
+        self.sizes = self._column(self.sizes, count, 'sizes', float)
+        self.sides = self._column(self.sides, count, 'sides', str)
+        self.persistence_types = self._column(self.persistence_types, count, 'persistence_types', str)
+        if self.customer_order_refs is not None:
+            customer_order_refs = self.customer_order_refs
+            if not isinstance(customer_order_refs, str):
+                # None is the order without ref too (the str array would have the 'None' refs)
+                customer_order_refs = ['' if customer_order_ref is None else customer_order_ref
+                                       for customer_order_ref in np.asarray(customer_order_refs, dtype=object).ravel()]
+            self.customer_order_refs = self._column(customer_order_refs, count, 'customer_order_refs', str)
+        if self.handicaps is not None:
+            self.handicaps = self._column(self.handicaps, count, 'handicaps', float)
+        self._instructions = None
+        self.validate()
+
+    @staticmethod
+    def _column(values, count, name, dtype):
+        values = np.asarray(values, dtype=dtype)
+        if values.ndim == 0:
+            return np.full(count, values)
+        values = values.ravel()
+        if len(values) != count:
+            raise ValueError('The length of {} ({}) differs from the length of selection_ids ({})'.format(
+                name, len(values), count))
+        return values
+
+    def validate(self):
+        '''
+        Raise ValueError with the indexes of invalid orders
+        '''
+        self._check(~np.isin(self.sides, SIDES), 'sides', 'are not BACK or LAY', self.sides)
+        self._check(~np.isin(self.persistence_types, PERSISTENCE_TYPES), 'persistence types',
+                    'are not in {}'.format(', '.join(PERSISTENCE_TYPES)), self.persistence_types)
+        self._check(~np.isfinite(self.prices), 'prices', 'are not finite numbers', self.prices)
+        self._check(~valid_prices(self.prices), 'prices', 'are not on the Betfair price ladder', self.prices)
+        # The comparison is False for nan, so nan sizes are invalid too
+        self._check(~(self.sizes >= self.min_size), 'sizes', 'are less than the minimal size {}'.format(
+            self.min_size), self.sizes)
+        if self.customer_order_refs is not None:
+            self._check(np.char.str_len(self.customer_order_refs) > MAX_CUSTOMER_ORDER_REF_LENGTH,
+                        'customer order refs', 'are longer than {} chars'.format(MAX_CUSTOMER_ORDER_REF_LENGTH),
+                        self.customer_order_refs)
+
+    @staticmethod
+    def _check(invalid, name, problem, values):
+        if invalid.any():
+            indexes = np.flatnonzero(invalid)
+            raise ValueError('The {} of orders {} {}: {}'.format(
+                name, indexes[:10].tolist(), problem, values[indexes[:10]].tolist()))
+
+    def __len__(self):
+        return len(self.selection_ids)
+
+    def __eq__(self, other):
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return all(_columns_equal(getattr(self, field.name), getattr(other, field.name))
+                   for field in fields(self))
+
+    # The form with arrays isn't hashable, like the other forms
+    __hash__ = None
+
+    @property
+    def instructions(self):
+        '''
+        The placeOrders instructions (dicts), they are built once
+        '''
+        if self._instructions is None:
+            # The cache isn't the field, it is set on the frozen form too
+            object.__setattr__(self, '_instructions', self._build_instructions())
+        return self._instructions
+
+    def _build_instructions(self):
+        columns = [self.selection_ids.tolist(), self.sides.tolist(), self.sizes.tolist(), self.prices.tolist(),
+                   self.persistence_types.tolist()]
+        instructions = [{'orderType': 'LIMIT', 'selectionId': selection_id, 'side': side,
+                         'limitOrder': {'size': size, 'price': price, 'persistenceType': persistence_type}}
+                        for selection_id, side, size, price, persistence_type in zip(*columns)]
+        if self.handicaps is not None:
+            for instruction, handicap in zip(instructions, self.handicaps.tolist()):
+                instruction['handicap'] = handicap
+        if self.customer_order_refs is not None:
+            for instruction, customer_order_ref in zip(instructions, self.customer_order_refs.tolist()):
+                if customer_order_ref:
+                    instruction['customerOrderRef'] = customer_order_ref
+        return instructions
+
+    def split(self, max_instructions=MAX_PLACE_INSTRUCTIONS):
+        '''
+        The forms with up to max_instructions orders (the form itself, if it is within the limit).
+        Each chunk has its own customer_ref (customer_ref-0, customer_ref-1, ...)
+        '''
+        if len(self) <= max_instructions:
+            return [self]
+        return [self._take(slice(start, start + max_instructions),
+                           _chunk_customer_ref(self.customer_ref, index) if self.customer_ref else None)
+                for index, start in enumerate(range(0, len(self), max_instructions))]
+
+    def __getitem__(self, index):
+        '''
+        The form with the orders of slice, index array or boolean mask. It is the other request,
+        so the customer_ref isn't copied (Betfair would reject it as the duplicate)
+        '''
+        if isinstance(index, int):
+            index = slice(index, index + 1 or None)
+        return self._take(index, None)
+
+    def _take(self, index, customer_ref):
+        return replace(self, customer_ref=customer_ref,
+                       selection_ids=self.selection_ids[index], sides=self.sides[index],
+                       prices=self.prices[index], sizes=self.sizes[index],
+                       persistence_types=self.persistence_types[index],
+                       customer_order_refs=(self.customer_order_refs[index]
+                                            if self.customer_order_refs is not None else None),
+                       handicaps=self.handicaps[index] if self.handicaps is not None else None)
+
+
+register_serializer(BulkPlaceOrderForm, _bulk_place_order_data)
@@ -21,13 +21,8 @@ class CancelOrdersForm(BaseForm, CustomerRefField, MarketIdField):
       are fully cancelled.  The limit of cancel
       instructions per request is 60
     '''
+    # Without instructions the request is sent without any params
+    data_requires = ('instructions',)
+
     instructions: List[CancelInstruction] = None
     market_id: str = None
-
-    @property
-    def data(self):
-        if self.instructions is not None:
-            return {'marketId': self.market_id,
-                    'instructions': [instruction.data for instruction in self.instructions],
-                    'customerRef': self.customer_ref
-                    }
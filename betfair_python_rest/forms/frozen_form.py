@@ -0,0 +1,118 @@
+from .abstract_forms.base import BaseForm
+from ..caching.keys import canonical_key
+from ..serialization import prune_empty, serialize_form, compile_serializer, register_serializer
+
+from dataclasses import FrozenInstanceError, fields
+import threading
+
+_frozen_classes = {}
+_frozen_classes_lock = threading.Lock()
+
+
+class FrozenForm:
+    '''
+    Immutable form, which is serialized only once: its request data, the body of request
+    (for each json backend) and the cache key are kept, so the same request sent
+    again and again (i.e. listMarketBook of poller) skips the building of payload.
+    The lists are converted to tuples and the nested forms are frozen too.
+    Create it by freeze():
+    ___
+    market_book_form = freeze(ListMarketBookForm(market_ids=market_ids, price_data=[PriceData.EX_BEST_OFFERS.name]))
+    while True:
+        api_manager.list_market_book(market_book_form)
+    ___
+    The frozen form is the object of the form class, dataclasses.replace() gives the new frozen form
+    '''
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        for field in fields(self):
+            object.__setattr__(self, field.name, _freeze_value(getattr(self, field.name)))
+        object.__setattr__(self, '_serialized', {})
+
+    def __setattr__(self, name, value):
+        if '_serialized' in vars(self):
+            raise FrozenInstanceError('cannot assign to field {!r} of frozen form'.format(name))
+        object.__setattr__(self, name, value)
+
+    def __delattr__(self, name):
+        raise FrozenInstanceError('cannot delete field {!r} of frozen form'.format(name))
+
+    @property
+    def data(self):
+        serialized = self._serialized
+        if 'data' not in serialized:
+            serialized['data'] = self._build_data(self)
+        return serialized['data']
+
+    def encode(self, json_backend):
+        '''
+        The body of request (bytes), encoded by json_backend
+        '''
+        serialized = self._serialized
+        body = serialized.get(json_backend)
+        if body is None:
+            data = self.data
+            body = json_backend.dumps(data if data is not None else {})
+            if isinstance(body, str):
+                body = body.encode('utf-8')
+            serialized[json_backend] = body
+        return body
+
+    def canonical_key(self, relative_url):
+        '''
+        The same as caching.canonical_key(relative_url, form.data)
+        '''
+        serialized = self._serialized
+        key = serialized.get(relative_url)
+        if key is None:
+            key = serialized[relative_url] = canonical_key(relative_url, self.data)
+        return key
+
+
+def freeze(form):
+    '''
+    Frozen copy of form (see FrozenForm)
+    '''
+    if isinstance(form, FrozenForm):
+        return form
+    return frozen_class(type(form))(**{field.name: getattr(form, field.name) for field in fields(form)})
+
+
+def frozen_class(form_class):
+    '''
+    The frozen subclass of form class, it's created once for each class
+    '''
+    frozen = _frozen_classes.get(form_class)
+    if frozen is None:
+        with _frozen_classes_lock:
+            frozen = _frozen_classes.get(form_class)
+            if frozen is None:
+                frozen = type('Frozen{}'.format(form_class.__name__), (FrozenForm, form_class),
+                              {'__doc__': form_class.__doc__, '__module__': form_class.__module__,
+                               '_build_data': staticmethod(_data_builder(form_class))})
+                register_serializer(frozen, _frozen_data)
+                _frozen_classes[form_class] = frozen
+    return frozen
+
+
+def _data_builder(form_class):
+    '''
+    The function, which builds the data of form class (the generated serializer or its own data property)
+    '''
+    data_property = getattr(form_class, 'data', None)
+    if getattr(data_property, 'fget', None) is serialize_form:
+        return compile_serializer(form_class)
+    return lambda form: prune_empty(data_property.fget(form))
+
+
+def _frozen_data(form):
+    return form.data
+
+
+def _freeze_value(value):
+    if isinstance(value, BaseForm):
+        return freeze(value)
+    if isinstance(value, list):
+        return tuple(_freeze_value(item) for item in value)
+    return value
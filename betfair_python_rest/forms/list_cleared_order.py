@@ -19,19 +19,9 @@ class ListClearedOrdersForm(BaseForm, EventAndEventTypeIds, RunnerIdsField,
     ___
     You can find details about params in parent classes
     '''
+    data_keys = {'settledDateRange': {'from_date': 'from', 'to_date': 'to'}}
+
     market_ids: list = None
     side: str = None
     group_by: str = None
     include_item_description: bool = None
-
-    @property
-    def data(self):
-        return {
-            'betStatus': self.bet_status, 'eventTypeIds': self.event_type_ids,
-            'eventIds': self.event_ids, 'marketIds': self.market_ids,
-            'runnerIds': self.runner_ids, 'betIds': self.bet_ids,
-            'side': self.side, 'settledDateRange': self.time_range_data,
-            'groupBy': self.group_by, 'locale': self.locale,
-            'includeItemDescription': self.include_item_description,
-            'fromRecord': self.from_record, 'recordCount': self.record_count
-        }
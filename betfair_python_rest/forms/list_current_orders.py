@@ -57,15 +57,3 @@ class ListCurrentOrdersForm(BaseForm, BetIdsField, OrderProjectionField,
     date_range: TimeRange = None
     order_by: str = None
     sort_dir: str = None
-
-    @property
-    def data(self):
-        return {
-            'betIds': self.bet_ids, 'marketIds': self.market_ids,
-            'orderProjection': self.order_projection,
-            'customerOrderRefs': self.customer_order_refs,
-            'customerStrategyRefs': self.customer_strategy_refs,
-            'dateRange': self.date_range, 'orderBy': self.order_by,
-            'sortDir': self.sort_dir, 'fromRecord': self.from_record,
-            'recordCount': self.record_count
-        }
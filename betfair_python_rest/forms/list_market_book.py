@@ -15,13 +15,3 @@ class ListMarketBookForm(BaseForm, BookForm, MarketIdsField):
     ___
     You can find details about params in parent classes
     '''
-
-    @property
-    def data(self):
-        return {'marketIds': self.market_ids, 'priceProjection': self.price_projection_data,
-                'orderProjection': self.order_projection, 'matchProjection': self.match_projection,
-                'includeOverallPosition': self.include_overall_position,
-                'partitionMatchedByStrategyRef': self.partition_matched_by_strategy_ref,
-                'customerStrategyRefs': self.customer_strategy_refs,
-                'currencyCode': self.currency_code, 'locale': self.locale,
-                'matchedSince': self.matched_since, 'betIds': self.bet_ids}
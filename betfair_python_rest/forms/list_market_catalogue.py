@@ -32,11 +32,7 @@ class ListMarketCatalogueForm(BaseForm, MarketFilter, MarketProjectionField, Loc
     results returned, must be greater than 0 and
      less than or equal to 1000
     '''
+    data_keys = {'market_sort': 'sort'}
+
     max_results: int = 500
     market_sort: str = None
-
-    @property
-    def data(self):
-        return {'filter': self.market_filter_data, 'marketProjection': self.market_projection,
-                'sort': self.market_sort, 'maxResults': self.max_results,
-                'locale': self.locale}
@@ -27,14 +27,8 @@ class ListMarketProfitAndLossForm(BaseForm, MarketIdsField):
     for this market including any special tariffs.
     Defaults to false if not specified.
     '''
+    data_keys = {'include_settle_bets': 'includeSettledBets'}
+
     include_settle_bets: bool = None
     include_bsp_bets: bool = None
     net_of_commission: bool = None
-
-    @property
-    def data(self):
-        return {'marketIds': self.market_ids,
-                'includeSettledBets': self.include_settle_bets,
-                'includeBspBets': self.include_bsp_bets,
-                'netOfCommission': self.net_of_commission
-                }
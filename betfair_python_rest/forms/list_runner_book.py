@@ -18,14 +18,3 @@ class ListRunnerBookForm(BaseForm, BookForm, SelectionIdField, MarketIdField):
     :param handicap: The projection of price data you want to receive in the response.
     '''
     handicap: float = None
-
-    @property
-    def data(self):
-        return {'marketId': self.market_id, 'selectionId': self.selection_id, 'handicap': self.handicap,
-                'priceProjection': self.price_projection_data,
-                'orderProjection': self.order_projection, 'matchProjection': self.match_projection,
-                'includeOverallPosition': self.include_overall_position,
-                'partitionMatchedByStrategyRef': self.partition_matched_by_strategy_ref,
-                'customerStrategyRefs': self.customer_strategy_refs,
-                'currencyCode': self.currency_code, 'locale': self.locale,
-                'matchedSince': self.matched_since, 'betIds': self.bet_ids}
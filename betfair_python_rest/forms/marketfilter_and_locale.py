@@ -28,6 +28,3 @@ class MarketFilterAndLocaleForm(BaseForm, MarketFilter, LocaleField):
     ___
     You can find details about params in parent classes
     '''
-    @property
-    def data(self):
-        return {'filter': self.market_filter_data, 'locale': self.locale}
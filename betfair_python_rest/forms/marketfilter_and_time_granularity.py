@@ -15,7 +15,4 @@ class MarketFilterAndTimeGranularityForm(BaseForm, MarketFilter, TimeGranularity
     ___
     You can find details about params in parent classes
     '''
-
-    @property
-    def data(self):
-        return {'filter': self.market_filter_data, 'granularity': self.time_granularity}
+    data_keys = {'time_granularity': 'granularity'}
@@ -18,14 +18,7 @@ class PlaceOrderForm(BaseForm, CustomerStrategyRefsField,
     ___
     You can find details about params in parent classes
     '''
+    data_keys = {'customer_strategy_refs': 'customerStrategyRef'}
+
     is_async: bool = None
     market_version: str = None
-
-    @property
-    def data(self):
-        return {'marketId': self.market_id,
-                'instructions': self.instructions_data,
-                'customerRef': self.customer_ref,
-                'marketVersion': {'version': self.market_version},
-                'customerStrategyRef': self.customer_strategy_refs,
-                'async': self.is_async}
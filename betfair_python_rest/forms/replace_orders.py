@@ -15,13 +15,5 @@ class ReplaceOrdersForm(BaseForm, PlaceAndReplaceOrdersFields, ReplaceInstructio
     ___
 
     '''
-
-    @property
-    def data(self):
-        if self.instructions is not None:
-            return {'marketId': self.market_id,
-                    'instructions': self.instructions_data,
-                    'customerRef': self.customer_ref,
-                    'marketVersion': {'version': self.market_version},
-                    'async': self.is_async
-                    }
+    # Without instructions the request is sent without any params
+    data_requires = ('instructions',)
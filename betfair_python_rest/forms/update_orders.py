@@ -15,11 +15,5 @@ class UpdateOrdersForm(BaseForm, CustomerRefField, UpdateInstructionsField, Mark
     ___
 
     '''
-
-    @property
-    def data(self):
-        if self.instructions is not None:
-            return {'marketId': self.market_id,
-                    'instructions': self.instructions_data,
-                    'customerRef': self.customer_ref,
-                    }
+    # Without instructions the request is sent without any params
+    data_requires = ('instructions',)
@@ -0,0 +1,5 @@
+from .weights import (MARKET_DATA_LIMIT, MARKET_IDS_LIMIT, request_weight,
+                      market_weight, price_data_weight, market_projection_weight)
+from .limiter import (RateLimiter, AsyncRateLimiter, TokenBucket,
+                      DEFAULT_CONCURRENCY_LIMITS)
+from .splitting import split_request, merge_market_responses, markets_per_request
@@ -0,0 +1,261 @@
+from .weights import MARKET_DATA_LIMIT, request_weight
+
+from contextlib import contextmanager, ExitStack
+import asyncio
+import threading
+import time
+
+# The operations, which are limited to 3 concurrent requests (TOO_MANY_REQUESTS).
+# listMarketBook is limited only with order or match projection
+DEFAULT_CONCURRENCY_LIMITS = {
+    'listMarketBook': 3,
+    'listCurrentOrders': 3,
+    'listClearedOrders': 3,
+    'listMarketProfitAndLoss': 3,
+}
+# The operations, where each instruction is counted as a separate transaction
+INSTRUCTIONS_OPERATIONS = ('placeOrders', 'replaceOrders')
+
+
+class TokenBucket:
+    '''
+    Token bucket for transactions per second limit.
+    The tokens are reserved in the order of calls,
+    so the requests are queued instead of failing
+    :param rate: tokens per second
+    :param capacity: the burst size, equal to rate by default
+    '''
+
+    def __init__(self, rate, capacity=None):
+        self.rate = rate
+        self.capacity = capacity or rate
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, tokens=1):
+        '''
+        Take the tokens from the bucket
+        :return: how many seconds the caller should wait before the request
+        '''
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= tokens
+            if self._tokens >= 0:
+                return 0
+            return -self._tokens / self.rate
+
+
+class BaseRateLimiter:
+    '''
+    Client-side limiter of requests to Betfair API:
+     - the Market Data Request Limits are checked before the request (see weight_error),
+     so the request with too much data is rejected without the round trip
+     - the operations with concurrency limit wait for the free slot
+     - if transactions_per_second is set, the requests wait for the tokens of bucket
+
+    :param transactions_per_second: the limit of transactions per second,
+    not limited by default. Each instruction of placeOrders
+     and replaceOrders is counted as a transaction
+    :param burst: how many transactions can be sent at once, equal to transactions_per_second by default
+    :param concurrency_limits: dict with operation name and the limit
+     of concurrent requests, see DEFAULT_CONCURRENCY_LIMITS
+    :param market_data_limit: the limit of weight of one request
+    '''
+
+    def __init__(self, transactions_per_second=None, burst=None, concurrency_limits=None,
+                 market_data_limit=MARKET_DATA_LIMIT):
+        self.bucket = TokenBucket(transactions_per_second, burst) if transactions_per_second else None
+        if concurrency_limits is None:
+            concurrency_limits = DEFAULT_CONCURRENCY_LIMITS
+        self.concurrency_limits = dict(concurrency_limits)
+        self.market_data_limit = market_data_limit
+        self._semaphores = {}
+        self._stats = {}
+        self._stats_lock = threading.Lock()
+
+    @property
+    def stats(self):
+        '''
+        The queue wait time by operations:
+        {operation: {'calls': ..., 'total_wait': ..., 'max_wait': ..., 'average_wait': ...}}
+        '''
+        with self._stats_lock:
+            return {operation: dict(values, average_wait=values['total_wait'] / values['calls'])
+                    for operation, values in self._stats.items()}
+
+    def weight_error(self, relative_url, request_object):
+        '''
+        The TOO_MUCH_DATA error response (the same one that server returns),
+        if the weight of request is above the market_data_limit, otherwise None
+        '''
+        weight = request_weight(relative_url, request_object)
+        if weight <= self.market_data_limit:
+            return None
+        return {'faultcode': 'Client', 'faultstring': 'ANGX-0001',
+                'detail': {'exceptionname': 'APINGException',
+                           'APINGException': {'errorCode': 'TOO_MUCH_DATA',
+                                              'errorDetails': 'The weight of request is {}, the limit is {}'.format(
+                                                  weight, self.market_data_limit)}}}
+
+    @staticmethod
+    def transactions(relative_url, request_object):
+        if relative_url in INSTRUCTIONS_OPERATIONS:
+            return len(getattr(request_object, 'instructions', None) or ()) or 1
+        return 1
+
+    def concurrency_key(self, relative_url, request_object):
+        '''
+        The operation name, if the request is limited by concurrency, otherwise None
+        '''
+        if relative_url not in self.concurrency_limits:
+            return None
+        if relative_url == 'listMarketBook' and not (getattr(request_object, 'order_projection', None) or
+                                                     getattr(request_object, 'match_projection', None)):
+            return None
+        return relative_url
+
+    def _prepare_many(self, calls):
+        '''
+        :return: total number of transactions of calls and the sorted concurrency keys
+        '''
+        transactions = 0
+        keys = set()
+        for relative_url, request_object in calls:
+            transactions += self.transactions(relative_url, request_object)
+            key = self.concurrency_key(relative_url, request_object)
+            if key is not None:
+                keys.add(key)
+        return transactions, sorted(keys)
+
+    def _record_wait(self, relative_url, wait):
+        with self._stats_lock:
+            values = self._stats.setdefault(relative_url, {'calls': 0, 'total_wait': 0.0, 'max_wait': 0.0})
+            values['calls'] += 1
+            values['total_wait'] += wait
+            values['max_wait'] = max(values['max_wait'], wait)
+
+
+class RateLimiter(BaseRateLimiter):
+    '''
+    Rate limiter for the blocking managers. Thread-safe
+    '''
+
+    def _get_semaphore(self, key):
+        with self._stats_lock:
+            if key not in self._semaphores:
+                self._semaphores[key] = threading.BoundedSemaphore(self.concurrency_limits[key])
+            return self._semaphores[key]
+
+    @contextmanager
+    def acquire(self, relative_url, request_object):
+        '''
+        Wait until the request can be sent:
+        ___
+        with rate_limiter.acquire('listMarketBook', list_market_book_form):
+            send_request()
+        ___
+        '''
+        started = time.perf_counter()
+        if self.bucket is not None:
+            delay = self.bucket.reserve(self.transactions(relative_url, request_object))
+            if delay:
+                time.sleep(delay)
+
+        key = self.concurrency_key(relative_url, request_object)
+        semaphore = self._get_semaphore(key) if key is not None else None
+        if semaphore is not None:
+            semaphore.acquire()
+        self._record_wait(relative_url, time.perf_counter() - started)
+        try:
+            yield
+        finally:
+            if semaphore is not None:
+                semaphore.release()
+
+    @contextmanager
+    def acquire_many(self, calls, name='batch'):
+        '''
+        Wait until several calls can be sent in one request (JSON-RPC batch).
+        The transactions are summed and each concurrency limited operation takes one slot
+        :param calls: list of (relative_url, request_object) pairs
+        :param name: the name of operation in stats
+        '''
+        transactions, keys = self._prepare_many(calls)
+        started = time.perf_counter()
+        if self.bucket is not None:
+            delay = self.bucket.reserve(transactions)
+            if delay:
+                time.sleep(delay)
+        with ExitStack() as stack:
+            for key in keys:
+                semaphore = self._get_semaphore(key)
+                semaphore.acquire()
+                stack.callback(semaphore.release)
+            self._record_wait(name, time.perf_counter() - started)
+            yield
+
+
+class AsyncRateLimiter(BaseRateLimiter):
+    '''
+    Rate limiter for the asyncio managers.
+    It should be used inside one event loop
+    '''
+
+    def _get_semaphore(self, key):
+        if key not in self._semaphores:
+            self._semaphores[key] = asyncio.Semaphore(self.concurrency_limits[key])
+        return self._semaphores[key]
+
+    def acquire(self, relative_url, request_object):
+        '''
+        Wait until the request can be sent:
+        ___
+        async with rate_limiter.acquire('listMarketBook', list_market_book_form):
+            await send_request()
+        ___
+        '''
+        return _AsyncAcquire(self, [(relative_url, request_object)], relative_url)
+
+    def acquire_many(self, calls, name='batch'):
+        '''
+        Async version of RateLimiter.acquire_many
+        '''
+        return _AsyncAcquire(self, calls, name)
+
+
+class _AsyncAcquire:
+
+    def __init__(self, rate_limiter, calls, name):
+        self.rate_limiter = rate_limiter
+        self.calls = calls
+        self.name = name
+        self.semaphores = []
+
+    async def __aenter__(self):
+        limiter = self.rate_limiter
+        transactions, keys = limiter._prepare_many(self.calls)
+        started = time.perf_counter()
+        if limiter.bucket is not None:
+            delay = limiter.bucket.reserve(transactions)
+            if delay:
+                await asyncio.sleep(delay)
+
+        try:
+            for key in keys:
+                semaphore = limiter._get_semaphore(key)
+                await semaphore.acquire()
+                self.semaphores.append(semaphore)
+        except BaseException:
+            self._release()
+            raise
+        limiter._record_wait(self.name, time.perf_counter() - started)
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        self._release()
+
+    def _release(self):
+        while self.semaphores:
+            self.semaphores.pop().release()
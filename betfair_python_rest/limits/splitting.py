@@ -0,0 +1,53 @@
+from .weights import MARKET_DATA_LIMIT, MARKET_IDS_LIMIT, CATALOGUE_OPERATION, market_weight
+
+from dataclasses import replace
+
+# The operations, which can be split by market ids
+SPLIT_OPERATIONS = ('listMarketBook', CATALOGUE_OPERATION)
+
+
+def markets_per_request(weight, market_data_limit=MARKET_DATA_LIMIT):
+    '''
+    Maximum number of markets in one request with the given weight of one market
+    '''
+    if not weight:
+        return MARKET_IDS_LIMIT
+    return max(1, min(MARKET_IDS_LIMIT, int(market_data_limit // weight)))
+
+
+def split_request(relative_url, request_object, market_data_limit=MARKET_DATA_LIMIT):
+    '''
+    Split the form of listMarketBook or listMarketCatalogue (with market_ids filter)
+    into forms with the maximal chunks of market_ids, which fit the Market Data Request Limits.
+    :return: list of forms. The list contains only the original form,
+    if it doesn't need splitting
+    '''
+    market_ids = getattr(request_object, 'market_ids', None)
+    if relative_url not in SPLIT_OPERATIONS or not market_ids:
+        return [request_object]
+    if relative_url == CATALOGUE_OPERATION and (request_object.max_results or 0) < len(market_ids):
+        # The results are cut by max_results and sort, the chunks would return other markets
+        return [request_object]
+
+    size = markets_per_request(market_weight(relative_url, request_object), market_data_limit)
+    if len(market_ids) <= size:
+        return [request_object]
+    chunks = [market_ids[index:index + size] for index in range(0, len(market_ids), size)]
+    if relative_url == CATALOGUE_OPERATION:
+        return [replace(request_object, market_ids=chunk, max_results=len(chunk)) for chunk in chunks]
+    return [replace(request_object, market_ids=chunk) for chunk in chunks]
+
+
+def merge_market_responses(market_ids, responses):
+    '''
+    Merge the responses of split request into one list
+    in the order of original market_ids.
+    If one of responses is an error, it is returned instead
+    '''
+    for response in responses:
+        if not isinstance(response, list):
+            return response
+    positions = {market_id: position for position, market_id in enumerate(market_ids)}
+    merged = [market for response in responses for market in response]
+    merged.sort(key=lambda market: positions.get(market.get('marketId'), len(positions)))
+    return merged
@@ -0,0 +1,108 @@
+# Market Data Request Limits of Betfair Exchange API.
+# Each request can't exceed the MARKET_DATA_LIMIT, where the weight of
+# request is: sum(weight of projections) * number of markets
+MARKET_DATA_LIMIT = 200
+
+# Requests are limited to a total of 250 marketId's (REQUEST_SIZE_EXCEEDS_LIMIT)
+MARKET_IDS_LIMIT = 250
+
+# listMarketCatalogue returns up to 1000 markets (maxResults)
+MAX_CATALOGUE_RESULTS = 1000
+
+PRICE_DATA_WEIGHTS = {
+    'SP_AVAILABLE': 3,
+    'SP_TRADED': 7,
+    'EX_BEST_OFFERS': 5,
+    'EX_ALL_OFFERS': 17,
+    'EX_TRADED': 17,
+}
+# The weight of listMarketBook without price projection
+NO_PRICE_DATA_WEIGHT = 2
+# EX_BEST_OFFERS + EX_TRADED = 20, EX_ALL_OFFERS + EX_TRADED = 32
+EX_TRADED_COMBINATION_DISCOUNT = 2
+DEFAULT_BEST_PRICES_DEPTH = 3
+
+MARKET_PROJECTION_WEIGHTS = {
+    'COMPETITION': 0,
+    'EVENT': 0,
+    'EVENT_TYPE': 0,
+    'MARKET_START_TIME': 0,
+    'MARKET_DESCRIPTION': 1,
+    'RUNNER_DESCRIPTION': 0,
+    'RUNNER_METADATA': 1,
+}
+
+BOOK_OPERATIONS = ('listMarketBook', 'listRunnerBook')
+CATALOGUE_OPERATION = 'listMarketCatalogue'
+
+
+def price_data_weight(price_data, best_prices_depth=None):
+    '''
+    Weight of one market for listMarketBook and listRunnerBook
+    :param price_data: list of PriceData names
+    :param best_prices_depth: the bestPricesDepth of ExBestOffersOverrides
+    '''
+    price_data = set(price_data or ())
+    if not price_data:
+        return NO_PRICE_DATA_WEIGHT
+    if 'EX_ALL_OFFERS' in price_data:
+        # EX_ALL_OFFERS trumps EX_BEST_OFFERS
+        price_data.discard('EX_BEST_OFFERS')
+
+    weight = 0
+    for name in price_data:
+        if name == 'EX_BEST_OFFERS' and best_prices_depth and best_prices_depth > DEFAULT_BEST_PRICES_DEPTH:
+            weight += PRICE_DATA_WEIGHTS[name] * best_prices_depth / DEFAULT_BEST_PRICES_DEPTH
+        else:
+            weight += PRICE_DATA_WEIGHTS.get(name, 0)
+    if 'EX_TRADED' in price_data and price_data & {'EX_BEST_OFFERS', 'EX_ALL_OFFERS'}:
+        weight -= EX_TRADED_COMBINATION_DISCOUNT
+    return weight
+
+
+def market_projection_weight(market_projection):
+    '''
+    Weight of one market for listMarketCatalogue
+    :param market_projection: list of MarketProjection names
+    '''
+    return sum(MARKET_PROJECTION_WEIGHTS.get(name, 0) for name in set(market_projection or ()))
+
+
+def market_weight(relative_url, request_object):
+    '''
+    Weight of one market of the request or None,
+    if the request isn't limited by Market Data Request Limits
+    '''
+    if relative_url in BOOK_OPERATIONS:
+        return price_data_weight(getattr(request_object, 'price_data', None),
+                                 getattr(request_object, 'best_prices_depth', None))
+    if relative_url == CATALOGUE_OPERATION:
+        return market_projection_weight(getattr(request_object, 'market_projection', None))
+    return None
+
+
+def markets_count(relative_url, request_object):
+    '''
+    Number of markets, which the request asks for
+    '''
+    if relative_url == 'listMarketBook':
+        return len(request_object.market_ids or ())
+    if relative_url == 'listRunnerBook':
+        return 1
+    if relative_url == CATALOGUE_OPERATION:
+        max_results = request_object.max_results
+        if request_object.market_ids:
+            return min(len(request_object.market_ids), max_results or len(request_object.market_ids))
+        return max_results or 0
+    return 0
+
+
+def request_weight(relative_url, request_object):
+    '''
+    Weight of the whole request: sum(weight of projections) * number of markets.
+    Zero for the requests without Market Data Request Limits
+    '''
+    weight = market_weight(relative_url, request_object)
+    if weight is None:
+        return 0
+    return weight * markets_count(relative_url, request_object)
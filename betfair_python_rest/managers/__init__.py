@@ -1,3 +1,6 @@
 from .base_api_manager import BaseAPIManager
 from .betfair_betting import BetFairAPIManagerBetting
 from .betfair_accounts import BetFairAPIManagerAccounts
+from .async_base_api_manager import AsyncBaseAPIManager
+from .async_betfair_betting import AsyncBetFairAPIManagerBetting
+from .async_betfair_accounts import AsyncBetFairAPIManagerAccounts
@@ -0,0 +1,296 @@
+from ..limits import AsyncRateLimiter
+from .base_api_manager import BaseAPIManager
+from ..serialization import prune_empty, serialize_form
+from .json_rpc import demultiplex_json_rpc_response
+from .pagination import PagesPrefetcher, aiterate_pages
+
+import asyncio
+import ssl
+import time
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+
+class AsyncBaseAPIManager(BaseAPIManager):
+    '''
+    Base class for each asyncio api manager.
+    It works with the same forms and provides the same methods as
+    the blocking managers, but every request method is a coroutine.
+    All requests of one manager go through one aiohttp.ClientSession,
+    so they share its connection pool. Example:
+    ___
+    async with CustomAsyncBetFairAPIManagerBetting(login, password, api_key) as api_manager:
+        books = await asyncio.gather(*[api_manager.list_market_book(form) for form in forms])
+    ___
+    The login is not done in the constructor (it can't be awaited there),
+    it happens on entering the context manager or before the first request.
+    Don't forget to call close() if you use the manager without the context manager.
+    '''
+
+    def __init__(self, login, password, api_key, log_mode=False, session_token=None,
+                 domain_area='com', raise_exceptions=False, pool_connections=10,
+                 pool_maxsize=100, connection_keep_alive=True, keep_alive_timeout=15,
+                 session_keep_alive_interval=None, rate_limiter=None, response_models=False,
+                 response_cache=None, single_flight=None):
+        '''
+        :param login:
+        :param password:
+        :param api_key:
+        :param log_mode: Set True, if you need print
+        all responses of requests
+        :param session_token:
+        :param domain_area: string for domain area (possible values:
+        com, es (for Spanish Exchange) and it (for Italian Exchange))
+        :param raise_exceptions: Change on True, if you need to
+         get the raise exceptions, if server return the error.
+         Otherwise you will get just server response
+        :param pool_connections: number of hosts, which the manager works with
+         (api, login and keep alive hosts). The total limit of
+          simultaneously opened connections is pool_connections * pool_maxsize
+        :param pool_maxsize: maximum number of simultaneously opened
+         connections to one host. The requests above
+         the limit wait for the free connection
+        :param connection_keep_alive: Set False, if the connection should be
+        closed after each request
+        :param keep_alive_timeout: how many seconds the idle connection is kept in the pool
+        :param session_keep_alive_interval: seconds between the keepAlive
+        requests of background task, which prolong the session token.
+        The task isn't started, if it's None. Anyway, if the request
+        fails because of the expired session, the manager logs in again
+        and repeats the request (if the login and password were given)
+        :param rate_limiter: limits.AsyncRateLimiter object. By default the
+        limiter checks the Market Data Request Limits and the limits
+         of concurrent requests
+        :param response_models: Set True, if you need the typed objects
+         of models package instead of dicts in responses, see BaseAPIManager
+        :param response_cache: caching.ResponseCache object, see BaseAPIManager
+        :param single_flight: caching.AsyncSingleFlight object, see BaseAPIManager
+        '''
+        if aiohttp is None:
+            raise ImportError('The async managers require aiohttp package. '
+                              'Install it with: pip install betfair_python_rest[async]')
+        self.log_mode = log_mode
+        self.session_token = session_token
+        self.domain_area = domain_area
+        self.raise_exceptions = raise_exceptions
+        self.api_key = api_key
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.connection_keep_alive = connection_keep_alive
+        self.keep_alive_timeout = keep_alive_timeout
+        self.session_keep_alive_interval = session_keep_alive_interval
+        self.rate_limiter = rate_limiter if rate_limiter is not None else AsyncRateLimiter()
+        self.response_models = response_models
+        self.response_cache = response_cache
+        self.single_flight = single_flight
+        self.login_duration = None
+
+        self._login = login
+        self._password = password
+        self._login_lock = None
+        self._keep_alive_task = None
+        self.session = None
+
+    async def __aenter__(self):
+        await self._ensure_login()
+        if self.session_keep_alive_interval is not None:
+            self.start_keep_alive()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+    @property
+    def headers(self):
+        return {'X-Application': self.api_key, 'X-Authentication': self.session_token,
+                'Content-Type': 'application/json', 'Accept': 'application/json'}
+
+    def _get_session(self):
+        if self.session is None or self.session.closed:
+            if self.connection_keep_alive:
+                connector = aiohttp.TCPConnector(limit=self.pool_connections * self.pool_maxsize,
+                                                 limit_per_host=self.pool_maxsize,
+                                                 keepalive_timeout=self.keep_alive_timeout)
+            else:
+                connector = aiohttp.TCPConnector(limit=self.pool_connections * self.pool_maxsize,
+                                                 limit_per_host=self.pool_maxsize, force_close=True)
+            self.session = aiohttp.ClientSession(connector=connector)
+        return self.session
+
+    async def close(self):
+        '''
+        Stop the keep alive task, close the http session and all connections of the pool
+        '''
+        await self.stop_keep_alive()
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+
+    async def login(self):
+        '''
+        Non-interactive (bot) login with the certificate.
+        The request is sent through the same session that used for the API requests
+        '''
+        ssl_context = ssl.create_default_context()
+        ssl_context.load_cert_chain(*self._cert_paths)
+        started = time.perf_counter()
+        async with self._get_session().post(self.cert_login.format(self.domain_area),
+                                             data={'username': self._login, 'password': self._password},
+                                             headers={'X-Application': self.api_key, 'Accept': 'application/json'},
+                                             ssl=ssl_context) as response:
+            json_response = self.json_backend.loads(await response.read())
+        self._handle_login_response(json_response, time.perf_counter() - started)
+
+    def start_keep_alive(self):
+        '''
+        Start the background task, which calls keep_alive()
+        every session_keep_alive_interval seconds.
+        Should be called inside the running event loop
+        '''
+        if self._keep_alive_task is None or self._keep_alive_task.done():
+            self._keep_alive_task = asyncio.ensure_future(self._keep_alive_loop())
+
+    async def stop_keep_alive(self):
+        if self._keep_alive_task is not None:
+            self._keep_alive_task.cancel()
+            try:
+                await self._keep_alive_task
+            except asyncio.CancelledError:
+                pass
+            self._keep_alive_task = None
+
+    async def _keep_alive_loop(self):
+        while True:
+            await asyncio.sleep(self.session_keep_alive_interval)
+            try:
+                await self.keep_alive()
+            except Exception as exc:
+                if self.log_mode:
+                    print('Keep alive failed: {!r}'.format(exc))
+
+    async def keep_alive(self):
+        '''
+        Extend the session timeout. If the session is already
+        expired, the manager logs in again (if the login and password were given)
+        '''
+        session_token = self.session_token
+        headers = {'X-Application': self.api_key, 'X-Authentication': session_token,
+                   'Accept': 'application/json'}
+        async with self._get_session().post(self.keep_alive_url.format(self.domain_area),
+                                             headers=headers) as response:
+            json_response = self.json_backend.loads(await response.read())
+        self.print_response(json_response)
+        if json_response.get('status') != 'SUCCESS' and self._can_relogin:
+            await self._relogin(session_token)
+
+    def _get_login_lock(self):
+        if self._login_lock is None:
+            self._login_lock = asyncio.Lock()
+        return self._login_lock
+
+    async def _ensure_login(self):
+        if self.session_token is None:
+            await self._relogin(None)
+
+    async def _relogin(self, expired_token):
+        '''
+        Single-flight login: the first coroutine logs in, the other coroutines
+        with the same expired token wait for it and use the new token
+        '''
+        async with self._get_login_lock():
+            if self.session_token == expired_token:
+                await self.login()
+
+    async def _request_with_dataclass(self, relative_url, request_object, method_type='post', response_model=None):
+        '''
+        Coroutine version of BaseAPIManager._request_with_dataclass
+        '''
+        error = self.rate_limiter.weight_error(relative_url, request_object)
+        if error is not None:
+            return self._handle_response(error)
+        data = serialize_form(request_object)
+        cache_key = self._cache_key(relative_url, request_object, data)
+        response = self.response_cache.get(cache_key) if cache_key is not None else None
+        if response is None:
+            flight_key = self._flight_key(relative_url, request_object, data, cache_key)
+            if flight_key is None:
+                response = await self._limited_request(relative_url, request_object, data, method_type)
+            else:
+                response = await self.single_flight.do(flight_key, lambda: self._limited_request(
+                    relative_url, request_object, data, method_type))
+            self._cache_response(cache_key, response)
+        return self._build_models(response, response_model)
+
+    async def _limited_request(self, relative_url, request_object, data, method_type):
+        async with self.rate_limiter.acquire(relative_url, request_object):
+            return await self._make_request(relative_url, data=self._request_body(request_object, data),
+                                            method_type=method_type, prune=False)
+
+    async def _coalesced_request(self, relative_url, data=None):
+        '''
+        Coroutine version of BaseAPIManager._coalesced_request
+        '''
+        data = prune_empty(data if data is not None else {})
+        flight_key = self._flight_key(relative_url, data, data, None)
+        if flight_key is None:
+            return await self._make_request(relative_url, data=data, prune=False)
+        return await self.single_flight.do(flight_key, lambda: self._make_request(relative_url, data=data,
+                                                                                   prune=False))
+
+    async def _make_request(self, relative_url, method_type='post', data=None, prune=True):
+        '''
+        Coroutine version of BaseAPIManager._make_request
+        '''
+        await self._ensure_login()
+        url = self._get_url(relative_url)
+        data = self._serialize(data, prune)
+
+        session_token = self.session_token
+        json_response = await self._send(url, data, method_type)
+        if self._is_session_expired(json_response):
+            await self._relogin(session_token)
+            json_response = await self._send(url, data, method_type)
+        return self._handle_response(json_response)
+
+    def _iterate_pages(self, fetch_page, items_key, page_size, from_record, look_ahead, item_model=None):
+        '''
+        Async generator of records of all pages, the next pages are requested as tasks
+        '''
+        prefetcher = PagesPrefetcher(fetch_page, items_key, page_size, from_record, look_ahead,
+                                     self._get_error_code, item_model if self.response_models else None)
+        return aiterate_pages(prefetcher)
+
+    async def execute_many(self, calls):
+        '''
+        Coroutine version of BaseAPIManager.execute_many
+        '''
+        calls = list(calls)
+        errors = [self.rate_limiter.weight_error(relative_url, request_object)
+                  for relative_url, request_object in calls]
+        results = iter(await self._send_many([call for call, error in zip(calls, errors) if error is None]))
+        return [self._handle_response(next(results) if error is None else error) for error in errors]
+
+    async def _send_many(self, calls):
+        if not calls:
+            return []
+        async with self.rate_limiter.acquire_many(calls):
+            await self._ensure_login()
+            url, data = self._json_rpc_request(calls)
+            session_token = self.session_token
+            results = demultiplex_json_rpc_response(await self._send(url, data, 'post'), len(calls))
+            if any(self._is_session_expired(result) for result in results):
+                await self._relogin(session_token)
+                results = demultiplex_json_rpc_response(await self._send(url, data, 'post'), len(calls))
+        return results
+
+    async def _send(self, url, data, method_type):
+        session = self._get_session()
+        if method_type == 'get':
+            request = session.get(url, params=data, headers=self.headers)
+        else:
+            request = session.post(url, data=data, headers=self.headers)
+        async with request as response:
+            return self.json_backend.loads(await response.read())
@@ -0,0 +1,15 @@
+from .async_base_api_manager import AsyncBaseAPIManager
+from .betfair_accounts import BetFairAPIManagerAccounts
+
+
+class AsyncBetFairAPIManagerAccounts(AsyncBaseAPIManager, BetFairAPIManagerAccounts):
+    '''
+    The asyncio version of BetFairAPIManagerAccounts.
+    The methods and arguments are the same, but each method returns
+    a coroutine, so it should be used like that:
+    ___
+    async with CustomAsyncBetFairAPIManagerAccounts(login='login', password='password',
+                                                    api_key='api_key') as api_manager:
+        account_funds = await api_manager.get_account_funds()
+    ___
+    '''
@@ -0,0 +1,49 @@
+from ..limits import split_request, merge_market_responses
+from .async_base_api_manager import AsyncBaseAPIManager
+from .backfill import partition_cleared_orders_form, astream_partitions, aiter_chunks, ClearedOrdersCollector
+from .betfair_betting import BetFairAPIManagerBetting
+
+import asyncio
+
+
+class AsyncBetFairAPIManagerBetting(AsyncBaseAPIManager, BetFairAPIManagerBetting):
+    '''
+    The asyncio version of BetFairAPIManagerBetting.
+    The methods and forms are the same, but each method returns
+    a coroutine, so it should be used like that:
+    ___
+    market_book_form = ListMarketBookForm(**your_data)
+    async with CustomAsyncBetFairAPIManagerBetting(login='login', password='password',
+                                                   api_key='api_key') as api_manager:
+        market_book = await api_manager.list_market_book(request_class_object=market_book_form)
+    ___
+    '''
+
+    async def _request_split_by_markets(self, relative_url, request_object, response_model=None):
+        '''
+        Coroutine version of BetFairAPIManagerBetting._request_split_by_markets
+        '''
+        chunks = split_request(relative_url, request_object, self.rate_limiter.market_data_limit)
+        if len(chunks) == 1:
+            return await self._request_with_dataclass(relative_url, chunks[0], response_model=response_model)
+        responses = await asyncio.gather(*[self._request_with_dataclass(relative_url, chunk)
+                                           for chunk in chunks])
+        merged = merge_market_responses(request_object.market_ids, responses)
+        return self._build_models(merged, response_model)
+
+    async def backfill_cleared_orders(self, request_class_object, partitions=8, page_size=1000, sink=None):
+        '''
+        Coroutine version of BetFairAPIManagerBetting.backfill_cleared_orders
+        '''
+        collector = ClearedOrdersCollector(sink)
+        forms = partition_cleared_orders_form(request_class_object, partitions)
+        partition_pages = [lambda form=form: aiter_chunks(self.iter_cleared_orders(form, page_size, look_ahead=0),
+                                                          page_size)
+                           for form in forms]
+        current = None
+        async for index, page in astream_partitions(partition_pages):
+            if index != current:
+                current = index
+                collector.start_partition(forms[index].to_date)
+            collector.add(page)
+        return collector.result
@@ -0,0 +1,220 @@
+from dataclasses import replace
+from datetime import datetime, date, timedelta, timezone
+import asyncio
+import queue
+import threading
+
+# The default period of listClearedOrders
+DEFAULT_BACKFILL_PERIOD = timedelta(days=90)
+DATETIME_FORMATS = ('%Y-%m-%dT%H:%M:%S.%f', '%Y-%m-%dT%H:%M:%S', '%Y-%m-%d %H:%M:%S.%f',
+                    '%Y-%m-%d %H:%M:%S', '%Y-%m-%d')
+# How many pages each partition loads ahead of the consumer
+BUFFER_PAGES = 2
+# How often the blocked loader checks, if the backfill is stopped (seconds)
+STOP_CHECK_INTERVAL = 0.1
+
+
+def parse_datetime(value):
+    '''
+    Convert the date of the form (datetime, date or string in ISO format) to naive UTC datetime
+    '''
+    if value is None or isinstance(value, datetime):
+        if value is not None and value.tzinfo is not None:
+            value = value.astimezone(timezone.utc).replace(tzinfo=None)
+        return value
+    if isinstance(value, date):
+        return datetime(value.year, value.month, value.day)
+    value = value.strip().rstrip('Z')
+    for datetime_format in DATETIME_FORMATS:
+        try:
+            return datetime.strptime(value, datetime_format)
+        except ValueError:
+            continue
+    raise ValueError('Unknown date format: {}'.format(value))
+
+
+def format_datetime(value):
+    return value.strftime('%Y-%m-%dT%H:%M:%SZ')
+
+
+def split_time_range(from_date, to_date, partitions):
+    '''
+    Split the range into partitions with equal duration (rounded to seconds).
+    The neighbouring ranges share the boundary, because both dates of the range are inclusive
+    :return: list of (from, to) pairs of datetime
+    '''
+    seconds = int((to_date - from_date).total_seconds())
+    partitions = max(1, min(partitions, seconds))
+    boundaries = [from_date + timedelta(seconds=seconds * index // partitions) for index in range(partitions)]
+    boundaries.append(to_date)
+    return list(zip(boundaries[:-1], boundaries[1:]))
+
+
+def partition_cleared_orders_form(request_object, partitions):
+    '''
+    Split ListClearedOrdersForm into forms with sub-ranges of its settled date range.
+    If the range is not set, the last 90 days are used
+    '''
+    to_date = parse_datetime(request_object.to_date) or datetime.now(timezone.utc).replace(tzinfo=None, microsecond=0)
+    from_date = parse_datetime(request_object.from_date) or to_date - DEFAULT_BACKFILL_PERIOD
+    return [replace(request_object, from_date=format_datetime(range_from), to_date=format_datetime(range_to),
+                    from_record=None, record_count=None)
+            for range_from, range_to in split_time_range(from_date, to_date, partitions)]
+
+
+def iter_chunks(items, size):
+    '''
+    Generator of lists of up to size items
+    '''
+    chunk = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+async def aiter_chunks(items, size):
+    '''
+    Async version of iter_chunks for the async iterator of items
+    '''
+    chunk = []
+    async for item in items:
+        chunk.append(item)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+_DONE = object()
+
+
+def stream_partitions(executor, partitions, buffer_pages=BUFFER_PAGES):
+    '''
+    Generator of (partition index, page) in the order of partitions. The partitions are loaded in parallel
+    in the executor, but each of them keeps up to buffer_pages pages ahead of the consumer,
+    so the memory doesn't depend on the size of result
+    :param partitions: the functions, which return the iterators of pages of partitions
+    '''
+    stopped = threading.Event()
+    queues = [queue.Queue(maxsize=buffer_pages) for _ in partitions]
+
+    def put(pages, item):
+        while not stopped.is_set():
+            try:
+                pages.put(item, timeout=STOP_CHECK_INTERVAL)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def load(load_pages, pages):
+        try:
+            for page in load_pages():
+                if not put(pages, page):
+                    return
+            put(pages, _DONE)
+        except BaseException as error:
+            put(pages, error)
+
+    futures = [executor.submit(load, load_pages, pages) for load_pages, pages in zip(partitions, queues)]
+    try:
+        for index, pages in enumerate(queues):
+            while True:
+                page = pages.get()
+                if page is _DONE:
+                    break
+                if isinstance(page, BaseException):
+                    raise page
+                yield index, page
+    finally:
+        stopped.set()
+        for future in futures:
+            future.cancel()
+
+
+async def astream_partitions(partitions, buffer_pages=BUFFER_PAGES):
+    '''
+    Async version of stream_partitions, the partitions are loaded as tasks
+    :param partitions: the functions, which return the async iterators of pages of partitions
+    '''
+    queues = [asyncio.Queue(maxsize=buffer_pages) for _ in partitions]
+
+    async def load(load_pages, pages):
+        try:
+            async for page in load_pages():
+                await pages.put(page)
+            await pages.put(_DONE)
+        except Exception as error:
+            await pages.put(error)
+
+    tasks = [asyncio.ensure_future(load(load_pages, pages)) for load_pages, pages in zip(partitions, queues)]
+    try:
+        for index, pages in enumerate(queues):
+            while True:
+                page = await pages.get()
+                if page is _DONE:
+                    break
+                if isinstance(page, BaseException):
+                    raise page
+                yield index, page
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+class ClearedOrdersCollector:
+    '''
+    Collects the pages of partitions (which should be added in the order of dates),
+    removes the duplicates from the boundaries of ranges and
+    passes the orders to the sink or keeps them in the list.
+    The neighbouring ranges share only the boundary second, so only the bet ids settled
+    in the last second of the previous partition are kept for the deduplication
+    '''
+
+    def __init__(self, sink=None):
+        self.sink = sink
+        self.orders = []
+        self.count = 0
+        self._boundary = None
+        self._boundary_bet_ids = set()
+        self._previous_bet_ids = set()
+
+    def start_partition(self, to_date):
+        '''
+        The next orders belong to the partition with the end to_date
+        '''
+        self._previous_bet_ids = self._boundary_bet_ids
+        self._boundary_bet_ids = set()
+        self._boundary = format_datetime(parse_datetime(to_date))[:19] if to_date is not None else None
+
+    def _on_boundary(self, settled_date):
+        # The dates of response are ISO strings, so their seconds are compared as strings
+        if self._boundary is None or not isinstance(settled_date, str):
+            return True
+        return settled_date[:19].replace(' ', 'T') >= self._boundary
+
+    def add(self, orders):
+        for order in orders:
+            if isinstance(order, dict):
+                bet_id, settled_date = order.get('betId'), order.get('settledDate')
+            else:
+                bet_id, settled_date = order.bet_id, order.settled_date
+            if bet_id is not None:
+                if bet_id in self._previous_bet_ids:
+                    continue
+                if self._on_boundary(settled_date):
+                    self._boundary_bet_ids.add(bet_id)
+            self.count += 1
+            if self.sink is not None:
+                self.sink(order)
+            else:
+                self.orders.append(order)
+
+    @property
+    def result(self):
+        return self.count if self.sink is not None else self.orders
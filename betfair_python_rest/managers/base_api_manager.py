@@ -1,20 +1,40 @@
 from ..api_exceptions.base_exception import BetFairAPIManagerException
+from ..serialization import prune_empty, serialize_form, get_default_json_backend
+from ..limits import RateLimiter
+from ..caching import canonical_key
+from ..forms import FrozenForm
+from .json_rpc import JSONRPCBatch, build_json_rpc_body, demultiplex_json_rpc_response
+from .pagination import PagesPrefetcher, iterate_pages
 
 import requests
+from requests.adapters import HTTPAdapter
 import json
 from abc import abstractmethod
+from concurrent.futures import ThreadPoolExecutor
 import os
+import threading
+import time
 
 
 class BaseAPIManager:
     '''
     Base class for each adding api manager
     '''
-    session = requests.Session()
     cert_login = 'https://identitysso-cert.betfair.{}/api/certlogin'
+    keep_alive_url = 'https://identitysso.betfair.{}/api/keepAlive'
+    # Object with dumps and loads methods, see serialization.JSONBackend
+    json_backend = get_default_json_backend()
+    # The JSON-RPC endpoint and the prefix of its methods, used by execute_many and batch
+    json_rpc_root = None
+    json_rpc_method_prefix = None
+    # The error codes, after which the session is renewed and the request is repeated
+    session_error_codes = ('INVALID_SESSION_INFORMATION', 'NO_SESSION')
 
     def __init__(self, login, password, api_key, log_mode=False, session_token=None,
-                 domain_area='com', raise_exceptions=False):
+                 domain_area='com', raise_exceptions=False, pool_connections=10,
+                 pool_maxsize=10, pool_block=False, connection_keep_alive=True,
+                 session_keep_alive_interval=None, rate_limiter=None, response_models=False,
+                 response_cache=None, single_flight=None):
         '''
         :param login:
         :param password:
@@ -27,24 +47,202 @@ class BaseAPIManager:
         :param raise_exceptions: Change on True, if you need to
          get the raise exceptions, if server return the error.
          Otherwise you will get just server response
+        :param pool_connections: number of hosts, for which the
+         connection pools are kept (api, login and keep alive hosts)
+        :param pool_maxsize: maximum number of connections kept
+        in the pool of one host. Set it to the number of threads,
+        which use the manager at the same time
+        :param pool_block: Set True, if the thread should wait for the free
+         connection, when all connections of the pool are busy.
+         Otherwise the extra connection is opened and dropped after the request
+        :param connection_keep_alive: Set False, if the connection should be
+        closed after each request
+        :param session_keep_alive_interval: seconds between the keepAlive
+        requests of background thread, which prolong the session token.
+        The thread isn't started, if it's None. Anyway, if the request
+        fails because of the expired session, the manager logs in again
+        and repeats the request (if the login and password were given)
+        :param rate_limiter: limits.RateLimiter object. By default the
+        limiter checks the Market Data Request Limits and the limits
+         of concurrent requests. Pass RateLimiter(transactions_per_second=...),
+         if you need to limit the transactions per second too
+        :param response_models: Set True, if you need the typed objects of models
+        package (MarketBook, CurrentOrderSummaryReport, ClearedOrderSummaryReport,
+        PlaceExecutionReport) instead of dicts in responses of listMarketBook,
+        listRunnerBook, listCurrentOrders, listClearedOrders and placeOrders.
+        The errors are returned as dicts anyway
+        :param response_cache: caching.ResponseCache object, if the responses of
+        rarely changed operations (listEventTypes, listCompetitions and other navigation
+        requests by default) should be reused. The cache is off by default
+        :param single_flight: caching.SingleFlight object, if the identical concurrent
+        read requests (the same operation and the same content of form) should
+        share one request to the server. It's off by default
 
         '''
         self.log_mode = log_mode
         self.session_token = session_token
         self.domain_area = domain_area
         self.raise_exceptions = raise_exceptions
+        self.api_key = api_key
+        self.login_duration = None
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.pool_block = pool_block
+        self.connection_keep_alive = connection_keep_alive
+        self.session = self._create_session()
+
+        self.session_keep_alive_interval = session_keep_alive_interval
+        self.rate_limiter = rate_limiter if rate_limiter is not None else RateLimiter()
+        self.response_models = response_models
+        self.response_cache = response_cache
+        self.single_flight = single_flight
+
+        self._login = login
+        self._password = password
+        self._login_lock = threading.Lock()
+        self._keep_alive_stop = threading.Event()
+        self._keep_alive_thread = None
+        self._executor = None
+        self._executor_lock = threading.Lock()
 
-        cert_auth_link = self.cert_login.format(domain_area)
         if session_token is None:
-            cert_login_command = 'curl -q -k --cert /{} --key /{} {} -d "username={}&password={}" ' \
-                                 '-H "X-Application: {}"'.format(self.crt_path, self.crt_key_path, cert_auth_link,
-                                                                 login, password, api_key)
-            response = os.popen(cert_login_command).read()
-            print(response)
-            json_response = json.loads(response)
-            self.session_token = json_response['sessionToken']
-        self.session.headers = {'X-Application': api_key, 'X-Authentication': self.session_token,
-                                'Content-Type': 'application/json', 'Accept': 'application/json'}
+            self.login()
+        self.session.headers.update({'X-Application': api_key, 'X-Authentication': self.session_token,
+                                     'Content-Type': 'application/json', 'Accept': 'application/json'})
+        if session_keep_alive_interval is not None:
+            self.start_keep_alive()
+
+    def _create_session(self):
+        '''
+        Each manager owns its session, so the managers of different
+        accounts (or Betting and Accounts managers) don't share the headers
+        '''
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=self.pool_connections,
+                              pool_maxsize=self.pool_maxsize,
+                              pool_block=self.pool_block)
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        if not self.connection_keep_alive:
+            session.headers['Connection'] = 'close'
+        return session
+
+    def close(self):
+        '''
+        Stop the keep alive thread, the thread pool of parallel
+        requests and close all connections of the session pool
+        '''
+        self.stop_keep_alive()
+        with self._executor_lock:
+            if self._executor is not None:
+                self._executor.shutdown()
+                self._executor = None
+        self.session.close()
+
+    def _get_executor(self):
+        '''
+        Thread pool for the parallel requests of one call (i.e. the chunks of split request).
+        Its size is equal to the size of connections pool
+        '''
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.pool_maxsize,
+                                                    thread_name_prefix=type(self).__name__)
+            return self._executor
+
+    def start_keep_alive(self):
+        '''
+        Start the background thread, which calls keep_alive()
+        every session_keep_alive_interval seconds
+        '''
+        if self._keep_alive_thread is not None and self._keep_alive_thread.is_alive():
+            return
+        self._keep_alive_stop.clear()
+        self._keep_alive_thread = threading.Thread(target=self._keep_alive_loop, daemon=True,
+                                                   name='{}-keep-alive'.format(type(self).__name__))
+        self._keep_alive_thread.start()
+
+    def stop_keep_alive(self):
+        self._keep_alive_stop.set()
+        if self._keep_alive_thread is not None and self._keep_alive_thread is not threading.current_thread():
+            self._keep_alive_thread.join()
+        self._keep_alive_thread = None
+
+    def _keep_alive_loop(self):
+        while not self._keep_alive_stop.wait(self.session_keep_alive_interval):
+            try:
+                self.keep_alive()
+            except Exception as exc:
+                if self.log_mode:
+                    print('Keep alive failed: {!r}'.format(exc))
+
+    def keep_alive(self):
+        '''
+        Extend the session timeout. If the session is already
+        expired, the manager logs in again (if the login and password were given)
+        '''
+        session_token = self.session_token
+        response = self.session.post(self.keep_alive_url.format(self.domain_area),
+                                     headers={'Content-Type': None})
+        json_response = self.json_backend.loads(response.content)
+        self.print_response(json_response)
+        if json_response.get('status') != 'SUCCESS' and self._can_relogin:
+            self._relogin(session_token)
+
+    def _relogin(self, expired_token):
+        '''
+        Single-flight login: the first thread logs in, the other threads
+        with the same expired token wait for it and use the new token
+        '''
+        with self._login_lock:
+            if self.session_token == expired_token:
+                self.login()
+                self.session.headers['X-Authentication'] = self.session_token
+
+    @property
+    def _can_relogin(self):
+        return self._login is not None and self._password is not None
+
+    def login(self):
+        '''
+        Non-interactive (bot) login with the certificate.
+        The request is sent through the same session that used for the API requests,
+        so there is no subprocess and the connection goes to the pool
+        '''
+        started = time.perf_counter()
+        response = self.session.post(self.cert_login.format(self.domain_area),
+                                     data={'username': self._login, 'password': self._password},
+                                     headers=self._login_headers, cert=self._cert_paths)
+        self._handle_login_response(self.json_backend.loads(response.content), time.perf_counter() - started)
+
+    def on_login(self, duration):
+        '''
+        Timing hook, called after each login request.
+        Override it, if you need to collect the login timings somewhere
+        :param duration: duration of the login request in seconds
+        '''
+        if self.log_mode:
+            print('Login request took {:.3f} sec'.format(duration))
+
+    @property
+    def _login_headers(self):
+        return {'X-Application': self.api_key, 'X-Authentication': None,
+                'Content-Type': 'application/x-www-form-urlencoded', 'Accept': 'application/json'}
+
+    @property
+    def _cert_paths(self):
+        '''
+        The paths of certificate and key. The relative paths are
+        counted from the root, as it always was in this package
+        '''
+        return os.path.join(os.sep, self.crt_path), os.path.join(os.sep, self.crt_key_path)
+
+    def _handle_login_response(self, json_response, duration):
+        self.login_duration = duration
+        self.on_login(duration)
+        if json_response.get('loginStatus') != 'SUCCESS':
+            raise BetFairAPIManagerException(json_response.get('loginStatus'))
+        self.session_token = json_response['sessionToken']
 
     @property
     def root(self, value):
@@ -76,7 +274,7 @@ class BaseAPIManager:
         if self.log_mode:
             print(json.dumps(response, indent=4))
 
-    def _request_with_dataclass(self, relative_url, request_object, method_type='post'):
+    def _request_with_dataclass(self, relative_url, request_object, method_type='post', response_model=None):
         '''
         Some of the requests have a common request structure,
          which can be easily put into a template function,
@@ -90,13 +288,86 @@ class BaseAPIManager:
         And listEventTypes - relative url
 
         :param request_object: The form class with all request data. You can view the examples in forms directory
-        :return:
+        :param response_model: the model class of response, which is used if response_models is True
+        :return: decoded json of response
+        '''
+        error = self.rate_limiter.weight_error(relative_url, request_object)
+        if error is not None:
+            return self._handle_response(error)
+        data = serialize_form(request_object)
+        cache_key = self._cache_key(relative_url, request_object, data)
+        response = self.response_cache.get(cache_key) if cache_key is not None else None
+        if response is None:
+            flight_key = self._flight_key(relative_url, request_object, data, cache_key)
+            if flight_key is None:
+                response = self._limited_request(relative_url, request_object, data, method_type)
+            else:
+                response = self.single_flight.do(flight_key, lambda: self._limited_request(
+                    relative_url, request_object, data, method_type))
+            self._cache_response(cache_key, response)
+        return self._build_models(response, response_model)
+
+    def _limited_request(self, relative_url, request_object, data, method_type):
+        with self.rate_limiter.acquire(relative_url, request_object):
+            return self._make_request(relative_url, data=self._request_body(request_object, data),
+                                      method_type=method_type, prune=False)
+
+    def _coalesced_request(self, relative_url, data=None):
+        '''
+        _make_request of the operations without forms (i.e. getAccountFunds),
+        which goes through single_flight, if the operation is coalesced
+        '''
+        data = prune_empty(data if data is not None else {})
+        flight_key = self._flight_key(relative_url, data, data, None)
+        if flight_key is None:
+            return self._make_request(relative_url, data=data, prune=False)
+        return self.single_flight.do(flight_key, lambda: self._make_request(relative_url, data=data, prune=False))
+
+    def _request_body(self, request_object, data):
+        '''
+        The data of request or the bytes of body, which the frozen form has encoded before
+        '''
+        if isinstance(request_object, FrozenForm):
+            return request_object.encode(self.json_backend)
+        return data
+
+    def _cache_key(self, relative_url, request_object, data):
+        '''
+        The key of response_cache or None, if the response of operation isn't cached
+        '''
+        if self.response_cache is None or not self.response_cache.is_cached(relative_url):
+            return None
+        return self._canonical_key(relative_url, request_object, data)
+
+    def _flight_key(self, relative_url, request_object, data, cache_key):
         '''
-        response = self._make_request(relative_url, data=request_object.data, method_type=method_type).json()
-        self.__check_exceptions(json_response=response)
-        return response
+        The key of single_flight or None, if the operation isn't coalesced
+        '''
+        if self.single_flight is None or not self.single_flight.is_coalesced(relative_url):
+            return None
+        return cache_key if cache_key is not None else self._canonical_key(relative_url, request_object, data)
+
+    @staticmethod
+    def _canonical_key(relative_url, request_object, data):
+        if isinstance(request_object, FrozenForm):
+            return request_object.canonical_key(relative_url)
+        return canonical_key(relative_url, data)
+
+    def _cache_response(self, cache_key, response):
+        if cache_key is not None and self._get_error_code(response) is None:
+            self.response_cache.set(cache_key, response)
+
+    def _build_models(self, response, response_model):
+        '''
+        Convert the decoded response (the object or list of objects) to the models
+        '''
+        if response_model is None or not self.response_models or self._get_error_code(response) is not None:
+            return response
+        if isinstance(response, list):
+            return [response_model.from_dict(item) for item in response]
+        return response_model.from_dict(response)
 
-    def _make_request(self, relative_url, method_type='post', data=None):
+    def _make_request(self, relative_url, method_type='post', data=None, prune=True):
         '''
         In this method we just execute requests.post or requests.get, but with some nuances, written below
         :param method_type: http request type. get for GET-request, post - for POST-requests
@@ -107,23 +378,118 @@ class BaseAPIManager:
         https://api.betfair.com/exchange/betting/rest/v1.0/
         And listEventTypes - relative url
 
-        :param data: data, which need to send with request
-        :return:
+        :param data: data, which need to send with request, or the encoded body (bytes)
+        :param prune: remove the None and empty values from data (the data of forms is already pruned)
+        :return: decoded json of response. The body is decoded only once,
+        and the same object goes to the log, to the errors check and to the caller
         '''
-        root = self.root.format(self.domain_area)
-        url = '{}/{}/'.format(root, relative_url)
-        data = json.dumps(data, indent=4)
+        url = self._get_url(relative_url)
+        data = self._serialize(data, prune)
+
+        session_token = self.session_token
+        json_response = self._send(url, data, method_type)
+        if self._is_session_expired(json_response):
+            self._relogin(session_token)
+            json_response = self._send(url, data, method_type)
+        return self._handle_response(json_response)
 
+    def _send(self, url, data, method_type):
         if method_type == 'get':
             response = self.session.get(url, params=data)
         else:
             response = self.session.post(url, data=data)
-        self.print_response(response.json())
-        return response
+        return self.json_backend.loads(response.content)
 
-    def __check_exceptions(self, json_response):
-        if self.raise_exceptions:
-            print(json_response)
+    def _handle_response(self, json_response):
+        self.print_response(json_response)
+        self._check_exceptions(json_response=json_response)
+        return json_response
+
+    def _is_session_expired(self, json_response):
+        return self._can_relogin and self._get_error_code(json_response) in self.session_error_codes
 
-            if 'detail' in json_response.keys():
-                raise BetFairAPIManagerException(json_response['detail']['APINGException']['errorCode'])
+    def _iterate_pages(self, fetch_page, items_key, page_size, from_record, look_ahead, item_model=None):
+        '''
+        Generator of records of all pages, the next pages are requested in the thread pool
+        '''
+        prefetcher = PagesPrefetcher(fetch_page, items_key, page_size, from_record, look_ahead,
+                                     self._get_error_code, item_model if self.response_models else None)
+        return iterate_pages(prefetcher, self._get_executor())
+
+    def batch(self):
+        '''
+        Context manager, which collects the calls and sends them
+        in one JSON-RPC request, see JSONRPCBatch
+        '''
+        return JSONRPCBatch(self)
+
+    def execute_many(self, calls):
+        '''
+        Send several operations in one http request through the JSON-RPC endpoint
+        :param calls: list of (relative_url, request_object) pairs, i.e.
+        [('listMarketBook', list_market_book_form), ('listCurrentOrders', list_current_orders_form)]
+        :return: list of decoded results in the order of calls. The errors have
+        the same format as the errors of REST requests
+        '''
+        calls = list(calls)
+        # The calls with too much data aren't sent, their results are the TOO_MUCH_DATA errors
+        errors = [self.rate_limiter.weight_error(relative_url, request_object)
+                  for relative_url, request_object in calls]
+        results = iter(self._send_many([call for call, error in zip(calls, errors) if error is None]))
+        return [self._handle_response(next(results) if error is None else error) for error in errors]
+
+    def _send_many(self, calls):
+        if not calls:
+            return []
+        with self.rate_limiter.acquire_many(calls):
+            url, data = self._json_rpc_request(calls)
+            session_token = self.session_token
+            results = demultiplex_json_rpc_response(self._send(url, data, 'post'), len(calls))
+            if any(self._is_session_expired(result) for result in results):
+                self._relogin(session_token)
+                results = demultiplex_json_rpc_response(self._send(url, data, 'post'), len(calls))
+        return results
+
+    def _json_rpc_request(self, calls):
+        if self.json_rpc_root is None:
+            raise AttributeError('The json_rpc_root is required for JSON-RPC requests')
+        body = build_json_rpc_body(self.json_rpc_method_prefix, [(relative_url, serialize_form(request_object))
+                                                                 for relative_url, request_object in calls])
+        return self.json_rpc_root.format(self.domain_area), self.json_backend.dumps(body)
+
+    def _get_url(self, relative_url):
+        root = self.root.format(self.domain_area)
+        return '{}/{}/'.format(root, relative_url)
+
+    def _serialize(self, data, prune=True):
+        '''
+        Convert the request data to the compact body of request.
+        The None and empty values are removed, the API treats them as missing anyway.
+        The encoded body is sent as is
+        '''
+        if isinstance(data, (bytes, bytearray)):
+            return data
+        if data is None:
+            data = {}
+        return self.json_backend.dumps(prune_empty(data) if prune else data)
+
+    @staticmethod
+    def _get_error_code(json_response):
+        '''
+        The error code of the server response (like INVALID_SESSION_INFORMATION)
+        or None, if the response is not an error.
+        The errors of Betting API are described in APINGException,
+        of Accounts API - in AccountAPINGException
+        '''
+        if not isinstance(json_response, dict) or not isinstance(json_response.get('detail'), dict):
+            return None
+        for exception in json_response['detail'].values():
+            if isinstance(exception, dict) and 'errorCode' in exception:
+                return exception['errorCode']
+        return None
+
+    def _check_exceptions(self, json_response):
+        if self.raise_exceptions:
+            error_code = self._get_error_code(json_response)
+            if error_code is not None:
+                raise BetFairAPIManagerException(error_code)
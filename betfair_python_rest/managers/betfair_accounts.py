@@ -8,6 +8,8 @@ class BetFairAPIManagerAccounts(BaseAPIManager):
     '''
 
     root = 'https://api.betfair.{}/exchange/account/rest/v1.0'
+    json_rpc_root = 'https://api.betfair.{}/exchange/account/json-rpc/v1'
+    json_rpc_method_prefix = 'AccountAPING/v1.0/'
 
     def create_developer_app_keys(self, app_name):
         '''
@@ -33,7 +35,7 @@ class BetFairAPIManagerAccounts(BaseAPIManager):
         :param wallet: Name of the wallet in question.
         Global wallet is returned by default
         '''
-        response = self._make_request('getAccountFunds', data={'wallet': wallet})
+        response = self._coalesced_request('getAccountFunds', data={'wallet': wallet})
         return response
 
     def transfer_funds(self):
@@ -50,7 +52,7 @@ class BetFairAPIManagerAccounts(BaseAPIManager):
          point balance.
         '''
 
-        response = self._make_request('getAccountDetails')
+        response = self._coalesced_request('getAccountDetails')
         return response
 
     def get_account_statement(self, locale=None, from_record=None, record_count=None,
@@ -83,16 +85,41 @@ class BetFairAPIManagerAccounts(BaseAPIManager):
         If unspecified then the UK wallet will be selected
 
         '''
-        response = self._make_request('getAccountStatement',
-                                      data={'locale': locale, 'fromRecord': from_record,
-                                            'recordCount': record_count,
-                                            'itemDateRange': {
-                                                'from': item_data_range_from,
-                                                'to': item_data_range_to
-                                            },
-                                            'includeItem': include_item, 'wallet': wallet})
+        response = self._coalesced_request('getAccountStatement',
+                                           data={'locale': locale, 'fromRecord': from_record,
+                                                 'recordCount': record_count,
+                                                 'itemDateRange': {
+                                                     'from': item_data_range_from,
+                                                     'to': item_data_range_to
+                                                 },
+                                                 'includeItem': include_item, 'wallet': wallet})
         return response
 
+    def iter_account_statement(self, locale=None, from_record=None, item_data_range_from=None,
+                               item_data_range_to=None, include_item=None, wallet=None,
+                               page_size=100, look_ahead=1):
+        '''
+        Iterate over all items of account statement without the manual paging.
+        The next pages are requested in background, while the current page
+        is consumed, so only the current page and look_ahead pages are kept in memory:
+        ___
+        for item in api_manager.iter_account_statement(item_data_range_from=from_date):
+            print(item['refId'])
+        ___
+        With the async manager use "async for".
+        The params are the same as in get_account_statement, except:
+
+        :param page_size: recordCount of each request, the limit is 100
+        :param look_ahead: how many pages are requested in advance
+        '''
+        def fetch_page(page_from_record):
+            return self.get_account_statement(locale=locale, from_record=page_from_record,
+                                              record_count=page_size,
+                                              item_data_range_from=item_data_range_from,
+                                              item_data_range_to=item_data_range_to,
+                                              include_item=include_item, wallet=wallet)
+        return self._iterate_pages(fetch_page, 'accountStatement', page_size, from_record, look_ahead)
+
     def list_currency_rates(self, from_currency=None):
         '''
         Returns a list of currency rates based on given currency.
@@ -102,6 +129,8 @@ class BetFairAPIManagerAccounts(BaseAPIManager):
          :param from_currency: The currency from which the rates
          are computed. Please note: GBP is currently the
          only based currency support
+
+         Use caching.CurrencyRates, if you need the rates often
         '''
-        response = self._make_request('getAccountDetails', data={'fromCurrency': from_currency})
+        response = self._coalesced_request('listCurrencyRates', data={'fromCurrency': from_currency})
         return response
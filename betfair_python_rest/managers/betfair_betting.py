@@ -1,4 +1,10 @@
+from ..limits import split_request, merge_market_responses
+from ..models import (MarketBook, CurrentOrder, CurrentOrderSummaryReport, ClearedOrder,
+                      ClearedOrderSummaryReport, PlaceExecutionReport)
 from .base_api_manager import BaseAPIManager
+from .backfill import partition_cleared_orders_form, stream_partitions, iter_chunks, ClearedOrdersCollector
+
+from dataclasses import replace
 
 
 class BetFairAPIManagerBetting(BaseAPIManager):
@@ -9,6 +15,30 @@ class BetFairAPIManagerBetting(BaseAPIManager):
     '''
 
     root = 'https://api.betfair.{}/exchange/betting/rest/v1.0'
+    json_rpc_root = 'https://api.betfair.{}/exchange/betting/json-rpc/v1'
+    json_rpc_method_prefix = 'SportsAPING/v1.0/'
+
+    def _request_split_by_markets(self, relative_url, request_object, response_model=None):
+        '''
+        Split the request by market ids into the chunks under the weight limit,
+        send them in parallel and merge the results
+        '''
+        chunks = split_request(relative_url, request_object, self.rate_limiter.market_data_limit)
+        if len(chunks) == 1:
+            return self._request_with_dataclass(relative_url, chunks[0], response_model=response_model)
+        responses = self._get_executor().map(lambda chunk: self._request_with_dataclass(relative_url, chunk),
+                                              chunks)
+        merged = merge_market_responses(request_object.market_ids, list(responses))
+        return self._build_models(merged, response_model)
+
+    def _form_page_fetcher(self, relative_url, request_object, page_size):
+        '''
+        Function, which requests one page of the paginated form
+        '''
+        def fetch_page(from_record):
+            page_form = replace(request_object, from_record=from_record, record_count=page_size)
+            return self._request_with_dataclass(relative_url, page_form)
+        return fetch_page
 
     def list_event_types(self, request_class_object):
         '''
@@ -88,10 +118,13 @@ class BetFairAPIManagerBetting(BaseAPIManager):
          listMarketCatalogue to retrieve the name of the market, the names
           of selections and other information about markets.  Market Data
           Request Limits apply to requests made to listMarketCatalogue.
+          If the markets are requested by market_ids and the request
+          exceeds the limits, it is split into several requests, which
+          are sent in parallel, and the results are merged in the order of market_ids.
 
         :param request_class_object: The ListMarketCatalogueForm object
         '''
-        return self._request_with_dataclass('listMarketCatalogue', request_class_object)
+        return self._request_split_by_markets('listMarketCatalogue', request_class_object)
 
     def list_market_book(self, request_class_object):
         '''
@@ -99,10 +132,13 @@ class BetFairAPIManagerBetting(BaseAPIManager):
         Dynamic data includes prices, the status of the market,
          the status of selections, the traded volume, and
          the status of any orders you have placed in the market.
+         If market_ids with the requested projections exceed the Market Data
+          Request Limits, the request is split into several requests, which
+          are sent in parallel, and the results are merged in the order of market_ids.
 
         :param request_class_object: The ListMarketBookForm object
         '''
-        return self._request_with_dataclass('listMarketBook', request_class_object)
+        return self._request_split_by_markets('listMarketBook', request_class_object, MarketBook)
 
     def list_runner_book(self, request_class_object):
         '''
@@ -114,7 +150,7 @@ class BetFairAPIManagerBetting(BaseAPIManager):
         :param request_class_object: The ListRunnerBookForm object
 
         '''
-        return self._request_with_dataclass('listRunnerBook', request_class_object)
+        return self._request_with_dataclass('listRunnerBook', request_class_object, response_model=MarketBook)
 
     def list_market_profit_and_loss(self, request_class_object):
         '''
@@ -143,7 +179,29 @@ class BetFairAPIManagerBetting(BaseAPIManager):
 
         :return:
         '''
-        return self._request_with_dataclass('listCurrentOrders', request_class_object)
+        return self._request_with_dataclass('listCurrentOrders', request_class_object,
+                                            response_model=CurrentOrderSummaryReport)
+
+    def iter_current_orders(self, request_class_object, page_size=1000, look_ahead=1):
+        '''
+        Iterate over all current orders without the manual paging by fromRecord
+        and recordCount. The next pages are requested in background,
+        while the current page is consumed, so only the
+         current page and look_ahead pages are kept in memory:
+        ___
+        for order in api_manager.iter_current_orders(ListCurrentOrdersForm()):
+            print(order['betId'])
+        ___
+        With the async manager use "async for".
+
+        :param request_class_object: The ListCurrentOrdersForm object,
+        its from_record is the first record of iteration
+        :param page_size: recordCount of each request, the limit is 1000
+        :param look_ahead: how many pages are requested in advance
+        '''
+        return self._iterate_pages(self._form_page_fetcher('listCurrentOrders', request_class_object, page_size),
+                                   'currentOrders', page_size, request_class_object.from_record, look_ahead,
+                                   CurrentOrder)
 
     def list_cleared_orders(self, request_class_object):
         '''
@@ -156,7 +214,52 @@ class BetFairAPIManagerBetting(BaseAPIManager):
         Best Practice note below).  The fields available at
         each roll-up are available here
         '''
-        return self._request_with_dataclass('listClearedOrders', request_class_object)
+        return self._request_with_dataclass('listClearedOrders', request_class_object,
+                                            response_model=ClearedOrderSummaryReport)
+
+    def iter_cleared_orders(self, request_class_object, page_size=1000, look_ahead=1):
+        '''
+        Iterate over all settled bets without the manual paging,
+        see iter_current_orders for details
+
+        :param request_class_object: The ListClearedOrdersForm object
+        :param page_size: recordCount of each request, the limit is 1000
+        :param look_ahead: how many pages are requested in advance
+        '''
+        return self._iterate_pages(self._form_page_fetcher('listClearedOrders', request_class_object, page_size),
+                                   'clearedOrders', page_size, request_class_object.from_record, look_ahead,
+                                   ClearedOrder)
+
+    def backfill_cleared_orders(self, request_class_object, partitions=8, page_size=1000, sink=None):
+        '''
+        Load all settled bets of the long period (i.e. 90 days) faster than iter_cleared_orders:
+        the settled date range is split into sub-ranges, which are loaded in parallel
+        (within the limit of concurrent listClearedOrders requests of rate limiter).
+        The bets from the boundaries of sub-ranges are deduplicated by betId.
+        The pages are passed to the sink as they arrive, each sub-range loads
+        only a couple of pages ahead, so with the sink the memory doesn't grow with the result.
+
+        :param request_class_object: The ListClearedOrdersForm object. If its
+        from_date or to_date are not set, the last 90 days are loaded
+        :param partitions: number of sub-ranges
+        :param page_size: recordCount of each request, the limit is 1000
+        :param sink: optional function, which is called with each
+         order in the order of settled date. If it's passed, the orders
+         are not collected and the method returns their number
+        :return: list of orders in the order of settled date or their number, if the sink is passed
+        '''
+        collector = ClearedOrdersCollector(sink)
+        forms = partition_cleared_orders_form(request_class_object, partitions)
+        partition_pages = [lambda form=form: iter_chunks(self.iter_cleared_orders(form, page_size, look_ahead=0),
+                                                         page_size)
+                           for form in forms]
+        current = None
+        for index, page in stream_partitions(self._get_executor(), partition_pages):
+            if index != current:
+                current = index
+                collector.start_partition(forms[index].to_date)
+            collector.add(page)
+        return collector.result
 
     def place_orders(self, request_class_object):
         '''
@@ -169,8 +272,12 @@ class BetFairAPIManagerBetting(BaseAPIManager):
         off, placeOrders can return ‘PROCESSED_WITH_ERRORS’
         meaning that some bets can be rejected and other
          placed when submitted in the same PlaceInstruction
+
+        :param request_class_object: The PlaceOrderForm object or BulkPlaceOrderForm
+         (many LIMIT orders given by arrays)
         '''
-        return self._request_with_dataclass('placeOrders', request_class_object)
+        return self._request_with_dataclass('placeOrders', request_class_object,
+                                            response_model=PlaceExecutionReport)
 
     def cancel_orders(self, request_class_object):
         '''
@@ -0,0 +1,123 @@
+from ..serialization import prune_empty, KEEP_EMPTY_KEYS
+
+JSON_RPC_KEEP_EMPTY_KEYS = KEEP_EMPTY_KEYS | {'params'}
+
+
+def build_json_rpc_body(method_prefix, calls):
+    '''
+    The body of JSON-RPC request with several calls
+    :param method_prefix: i.e. SportsAPING/v1.0/
+    :param calls: list of (relative_url, data) pairs
+    '''
+    body = [{'jsonrpc': '2.0', 'method': method_prefix + relative_url,
+             'params': data if data is not None else {}, 'id': index}
+            for index, (relative_url, data) in enumerate(calls)]
+    return prune_empty(body, keep_empty=JSON_RPC_KEEP_EMPTY_KEYS)
+
+
+def demultiplex_json_rpc_response(json_response, calls_count):
+    '''
+    Split the JSON-RPC response into results in the order of calls.
+    The errors are converted to the format of REST API errors
+    ({'faultstring': ..., 'detail': {'APINGException': {'errorCode': ...}}}),
+    so they are processed the same way as the errors of other requests
+    '''
+    if isinstance(json_response, dict):
+        # The error of the whole request
+        json_response = [dict(json_response, id=index) for index in range(calls_count)]
+    results = [None] * calls_count
+    for item in json_response:
+        if 'error' in item:
+            error = item['error']
+            result = {'faultstring': error.get('message'), 'detail': error.get('data') or {}}
+        else:
+            result = item.get('result')
+        results[item['id']] = result
+    return results
+
+
+class BatchResult:
+    '''
+    The placeholder of result of one call in JSONRPCBatch.
+    The result is available after the batch execution
+    '''
+    __slots__ = ('relative_url', 'request_object', 'done', '_result')
+
+    def __init__(self, relative_url, request_object):
+        self.relative_url = relative_url
+        self.request_object = request_object
+        self.done = False
+        self._result = None
+
+    @property
+    def result(self):
+        if not self.done:
+            raise AttributeError('The batch has not been executed yet')
+        return self._result
+
+    def set_result(self, result):
+        self._result = result
+        self.done = True
+
+
+class JSONRPCBatch:
+    '''
+    Collects several calls and sends them as one JSON-RPC request.
+    It should be used like that:
+    ___
+    with api_manager.batch() as batch:
+        market_book = batch.add('listMarketBook', list_market_book_form)
+        current_orders = batch.add('listCurrentOrders', list_current_orders_form)
+    print(market_book.result, current_orders.result)
+    ___
+    With the async managers use "async with" instead of "with".
+    The request is sent on the exit of context (if there was no exception)
+    or by the execute() call
+    '''
+
+    def __init__(self, manager):
+        self.manager = manager
+        self.calls = []
+
+    def add(self, relative_url, request_object):
+        '''
+        :param relative_url: name of operation, the same as the relative url of REST API (i.e. listMarketBook)
+        :param request_object: The form class with all request data
+        :return: BatchResult object
+        '''
+        call = BatchResult(relative_url, request_object)
+        self.calls.append(call)
+        return call
+
+    def _pending_calls(self):
+        return [call for call in self.calls if not call.done]
+
+    @staticmethod
+    def _set_results(calls, results):
+        for call, result in zip(calls, results):
+            call.set_result(result)
+        return results
+
+    def execute(self):
+        calls = self._pending_calls()
+        results = self.manager.execute_many([(call.relative_url, call.request_object) for call in calls])
+        return self._set_results(calls, results)
+
+    async def execute_async(self):
+        calls = self._pending_calls()
+        results = await self.manager.execute_many([(call.relative_url, call.request_object) for call in calls])
+        return self._set_results(calls, results)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if exc_type is None:
+            self.execute()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        if exc_type is None:
+            await self.execute_async()
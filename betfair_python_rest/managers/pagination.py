@@ -0,0 +1,103 @@
+from ..api_exceptions.base_exception import BetFairAPIManagerException
+
+from collections import deque
+import asyncio
+
+
+def get_page_items(response, items_key, get_error_code):
+    '''
+    The list of records of one page. The error response is raised,
+    because the iteration can't be continued after it
+    '''
+    error_code = get_error_code(response)
+    if error_code is not None:
+        raise BetFairAPIManagerException(error_code)
+    return response.get(items_key) or []
+
+
+class PagesPrefetcher:
+    '''
+    Common logic of the paginated iteration with look-ahead:
+    the next look_ahead pages are requested while the current page is consumed.
+    The iteration stops on the empty page or when moreAvailable is false,
+    the already requested extra pages are cancelled
+    '''
+
+    def __init__(self, fetch_page, items_key, page_size, from_record, look_ahead, get_error_code,
+                 item_model=None):
+        '''
+        :param fetch_page: function, which accepts from_record and returns
+        the decoded response (or coroutine for the async iteration)
+        :param items_key: the key of records list in response, i.e. currentOrders
+        :param page_size: the recordCount of each request
+        :param from_record: the first record of iteration
+        :param look_ahead: how many pages are requested in advance
+        :param get_error_code: function to get the error code of response
+        :param item_model: the model class, if the records should be converted to the models
+        '''
+        self.fetch_page = fetch_page
+        self.items_key = items_key
+        self.page_size = page_size
+        self.look_ahead = max(0, look_ahead)
+        self.get_error_code = get_error_code
+        self.item_model = item_model
+        self.next_record = from_record or 0
+
+    def next_from_record(self):
+        from_record = self.next_record
+        self.next_record += self.page_size
+        return from_record
+
+    def page(self, response):
+        '''
+        :return: the records of page and the flag, if the iteration should be continued
+        '''
+        items = get_page_items(response, self.items_key, self.get_error_code)
+        if self.item_model is not None:
+            items = [self.item_model.from_dict(item) for item in items]
+        return items, bool(items) and bool(response.get('moreAvailable'))
+
+
+def iterate_pages(prefetcher, executor=None):
+    '''
+    Generator of records of all pages. The pages are requested
+    in the executor threads, if it's passed
+    '''
+    if executor is None or not prefetcher.look_ahead:
+        while True:
+            items, more = prefetcher.page(prefetcher.fetch_page(prefetcher.next_from_record()))
+            yield from items
+            if not more:
+                return
+
+    pending = deque(executor.submit(prefetcher.fetch_page, prefetcher.next_from_record())
+                    for _ in range(prefetcher.look_ahead + 1))
+    try:
+        while pending:
+            items, more = prefetcher.page(pending.popleft().result())
+            yield from items
+            if not more:
+                return
+            pending.append(executor.submit(prefetcher.fetch_page, prefetcher.next_from_record()))
+    finally:
+        for future in pending:
+            future.cancel()
+
+
+async def aiterate_pages(prefetcher):
+    '''
+    Async generator of records of all pages, the pages are requested as asyncio tasks
+    '''
+    pending = deque(asyncio.ensure_future(prefetcher.fetch_page(prefetcher.next_from_record()))
+                    for _ in range(prefetcher.look_ahead + 1))
+    try:
+        while pending:
+            items, more = prefetcher.page(await pending.popleft())
+            for item in items:
+                yield item
+            if not more:
+                return
+            pending.append(asyncio.ensure_future(prefetcher.fetch_page(prefetcher.next_from_record())))
+    finally:
+        for task in pending:
+            task.cancel()
@@ -0,0 +1,5 @@
+from .ladders import (BACK, LAY, TRADED, ladder_array, RunnerLadders,
+                      MarketLadders, market_book_ladders)
+from .diff import MarketBookDiffer, MarketChange, RunnerChange, runner_key
+from .market_cache import MarketCache, CachedMarket, MarketPoller
+from .catalogue_store import CatalogueStore, DEFAULT_MARKET_PROJECTION
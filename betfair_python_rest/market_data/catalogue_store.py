@@ -0,0 +1,206 @@
+from ..forms import ListMarketCatalogueForm
+from ..caching import TTLCache
+
+from dataclasses import replace
+from datetime import datetime
+import json
+import sqlite3
+import threading
+import time
+
+# The projection of catalogues, which are requested by fetch_missing():
+# the event and the event type are needed for the indexes
+DEFAULT_MARKET_PROJECTION = ['COMPETITION', 'EVENT', 'EVENT_TYPE', 'MARKET_START_TIME',
+                             'MARKET_DESCRIPTION', 'RUNNER_DESCRIPTION']
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS market_catalogue (
+    market_id TEXT PRIMARY KEY,
+    event_id TEXT,
+    event_type_id TEXT,
+    competition_id TEXT,
+    market_start_time TEXT,
+    updated_at REAL NOT NULL,
+    catalogue TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS market_catalogue_event_id ON market_catalogue (event_id);
+CREATE INDEX IF NOT EXISTS market_catalogue_event_type_id ON market_catalogue (event_type_id);
+CREATE INDEX IF NOT EXISTS market_catalogue_start_time ON market_catalogue (market_start_time);
+'''
+
+# The limit of maxResults of listMarketCatalogue
+MAX_RESULTS = 1000
+# SQLite limits the number of variables in one query
+_QUERY_CHUNK = 500
+
+
+class CatalogueStore:
+    '''
+    Persistent storage of listMarketCatalogue results in the SQLite file,
+    indexed by marketId, eventId and eventTypeId. Several processes can use the same file,
+    so the workers start with the known catalogues and request only the missing ones:
+    ___
+    store = CatalogueStore('catalogue.sqlite')
+    catalogues = store.fetch_missing(api_manager, market_ids)
+    ...
+    store.evict_closed(api_manager.list_market_book(market_book_form))
+    ___
+    The closed markets should be evicted by evict_closed() (by listMarketBook responses)
+    or evict_started_before() (by the start time of markets)
+    '''
+
+    def __init__(self, path=':memory:', timeout=30, miss_ttl=300, max_misses=100000):
+        '''
+        :param path: path of the database file, the store is in memory by default
+        :param timeout: seconds to wait, while the file is locked by another process
+        :param miss_ttl: seconds, for which fetch_missing() doesn't request again the markets,
+         which were requested, but not returned (closed or unknown markets)
+        :param max_misses: maximum number of remembered missed markets
+        '''
+        self.path = path
+        self._misses = TTLCache(maxsize=max_misses, ttl=miss_ttl)
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, timeout=timeout, check_same_thread=False)
+        with self._lock, self._connection:
+            if path != ':memory:':
+                # The readers of other processes don't wait for the writer
+                self._connection.execute('PRAGMA journal_mode=WAL')
+            self._connection.executescript(SCHEMA)
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def __len__(self):
+        return self._execute('SELECT COUNT(*) FROM market_catalogue')[0][0]
+
+    def __contains__(self, market_id):
+        return bool(self._execute('SELECT 1 FROM market_catalogue WHERE market_id = ?', (market_id,)))
+
+    def put(self, response):
+        '''
+        Save (or replace) the markets of listMarketCatalogue response
+        :return: number of saved markets
+        '''
+        if not isinstance(response, list):
+            raise ValueError('The response is not a list of markets: {}'.format(response))
+        now = time.time()
+        rows = [self._row(catalogue, now) for catalogue in response]
+        with self._lock, self._connection:
+            self._connection.executemany('INSERT OR REPLACE INTO market_catalogue VALUES (?, ?, ?, ?, ?, ?, ?)', rows)
+        return len(rows)
+
+    def get(self, market_id):
+        '''
+        The catalogue of market (dict) or None
+        '''
+        rows = self._execute('SELECT catalogue FROM market_catalogue WHERE market_id = ?', (market_id,))
+        return json.loads(rows[0][0]) if rows else None
+
+    def get_many(self, market_ids):
+        '''
+        :return: dict {market id: catalogue} of the stored markets
+        '''
+        return {market_id: json.loads(catalogue) for market_id, catalogue in
+                self._select_in('SELECT market_id, catalogue FROM market_catalogue WHERE market_id IN ({})',
+                                market_ids)}
+
+    def missing(self, market_ids):
+        '''
+        The market ids, which are not in the store (in the original order)
+        '''
+        stored = {row[0] for row in self._select_in(
+            'SELECT market_id FROM market_catalogue WHERE market_id IN ({})', market_ids)}
+        return [market_id for market_id in market_ids if market_id not in stored]
+
+    def markets_of_event(self, event_id):
+        return self._catalogues('WHERE event_id = ?', (event_id,))
+
+    def markets_of_event_type(self, event_type_id):
+        return self._catalogues('WHERE event_type_id = ?', (event_type_id,))
+
+    def fetch_missing(self, api_manager, market_ids, catalogue_form=None):
+        '''
+        Request the catalogues of markets, which are not in the store, and save them.
+        The markets, which the server hasn't returned, are not requested again for miss_ttl seconds
+        :param api_manager: BetFairAPIManagerBetting object
+        :param catalogue_form: ListMarketCatalogueForm with the projection and locale,
+         its market_ids are replaced. By default DEFAULT_MARKET_PROJECTION is requested
+        :return: dict {market id: catalogue} of all given markets, which are known
+        '''
+        missing = [market_id for market_id in self.missing(market_ids) if self._misses.get(market_id) is None]
+        if catalogue_form is None:
+            catalogue_form = ListMarketCatalogueForm(market_projection=DEFAULT_MARKET_PROJECTION)
+        for start in range(0, len(missing), MAX_RESULTS):
+            chunk = missing[start:start + MAX_RESULTS]
+            self.put(api_manager.list_market_catalogue(replace(catalogue_form, market_ids=chunk,
+                                                               max_results=len(chunk))))
+            for market_id in self.missing(chunk):
+                self._misses.set(market_id, True)
+        return self.get_many(market_ids)
+
+    def evict(self, market_ids):
+        '''
+        :return: number of removed markets
+        '''
+        removed = 0
+        market_ids = list(market_ids)
+        with self._lock, self._connection:
+            for start in range(0, len(market_ids), _QUERY_CHUNK):
+                chunk = market_ids[start:start + _QUERY_CHUNK]
+                removed += self._connection.execute('DELETE FROM market_catalogue WHERE market_id IN ({})'.format(
+                    ', '.join('?' * len(chunk))), chunk).rowcount
+        return removed
+
+    def evict_closed(self, market_books):
+        '''
+        Remove the markets, which are CLOSED in the listMarketBook response
+        :return: number of removed markets
+        '''
+        market_books = [market_book if isinstance(market_book, dict) else market_book.to_dict()
+                        for market_book in market_books]
+        return self.evict(market_book.get('marketId') for market_book in market_books
+                          if market_book.get('status') == 'CLOSED')
+
+    def evict_started_before(self, moment):
+        '''
+        Remove the markets, which started before the moment (datetime in UTC)
+        :return: number of removed markets
+        '''
+        with self._lock, self._connection:
+            return self._connection.execute('DELETE FROM market_catalogue WHERE market_start_time < ?',
+                                            (moment.strftime('%Y-%m-%dT%H:%M:%S'),)).rowcount
+
+    @staticmethod
+    def _row(catalogue, now):
+        if not isinstance(catalogue, dict):
+            catalogue = catalogue.to_dict()
+        start_time = catalogue.get('marketStartTime')
+        if isinstance(start_time, datetime):
+            start_time = start_time.strftime('%Y-%m-%dT%H:%M:%S')
+        return (catalogue.get('marketId'), (catalogue.get('event') or {}).get('id'),
+                (catalogue.get('eventType') or {}).get('id'), (catalogue.get('competition') or {}).get('id'),
+                start_time, now, json.dumps(catalogue, default=str))
+
+    def _catalogues(self, condition, parameters):
+        return [json.loads(row[0]) for row in self._execute(
+            'SELECT catalogue FROM market_catalogue {} ORDER BY market_start_time, market_id'.format(condition),
+            parameters)]
+
+    def _select_in(self, query, values):
+        values = list(values)
+        rows = []
+        for start in range(0, len(values), _QUERY_CHUNK):
+            chunk = values[start:start + _QUERY_CHUNK]
+            rows.extend(self._execute(query.format(', '.join('?' * len(chunk))), chunk))
+        return rows
+
+    def _execute(self, query, parameters=()):
+        with self._lock:
+            return self._connection.execute(query, parameters).fetchall()
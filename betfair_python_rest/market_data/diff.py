@@ -0,0 +1,169 @@
+from threading import Lock
+
+
+def runner_key(runner):
+    '''
+    The runner is identified by selectionId and handicap (the handicap markets
+    have several runners with the same selectionId)
+    '''
+    return runner.get('selectionId'), runner.get('handicap') or 0.0
+
+
+def changed_keys(previous, current, skip=()):
+    '''
+    The keys of two dicts with different values (missing key is the same as None)
+    '''
+    return frozenset(key for key in previous.keys() | current.keys()
+                     if key not in skip and previous.get(key) != current.get(key))
+
+
+class RunnerChange:
+    '''
+    The change of one runner between two polls.
+    changed - the json keys of runner with new values (the ladders are
+    named by keys of runner['ex']: availableToBack, availableToLay, tradedVolume).
+    previous is None for the new runner
+    '''
+    __slots__ = ('market_id', 'selection_id', 'handicap', 'runner', 'previous', 'changed')
+
+    def __init__(self, market_id, runner, previous, changed):
+        self.market_id = market_id
+        self.selection_id, self.handicap = runner_key(runner)
+        self.runner = runner
+        self.previous = previous
+        self.changed = changed
+
+    @property
+    def is_new(self):
+        return self.previous is None
+
+    def __contains__(self, key):
+        return key in self.changed
+
+    def __repr__(self):
+        return 'RunnerChange(market_id={!r}, selection_id={!r}, handicap={!r}, changed={})'.format(
+            self.market_id, self.selection_id, self.handicap, sorted(self.changed))
+
+
+class MarketChange:
+    '''
+    The change of one market between two polls:
+    changed - the json keys of market (except runners) with new values,
+    runners - list of RunnerChange of the changed runners only,
+    removed_runners - keys (selectionId, handicap) of runners missing in the new snapshot
+    '''
+    __slots__ = ('market_id', 'market_book', 'previous', 'changed', 'runners', 'removed_runners')
+
+    def __init__(self, market_id, market_book, previous, changed, runners, removed_runners):
+        self.market_id = market_id
+        self.market_book = market_book
+        self.previous = previous
+        self.changed = changed
+        self.runners = runners
+        self.removed_runners = removed_runners
+
+    @property
+    def is_new(self):
+        return self.previous is None
+
+    def __repr__(self):
+        return 'MarketChange(market_id={!r}, changed={}, runners={}, removed_runners={})'.format(
+            self.market_id, sorted(self.changed), len(self.runners), self.removed_runners)
+
+
+class MarketBookDiffer:
+    '''
+    Compare each listMarketBook snapshot with the previous snapshot of the same market
+    and return only the changes, so the strategy code processes only the changed runners:
+    ___
+    differ = MarketBookDiffer()
+    while True:
+        for market_change in differ.update(api_manager.list_market_book(market_book_form)):
+            for runner_change in market_change.runners:
+                if 'availableToBack' in runner_change:
+                    ...
+    ___
+    The markets missing in the response are kept (the poll can request only a part of markets),
+    use forget() to drop the closed markets.
+    The differ keeps the response dicts as the previous snapshots, so they shouldn't be changed.
+    The unchanged runners of the kept snapshot are the same objects as in the previous one
+    '''
+    market_skip_keys = ('runners',)
+
+    def __init__(self):
+        self._markets = {}
+        self._lock = Lock()
+
+    def __len__(self):
+        return len(self._markets)
+
+    def get(self, market_id):
+        '''
+        The last snapshot of market or None
+        '''
+        market = self._markets.get(market_id)
+        return market[0] if market is not None else None
+
+    def forget(self, market_id):
+        with self._lock:
+            self._markets.pop(market_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._markets.clear()
+
+    def update(self, response):
+        '''
+        :param response: listMarketBook response (list of dicts or models.MarketBook)
+        :return: list of MarketChange of the changed and new markets
+        '''
+        changes = []
+        with self._lock:
+            for market_book in response:
+                if not isinstance(market_book, dict):
+                    market_book = market_book.to_dict()
+                change = self._update_market(market_book)
+                if change is not None:
+                    changes.append(change)
+        return changes
+
+    def _update_market(self, market_book):
+        market_id = market_book.get('marketId')
+        runners = {runner_key(runner): runner for runner in market_book.get('runners') or ()}
+        previous = self._markets.get(market_id)
+        if previous is None:
+            self._markets[market_id] = (market_book, runners)
+            return MarketChange(market_id, market_book, None, frozenset(market_book.keys()) - {'runners'},
+                                [RunnerChange(market_id, runner, None, self._runner_changed_keys({}, runner))
+                                 for runner in runners.values()], [])
+
+        previous_book, previous_runners = previous
+        changed = changed_keys(previous_book, market_book, self.market_skip_keys)
+        runner_changes = []
+        for key, runner in runners.items():
+            previous_runner = previous_runners.get(key)
+            if previous_runner is None:
+                runner_changes.append(RunnerChange(market_id, runner, None, self._runner_changed_keys({}, runner)))
+            elif previous_runner == runner:
+                # The unchanged runner keeps the object of previous snapshot
+                runners[key] = previous_runner
+            else:
+                runner_changes.append(RunnerChange(market_id, runner, previous_runner,
+                                                   self._runner_changed_keys(previous_runner, runner)))
+        removed = [key for key in previous_runners if key not in runners]
+        if not changed and not runner_changes and not removed:
+            return None
+        market_book = dict(market_book, runners=list(runners.values()))
+        self._markets[market_id] = (market_book, runners)
+        return MarketChange(market_id, market_book, previous_book, changed, runner_changes, removed)
+
+    @staticmethod
+    def _runner_changed_keys(previous, current):
+        # The keys of runner['ex'] are compared separately, so the change
+        # of one ladder doesn't mark the whole 'ex' as changed
+        changed = changed_keys(previous, current, ('ex',))
+        previous_ex = previous.get('ex') or {}
+        current_ex = current.get('ex') or {}
+        if previous_ex != current_ex:
+            changed = changed | changed_keys(previous_ex, current_ex)
+        return changed
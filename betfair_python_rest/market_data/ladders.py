@@ -0,0 +1,217 @@
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+BACK = 'back'
+LAY = 'lay'
+TRADED = 'traded'
+
+# The json keys of ladders in the runner (the back and lay ladders are in runner['ex'])
+LADDER_KEYS = {BACK: 'availableToBack', LAY: 'availableToLay', TRADED: 'tradedVolume'}
+
+
+def _check_numpy():
+    if np is None:
+        raise ImportError('The price ladder arrays require numpy package. '
+                          'Install it with: pip install betfair_python_rest[numpy]')
+
+
+def ladder_array(price_sizes):
+    '''
+    Convert the ladder of response (list of {price, size} dicts) into the (n, 2) float array,
+    the first column is price, the second one is size. The order of ladder is kept:
+    the best price is the first for back and lay ladders, the traded volume is sorted by price
+    '''
+    _check_numpy()
+    if not price_sizes:
+        return np.empty((0, 2))
+    values = np.fromiter((value for price_size in price_sizes
+                          for value in (price_size['price'], price_size['size'])),
+                         dtype=float, count=2 * len(price_sizes))
+    return values.reshape(-1, 2)
+
+
+class RunnerLadders:
+    '''
+    Back, lay and traded ladders of one runner as (n, 2) arrays of (price, size)
+    '''
+    __slots__ = ('selection_id', 'handicap', 'back', 'lay', 'traded')
+
+    def __init__(self, selection_id, handicap, back, lay, traded):
+        self.selection_id = selection_id
+        self.handicap = handicap
+        self.back = back
+        self.lay = lay
+        self.traded = traded
+
+    @classmethod
+    def from_runner(cls, runner):
+        ex = runner.get('ex') or {}
+        return cls(runner.get('selectionId'), runner.get('handicap', 0.0),
+                   ladder_array(ex.get(LADDER_KEYS[BACK])), ladder_array(ex.get(LADDER_KEYS[LAY])),
+                   ladder_array(ex.get(LADDER_KEYS[TRADED])))
+
+    def __repr__(self):
+        return 'RunnerLadders(selection_id={!r}, handicap={!r}, back={}, lay={}, traded={})'.format(
+            self.selection_id, self.handicap, len(self.back), len(self.lay), len(self.traded))
+
+
+class MarketLadders:
+    '''
+    The ladders of all runners of one market.
+    Besides the per runner arrays (runners attribute), the market keeps 2-D arrays
+    (runner x ladder level) of prices and sizes for each side:
+    back_prices, back_sizes, lay_prices, lay_sizes, traded_prices, traded_sizes.
+    The rows are in the order of runners in response, the short ladders are padded
+    with nan prices and zero sizes, so the calculations below work on the whole market at once.
+    The example:
+    ___
+    ladders = market_book_ladders(api_manager.list_market_book(market_book_form))
+    for market in ladders:
+        back_prices, back_sizes = market.best(BACK)
+        available = market.liquidity(LAY, price_limit=3.0)
+    ___
+    '''
+    __slots__ = ('market_id', 'runners', 'selection_ids', 'handicaps', 'last_price_traded',
+                 'total_matched', 'back_prices', 'back_sizes', 'lay_prices', 'lay_sizes',
+                 'traded_prices', 'traded_sizes')
+
+    def __init__(self, market_id, runners, last_price_traded=None, total_matched=None):
+        '''
+        :param market_id:
+        :param runners: list of RunnerLadders
+        :param last_price_traded: sequence of last traded prices of runners (None - unknown)
+        :param total_matched: sequence of matched amounts of runners (None - unknown)
+        '''
+        _check_numpy()
+        self.market_id = market_id
+        self.runners = runners
+        self.selection_ids = np.array([runner.selection_id for runner in runners], dtype=np.int64)
+        self.handicaps = np.array([runner.handicap or 0.0 for runner in runners], dtype=float)
+        self.last_price_traded = self._optional_values(last_price_traded, len(runners))
+        self.total_matched = self._optional_values(total_matched, len(runners))
+        self.back_prices, self.back_sizes = self._stack([runner.back for runner in runners])
+        self.lay_prices, self.lay_sizes = self._stack([runner.lay for runner in runners])
+        self.traded_prices, self.traded_sizes = self._stack([runner.traded for runner in runners])
+
+    @classmethod
+    def from_market_book(cls, market_book):
+        '''
+        :param market_book: one market of listMarketBook response (dict or models.MarketBook)
+        '''
+        if not isinstance(market_book, dict):
+            market_book = market_book.to_dict()
+        runners = market_book.get('runners') or []
+        return cls(market_book.get('marketId'), [RunnerLadders.from_runner(runner) for runner in runners],
+                   [runner.get('lastPriceTraded') for runner in runners],
+                   [runner.get('totalMatched') for runner in runners])
+
+    @staticmethod
+    def _optional_values(values, count):
+        if values is None:
+            return np.full(count, np.nan)
+        return np.array([np.nan if value is None else value for value in values], dtype=float)
+
+    @staticmethod
+    def _stack(ladders):
+        depth = max((len(ladder) for ladder in ladders), default=0)
+        prices = np.full((len(ladders), depth), np.nan)
+        sizes = np.zeros((len(ladders), depth))
+        for row, ladder in enumerate(ladders):
+            prices[row, :len(ladder)] = ladder[:, 0]
+            sizes[row, :len(ladder)] = ladder[:, 1]
+        return prices, sizes
+
+    def arrays(self, side):
+        '''
+        :param side: BACK, LAY or TRADED
+        :return: tuple of 2-D arrays (prices, sizes) of the side
+        '''
+        if side == BACK:
+            return self.back_prices, self.back_sizes
+        if side == LAY:
+            return self.lay_prices, self.lay_sizes
+        if side == TRADED:
+            return self.traded_prices, self.traded_sizes
+        raise ValueError('Unknown side of ladder: {}'.format(side))
+
+    def runner_index(self, selection_id, handicap=0.0):
+        '''
+        The row of the runner in the market arrays
+        '''
+        rows = np.flatnonzero((self.selection_ids == selection_id) & (self.handicaps == (handicap or 0.0)))
+        if not len(rows):
+            raise KeyError((selection_id, handicap))
+        return int(rows[0])
+
+    def best(self, side):
+        '''
+        Best available prices and sizes of all runners (nan price and 0 size, if the ladder is empty)
+        :param side: BACK or LAY
+        '''
+        prices, sizes = self.arrays(side)
+        if not prices.shape[1]:
+            return np.full(len(self.runners), np.nan), np.zeros(len(self.runners))
+        return prices[:, 0].copy(), sizes[:, 0].copy()
+
+    def spread(self):
+        '''
+        Difference between the best lay and the best back prices of each runner
+        '''
+        return self.best(LAY)[0] - self.best(BACK)[0]
+
+    def depth(self, side, levels=None):
+        '''
+        The total size of the side for each runner
+        :param levels: count only the first levels of ladder (i.e. 3 for the best offers)
+        '''
+        sizes = self.arrays(side)[1]
+        if levels is not None:
+            sizes = sizes[:, :levels]
+        return sizes.sum(axis=1)
+
+    def vwap(self, side, levels=None):
+        '''
+        Volume weighted average price of the side (TRADED - of the matched volume) for each runner,
+        nan if the ladder is empty
+        '''
+        prices, sizes = self.arrays(side)
+        if levels is not None:
+            prices, sizes = prices[:, :levels], sizes[:, :levels]
+        volume = sizes.sum(axis=1)
+        amount = np.nansum(prices * sizes, axis=1)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return np.where(volume > 0, amount / volume, np.nan)
+
+    def liquidity(self, side, price_limit):
+        '''
+        The size available at price_limit or better: back offers with the price
+        not lower than the limit, lay offers with the price not higher than the limit
+        :param price_limit: one price for all runners or the array with price of each runner
+        '''
+        prices, sizes = self.arrays(side)
+        limit = np.asarray(price_limit, dtype=float)
+        if limit.ndim:
+            limit = limit[:, np.newaxis]
+        if side == BACK:
+            mask = prices >= limit
+        elif side == LAY:
+            mask = prices <= limit
+        else:
+            raise ValueError('The liquidity is calculated only for back and lay sides')
+        return np.where(mask, sizes, 0.0).sum(axis=1)
+
+    def __repr__(self):
+        return 'MarketLadders(market_id={!r}, runners={})'.format(self.market_id, len(self.runners))
+
+
+def market_book_ladders(response):
+    '''
+    Convert the listMarketBook response into the list of MarketLadders
+    (one for each market, in the order of response).
+    The ladders are filled, if the form requested the price data
+    EX_BEST_OFFERS, EX_ALL_OFFERS or EX_TRADED
+    '''
+    _check_numpy()
+    return [MarketLadders.from_market_book(market_book) for market_book in response]
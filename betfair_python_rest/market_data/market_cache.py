@@ -0,0 +1,357 @@
+from ..forms import ListMarketBookForm, freeze
+from ..limits import split_request
+from ..limits.weights import MAX_CATALOGUE_RESULTS
+from .diff import MarketBookDiffer, runner_key
+
+from dataclasses import replace
+import threading
+import time
+
+
+class CachedMarket:
+    '''
+    The state of one market in MarketCache: catalogue (dict of listMarketCatalogue),
+    book (dict of listMarketBook) and runners of book by (selectionId, handicap).
+    The object is never changed after it's put into the cache, each update creates
+    the new object (the unchanged runners are shared with the previous one),
+    so the object is a consistent snapshot, which can be read without locks
+    '''
+    __slots__ = ('market_id', 'catalogue', 'book', 'runners', 'version', 'updated_at')
+
+    def __init__(self, market_id, catalogue=None, book=None, runners=None, version=0, updated_at=None):
+        self.market_id = market_id
+        self.catalogue = catalogue
+        self.book = book
+        self.runners = runners if runners is not None else {}
+        self.version = version
+        self.updated_at = updated_at
+
+    @property
+    def event_id(self):
+        if self.catalogue is None:
+            return None
+        return (self.catalogue.get('event') or {}).get('id')
+
+    @property
+    def status(self):
+        return self.book.get('status') if self.book is not None else None
+
+    @property
+    def selection_ids(self):
+        '''
+        Selection ids of the market from the catalogue and the book
+        '''
+        selection_ids = {selection_id for selection_id, handicap in self.runners}
+        if self.catalogue is not None:
+            selection_ids.update(runner.get('selectionId') for runner in self.catalogue.get('runners') or ())
+        return selection_ids
+
+    def runner(self, selection_id, handicap=0.0):
+        return self.runners.get((selection_id, handicap or 0.0))
+
+    def __repr__(self):
+        return 'CachedMarket(market_id={!r}, status={!r}, version={})'.format(
+            self.market_id, self.status, self.version)
+
+
+class MarketCache:
+    '''
+    Local storage of the latest state of markets, which is filled by the responses of
+    listMarketCatalogue (update_catalogue) and listMarketBook (update_books).
+    The markets are indexed by marketId, eventId and selectionId. The book updates are merged
+    by MarketBookDiffer, so the runners, which were not changed, keep their objects.
+    The readers get CachedMarket snapshots and don't need the API calls.
+    The cache is thread-safe, usually it's filled by MarketPoller:
+    ___
+    cache = MarketCache()
+    cache.update_catalogue(api_manager.list_market_catalogue(catalogue_form))
+    cache.update_books(api_manager.list_market_book(market_book_form))
+    for market in cache.markets_of_event('29000000'):
+        print(market.catalogue['marketName'], market.status)
+    ___
+    '''
+
+    def __init__(self):
+        self._markets = {}
+        self._by_event = {}
+        self._by_selection = {}
+        self._differ = MarketBookDiffer()
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return len(self._markets)
+
+    def __contains__(self, market_id):
+        return market_id in self._markets
+
+    def get(self, market_id):
+        '''
+        The CachedMarket snapshot or None
+        '''
+        return self._markets.get(market_id)
+
+    def market_ids(self):
+        return list(self._markets)
+
+    def snapshot(self, market_ids=None):
+        '''
+        Consistent snapshot of several markets: dict {market id: CachedMarket},
+        taken at once, so no update is applied in the middle.
+        :param market_ids: the ids of markets, all markets by default
+        '''
+        with self._lock:
+            if market_ids is None:
+                return dict(self._markets)
+            return {market_id: self._markets[market_id] for market_id in market_ids if market_id in self._markets}
+
+    def markets_of_event(self, event_id):
+        with self._lock:
+            return [self._markets[market_id] for market_id in self._by_event.get(event_id, ())]
+
+    def markets_of_selection(self, selection_id):
+        with self._lock:
+            return [self._markets[market_id] for market_id in self._by_selection.get(selection_id, ())]
+
+    def runner(self, market_id, selection_id, handicap=0.0):
+        market = self._markets.get(market_id)
+        return market.runner(selection_id, handicap) if market is not None else None
+
+    def update_catalogue(self, response):
+        '''
+        Put the markets of listMarketCatalogue response into the cache
+        :return: list of the updated market ids
+        '''
+        market_ids = []
+        with self._lock:
+            for catalogue in self._as_dicts(response):
+                market_id = catalogue.get('marketId')
+                previous = self._markets.get(market_id) or CachedMarket(market_id)
+                self._put(CachedMarket(market_id, catalogue, previous.book, previous.runners,
+                                       previous.version + 1, time.time()), previous)
+                market_ids.append(market_id)
+        return market_ids
+
+    def update_books(self, response):
+        '''
+        Merge listMarketBook response into the cache
+        :return: list of MarketChange (see MarketBookDiffer) of the changed markets
+        '''
+        with self._lock:
+            changes = self._differ.update(self._as_dicts(response))
+            now = time.time()
+            for change in changes:
+                book = change.market_book
+                previous = self._markets.get(change.market_id) or CachedMarket(change.market_id)
+                runners = {runner_key(runner): runner for runner in book.get('runners') or ()}
+                self._put(CachedMarket(change.market_id, previous.catalogue, book, runners,
+                                       previous.version + 1, now), previous)
+        return changes
+
+    def remove(self, market_id):
+        with self._lock:
+            market = self._markets.pop(market_id, None)
+            self._differ.forget(market_id)
+            if market is not None:
+                self._unindex(market)
+
+    def evict_closed(self):
+        '''
+        Remove the markets with CLOSED status of book
+        :return: list of the removed market ids
+        '''
+        with self._lock:
+            market_ids = [market_id for market_id, market in self._markets.items() if market.status == 'CLOSED']
+            for market_id in market_ids:
+                self.remove(market_id)
+        return market_ids
+
+    def clear(self):
+        with self._lock:
+            self._markets.clear()
+            self._by_event.clear()
+            self._by_selection.clear()
+            self._differ.clear()
+
+    @staticmethod
+    def _as_dicts(response):
+        if not isinstance(response, list):
+            raise ValueError('The response is not a list of markets: {}'.format(response))
+        return [market if isinstance(market, dict) else market.to_dict() for market in response]
+
+    def _put(self, market, previous):
+        self._unindex(previous)
+        self._markets[market.market_id] = market
+        if market.event_id is not None:
+            self._by_event.setdefault(market.event_id, set()).add(market.market_id)
+        for selection_id in market.selection_ids:
+            self._by_selection.setdefault(selection_id, set()).add(market.market_id)
+
+    def _unindex(self, market):
+        for index, key in [(self._by_event, market.event_id)] + [(self._by_selection, selection_id)
+                                                               for selection_id in market.selection_ids]:
+            market_ids = index.get(key)
+            if market_ids is not None:
+                market_ids.discard(market.market_id)
+                if not market_ids:
+                    del index[key]
+
+
+class MarketPoller:
+    '''
+    One background thread, which requests listMarketBook of all subscribed markets
+    every interval seconds and merges the responses into the MarketCache.
+    Several components share one poller: each of them subscribes its markets
+    and listens to the changes. The missing catalogues are requested for the
+    new subscribed markets, if catalogue_form is given (once, the markets without
+    catalogue in the response aren't requested again until they are resubscribed). Example:
+    ___
+    poller = MarketPoller(api_manager, MarketCache(), interval=1,
+                          book_form=ListMarketBookForm(price_data=[PriceData.EX_BEST_OFFERS]))
+    poller.add_listener(lambda changes: print(changes))
+    poller.subscribe(['1.170000000', '1.170000001'])
+    poller.start()
+    ___
+    '''
+
+    def __init__(self, api_manager, cache=None, interval=1.0, book_form=None, catalogue_form=None):
+        '''
+        :param api_manager: BetFairAPIManagerBetting object
+        :param cache: MarketCache object, the new one by default
+        :param interval: seconds between the polls
+        :param book_form: ListMarketBookForm with the projections of poll,
+         its market_ids are replaced by the subscribed markets
+        :param catalogue_form: ListMarketCatalogueForm with the market projection,
+         its market_ids are replaced by the markets without catalogue
+        '''
+        self.api_manager = api_manager
+        self.cache = cache if cache is not None else MarketCache()
+        self.interval = interval
+        self.book_form = book_form if book_form is not None else ListMarketBookForm(market_ids=[])
+        self.catalogue_form = catalogue_form
+
+        # The frozen book forms of the current markets (one for each chunk, which fits the request limits),
+        # they are serialized once and kept until the subscriptions change: (book_form, market ids, forms)
+        self._poll_forms = None
+        self._subscriptions = {}
+        # The markets, whose catalogues were requested (Betfair doesn't return the catalogues of closed markets)
+        self._catalogue_requested = set()
+        self._listeners = []
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def subscribe(self, market_ids):
+        '''
+        Add the markets to the poll. The markets are counted, so the market subscribed
+        by two components is polled until both of them unsubscribe
+        '''
+        with self._lock:
+            for market_id in market_ids:
+                self._subscriptions[market_id] = self._subscriptions.get(market_id, 0) + 1
+
+    def unsubscribe(self, market_ids):
+        with self._lock:
+            for market_id in market_ids:
+                count = self._subscriptions.get(market_id, 0) - 1
+                if count > 0:
+                    self._subscriptions[market_id] = count
+                else:
+                    self._subscriptions.pop(market_id, None)
+                    self._catalogue_requested.discard(market_id)
+
+    @property
+    def market_ids(self):
+        with self._lock:
+            return list(self._subscriptions)
+
+    def add_listener(self, callback):
+        '''
+        :param callback: function, which gets the list of MarketChange after each poll with changes
+        '''
+        with self._lock:
+            self._listeners.append(callback)
+
+    def remove_listener(self, callback):
+        with self._lock:
+            self._listeners.remove(callback)
+
+    def poll(self):
+        '''
+        Request and merge the subscribed markets once
+        :return: list of MarketChange
+        '''
+        market_ids = self.market_ids
+        if not market_ids:
+            return []
+        if self.catalogue_form is not None:
+            self._request_catalogues(market_ids)
+        changes = []
+        for book_form in self._book_forms_of(market_ids):
+            changes.extend(self.cache.update_books(self.api_manager.list_market_book(book_form)))
+        if changes:
+            with self._lock:
+                listeners = list(self._listeners)
+            for listener in listeners:
+                listener(changes)
+        return changes
+
+    def _request_catalogues(self, market_ids):
+        '''
+        Request the catalogues of markets, which are not in the cache, once for each market
+        (up to 1000 markets in one request, the limit of maxResults).
+        The failed request doesn't stop the poll of books, it's repeated on the next poll
+        '''
+        with self._lock:
+            requested = set(self._catalogue_requested)
+        missing = [market_id for market_id in market_ids if market_id not in requested and
+                   (market_id not in self.cache or self.cache.get(market_id).catalogue is None)]
+        for start in range(0, len(missing), MAX_CATALOGUE_RESULTS):
+            chunk = missing[start:start + MAX_CATALOGUE_RESULTS]
+            try:
+                self.cache.update_catalogue(self.api_manager.list_market_catalogue(
+                    replace(self.catalogue_form, market_ids=chunk, max_results=len(chunk))))
+            except Exception as exc:
+                self._log('Market catalogue request failed: {!r}'.format(exc))
+                continue
+            with self._lock:
+                self._catalogue_requested.update(market_id for market_id in chunk if market_id in self._subscriptions)
+
+    def _book_forms_of(self, market_ids):
+        '''
+        The frozen book forms of markets: the book_form split into the chunks of market ids,
+        which fit the Market Data Request Limits. They are rebuilt only when the markets
+        or the book_form change
+        '''
+        market_ids = tuple(market_ids)
+        poll_forms = self._poll_forms
+        if poll_forms is None or poll_forms[0] is not self.book_form or poll_forms[1] != market_ids:
+            forms = [freeze(form) for form in split_request(
+                'listMarketBook', replace(self.book_form, market_ids=list(market_ids)))]
+            poll_forms = self._poll_forms = (self.book_form, market_ids, forms)
+        return poll_forms[2]
+
+    def start(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, daemon=True, name='MarketPoller')
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join()
+        self._thread = None
+
+    def _loop(self):
+        while not self._stop.is_set():
+            started = time.monotonic()
+            try:
+                self.poll()
+            except Exception as exc:
+                self._log('Market poll failed: {!r}'.format(exc))
+            self._stop.wait(max(0.0, self.interval - (time.monotonic() - started)))
+
+    def _log(self, message):
+        if getattr(self.api_manager, 'log_mode', False):
+            print(message)
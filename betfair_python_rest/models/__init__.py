@@ -0,0 +1,5 @@
+from .base import BaseModel
+from .market_book import (PriceSize, ExchangePrices, StartingPrices,
+                          Order, Match, Runner, MarketBook)
+from .orders import (CurrentOrder, CurrentOrderSummaryReport, ClearedOrder,
+                     ClearedOrderSummaryReport, PlaceInstructionReport, PlaceExecutionReport)
@@ -0,0 +1,73 @@
+class BaseModel:
+    '''
+    Base class of the typed response objects.
+    The models are built directly from the decoded json and keep the
+    values in __slots__, so the attribute access is fast and the objects
+    take much less memory than the dicts of response.
+
+    Each model declares the list of fields: (attribute name, json key) and
+    the nested models: {attribute name: (model class, is list)}.
+    The keys, which are not described in fields, are kept in the extra attribute.
+    The dict form of the model is available by to_dict()
+    '''
+    __slots__ = ('extra',)
+    fields = ()
+    nested = {}
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._keys = {key: attribute for attribute, key in cls.fields}
+
+    def __init__(self, **kwargs):
+        for attribute, key in self.fields:
+            setattr(self, attribute, kwargs.get(attribute))
+        self.extra = kwargs.get('extra')
+
+    @classmethod
+    def from_dict(cls, data):
+        '''
+        Build the model from the decoded json
+        '''
+        instance = cls.__new__(cls)
+        nested = cls.nested
+        for attribute, key in cls.fields:
+            value = data.get(key)
+            if value is not None and attribute in nested:
+                model, is_list = nested[attribute]
+                value = [model.from_dict(item) for item in value] if is_list else model.from_dict(value)
+            setattr(instance, attribute, value)
+        keys = cls._keys
+        instance.extra = {key: value for key, value in data.items() if key not in keys} or None
+        return instance
+
+    def to_dict(self):
+        '''
+        The json (dict) form of the model, the None values are skipped
+        '''
+        data = {}
+        nested = self.nested
+        for attribute, key in self.fields:
+            value = getattr(self, attribute)
+            if value is None:
+                continue
+            if attribute in nested:
+                value = [item.to_dict() for item in value] if nested[attribute][1] else value.to_dict()
+            data[key] = value
+        if self.extra:
+            data.update(self.extra)
+        return data
+
+    def __eq__(self, other):
+        if type(other) is not type(self):
+            return NotImplemented
+        return all(getattr(self, attribute) == getattr(other, attribute)
+                   for attribute in self.__slots__) and self.extra == other.extra
+
+    def __repr__(self):
+        values = ', '.join('{}={!r}'.format(attribute, getattr(self, attribute))
+                           for attribute, key in self.fields if getattr(self, attribute) is not None)
+        return '{}({})'.format(type(self).__name__, values)
+
+
+def slots_of(fields):
+    return tuple(attribute for attribute, key in fields)
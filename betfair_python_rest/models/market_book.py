@@ -0,0 +1,90 @@
+from .base import BaseModel, slots_of
+
+
+class PriceSize(BaseModel):
+    '''
+    Price and size of the ladder level, traded volume or order
+    '''
+    fields = (('price', 'price'), ('size', 'size'))
+    __slots__ = slots_of(fields)
+
+    def __init__(self, price=None, size=None, extra=None):
+        self.price = price
+        self.size = size
+        self.extra = extra
+
+    @classmethod
+    def from_dict(cls, data):
+        # The ladders contain thousands of levels, so they are built without the generic loop
+        if len(data) == 2:
+            return cls(data.get('price'), data.get('size'))
+        return super().from_dict(data)
+
+
+class ExchangePrices(BaseModel):
+    fields = (('available_to_back', 'availableToBack'), ('available_to_lay', 'availableToLay'),
+              ('traded_volume', 'tradedVolume'))
+    __slots__ = slots_of(fields)
+    nested = {'available_to_back': (PriceSize, True), 'available_to_lay': (PriceSize, True),
+              'traded_volume': (PriceSize, True)}
+
+
+class StartingPrices(BaseModel):
+    fields = (('near_price', 'nearPrice'), ('far_price', 'farPrice'),
+              ('back_stake_taken', 'backStakeTaken'), ('lay_liability_taken', 'layLiabilityTaken'),
+              ('actual_sp', 'actualSP'))
+    __slots__ = slots_of(fields)
+    nested = {'back_stake_taken': (PriceSize, True), 'lay_liability_taken': (PriceSize, True)}
+
+
+class Order(BaseModel):
+    '''
+    The order of runner in listMarketBook response (with order projection)
+    '''
+    fields = (('bet_id', 'betId'), ('order_type', 'orderType'), ('status', 'status'),
+              ('persistence_type', 'persistenceType'), ('side', 'side'), ('price', 'price'),
+              ('size', 'size'), ('bsp_liability', 'bspLiability'), ('placed_date', 'placedDate'),
+              ('avg_price_matched', 'avgPriceMatched'), ('size_matched', 'sizeMatched'),
+              ('size_remaining', 'sizeRemaining'), ('size_lapsed', 'sizeLapsed'),
+              ('size_cancelled', 'sizeCancelled'), ('size_voided', 'sizeVoided'),
+              ('customer_order_ref', 'customerOrderRef'), ('customer_strategy_ref', 'customerStrategyRef'))
+    __slots__ = slots_of(fields)
+
+
+class Match(BaseModel):
+    '''
+    The match of runner in listMarketBook response (with match projection)
+    '''
+    fields = (('bet_id', 'betId'), ('match_id', 'matchId'), ('side', 'side'),
+              ('price', 'price'), ('size', 'size'), ('match_date', 'matchDate'))
+    __slots__ = slots_of(fields)
+
+
+class Runner(BaseModel):
+    '''
+    The dynamic data about runner in the market
+    '''
+    fields = (('selection_id', 'selectionId'), ('handicap', 'handicap'), ('status', 'status'),
+              ('adjustment_factor', 'adjustmentFactor'), ('last_price_traded', 'lastPriceTraded'),
+              ('total_matched', 'totalMatched'), ('removal_date', 'removalDate'),
+              ('sp', 'sp'), ('ex', 'ex'), ('orders', 'orders'), ('matches', 'matches'),
+              ('matches_by_strategy', 'matchesByStrategy'))
+    __slots__ = slots_of(fields)
+    nested = {'sp': (StartingPrices, False), 'ex': (ExchangePrices, False),
+              'orders': (Order, True), 'matches': (Match, True)}
+
+
+class MarketBook(BaseModel):
+    '''
+    The dynamic data about market (item of listMarketBook response)
+    '''
+    fields = (('market_id', 'marketId'), ('is_market_data_delayed', 'isMarketDataDelayed'),
+              ('status', 'status'), ('bet_delay', 'betDelay'), ('bsp_reconciled', 'bspReconciled'),
+              ('complete', 'complete'), ('inplay', 'inplay'), ('number_of_winners', 'numberOfWinners'),
+              ('number_of_runners', 'numberOfRunners'), ('number_of_active_runners', 'numberOfActiveRunners'),
+              ('last_match_time', 'lastMatchTime'), ('total_matched', 'totalMatched'),
+              ('total_available', 'totalAvailable'), ('cross_matching', 'crossMatching'),
+              ('runners_voidable', 'runnersVoidable'), ('version', 'version'), ('runners', 'runners'),
+              ('key_line_description', 'keyLineDescription'))
+    __slots__ = slots_of(fields)
+    nested = {'runners': (Runner, True)}
@@ -0,0 +1,75 @@
+from .base import BaseModel, slots_of
+from .market_book import PriceSize
+
+
+class CurrentOrder(BaseModel):
+    '''
+    Item of listCurrentOrders response (CurrentOrderSummary)
+    '''
+    fields = (('bet_id', 'betId'), ('market_id', 'marketId'), ('selection_id', 'selectionId'),
+              ('handicap', 'handicap'), ('price_size', 'priceSize'), ('bsp_liability', 'bspLiability'),
+              ('side', 'side'), ('status', 'status'), ('persistence_type', 'persistenceType'),
+              ('order_type', 'orderType'), ('placed_date', 'placedDate'), ('matched_date', 'matchedDate'),
+              ('average_price_matched', 'averagePriceMatched'), ('size_matched', 'sizeMatched'),
+              ('size_remaining', 'sizeRemaining'), ('size_lapsed', 'sizeLapsed'),
+              ('size_cancelled', 'sizeCancelled'), ('size_voided', 'sizeVoided'),
+              ('regulator_auth_code', 'regulatorAuthCode'), ('regulator_code', 'regulatorCode'),
+              ('customer_order_ref', 'customerOrderRef'), ('customer_strategy_ref', 'customerStrategyRef'))
+    __slots__ = slots_of(fields)
+    nested = {'price_size': (PriceSize, False)}
+
+
+class CurrentOrderSummaryReport(BaseModel):
+    '''
+    The listCurrentOrders response
+    '''
+    fields = (('current_orders', 'currentOrders'), ('more_available', 'moreAvailable'))
+    __slots__ = slots_of(fields)
+    nested = {'current_orders': (CurrentOrder, True)}
+
+
+class ClearedOrder(BaseModel):
+    '''
+    Item of listClearedOrders response (ClearedOrderSummary)
+    '''
+    fields = (('event_type_id', 'eventTypeId'), ('event_id', 'eventId'), ('market_id', 'marketId'),
+              ('selection_id', 'selectionId'), ('handicap', 'handicap'), ('bet_id', 'betId'),
+              ('placed_date', 'placedDate'), ('persistence_type', 'persistenceType'),
+              ('order_type', 'orderType'), ('side', 'side'), ('item_description', 'itemDescription'),
+              ('bet_outcome', 'betOutcome'), ('price_requested', 'priceRequested'),
+              ('settled_date', 'settledDate'), ('last_matched_date', 'lastMatchedDate'),
+              ('bet_count', 'betCount'), ('commission', 'commission'), ('price_matched', 'priceMatched'),
+              ('price_reduced', 'priceReduced'), ('size_settled', 'sizeSettled'), ('profit', 'profit'),
+              ('size_cancelled', 'sizeCancelled'), ('customer_order_ref', 'customerOrderRef'),
+              ('customer_strategy_ref', 'customerStrategyRef'))
+    __slots__ = slots_of(fields)
+
+
+class ClearedOrderSummaryReport(BaseModel):
+    '''
+    The listClearedOrders response
+    '''
+    fields = (('cleared_orders', 'clearedOrders'), ('more_available', 'moreAvailable'))
+    __slots__ = slots_of(fields)
+    nested = {'cleared_orders': (ClearedOrder, True)}
+
+
+class PlaceInstructionReport(BaseModel):
+    '''
+    The report of one instruction of placeOrders.
+    The instruction is kept as the dict, the same as it was sent
+    '''
+    fields = (('status', 'status'), ('error_code', 'errorCode'), ('order_status', 'orderStatus'),
+              ('instruction', 'instruction'), ('bet_id', 'betId'), ('placed_date', 'placedDate'),
+              ('average_price_matched', 'averagePriceMatched'), ('size_matched', 'sizeMatched'))
+    __slots__ = slots_of(fields)
+
+
+class PlaceExecutionReport(BaseModel):
+    '''
+    The placeOrders response
+    '''
+    fields = (('customer_ref', 'customerRef'), ('status', 'status'), ('error_code', 'errorCode'),
+              ('market_id', 'marketId'), ('instruction_reports', 'instructionReports'))
+    __slots__ = slots_of(fields)
+    nested = {'instruction_reports': (PlaceInstructionReport, True)}
@@ -0,0 +1,3 @@
+from .prune import prune_empty, KEEP_EMPTY_KEYS
+from .json_backends import JSONBackend, OrjsonBackend, get_default_json_backend
+from .compiled import serialize_form, compile_serializer, register_serializer
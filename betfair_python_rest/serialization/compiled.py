@@ -0,0 +1,209 @@
+from .prune import prune_empty, KEEP_EMPTY_KEYS
+
+from dataclasses import fields, is_dataclass
+import threading
+from typing import List
+
+# The values of these types are removed from the data, if they are empty (like in prune_empty)
+_EMPTY_TYPES = (dict, list, str, tuple)
+
+_serializers = {}
+_compile_lock = threading.Lock()
+
+
+def serialize_form(form):
+    '''
+    The request data of form: the dict with the API keys without None and empty values,
+    the same as prune_empty() of the old hand-written data properties.
+    The serializer of each form class is generated once (see compile_serializer)
+    '''
+    serializer = _serializers.get(type(form))
+    if serializer is None:
+        serializer = compile_serializer(type(form))
+    return serializer(form)
+
+
+def compile_serializer(form_class):
+    '''
+    Generate the serializer function of form class from its dataclass fields.
+    The field is sent with the camelCase key of its name, the forms can change it
+    by the data_keys class attribute {field name: key}, where key is:
+    - the string key,
+    - the tuple path of nested dicts, i.e. ('marketVersion', 'version'),
+    - None, if the field isn't sent.
+    The fields of one nested dict are grouped by the dict item {API key: data_keys of group},
+    i.e. {'priceProjection': {'price_data': 'priceData', 'exBestOffersOverrides': {...}}}.
+    The data_keys of base classes are inherited. If any field of the data_requires class attribute
+    is None, the data is None.
+    The forms with their own data property (and other objects) are serialized by prune_empty(form.data)
+    '''
+    serializer = _serializers.get(form_class)
+    if serializer is not None:
+        return serializer
+    data_property = getattr(form_class, 'data', None)
+    if is_dataclass(form_class) and (data_property is None or getattr(data_property, 'fget', None) is serialize_form):
+        serializer = _generate(form_class)
+    elif data_property is not None:
+        serializer = _serialize_data_property
+    else:
+        serializer = _serialize_plain
+    with _compile_lock:
+        return _serializers.setdefault(form_class, serializer)
+
+
+def register_serializer(form_class, serializer):
+    '''
+    Use the serializer function (form -> data) for the objects of form_class
+    '''
+    with _compile_lock:
+        _serializers[form_class] = serializer
+
+
+def _serialize_data_property(form):
+    return prune_empty(form.data)
+
+
+def _serialize_plain(value):
+    if isinstance(value, (dict, list, tuple)):
+        return prune_empty(value)
+    return value
+
+
+def _serialize_value(value):
+    serializer = _serializers.get(type(value))
+    if serializer is None:
+        serializer = compile_serializer(type(value))
+    return serializer(value)
+
+
+def _serialize_list(values):
+    '''
+    The instructions of one list usually have the same class, so its serializer is looked up once
+    '''
+    result = []
+    value_class = serializer = None
+    for value in values:
+        if type(value) is not value_class:
+            value_class = type(value)
+            serializer = _serializers.get(value_class) or compile_serializer(value_class)
+        value = serializer(value)
+        if value is not None:
+            result.append(value)
+    return result
+
+
+def camel_case(name):
+    first, *parts = name.split('_')
+    return first + ''.join(part[:1].upper() + part[1:] for part in parts)
+
+
+def data_keys_of(form_class):
+    '''
+    {field name: key or path} of all fields, which are sent
+    '''
+    overrides = {}
+    for klass in reversed(form_class.__mro__):
+        overrides.update(_flatten_data_keys(vars(klass).get('data_keys', {})))
+    keys = {}
+    for field in fields(form_class):
+        key = overrides.get(field.name, camel_case(field.name))
+        if key is not None:
+            keys[field.name] = key if isinstance(key, tuple) else (key,)
+    return keys
+
+
+def _flatten_data_keys(data_keys, path=()):
+    '''
+    {field name: key or path} of data_keys, the groups of fields are replaced by the paths of their fields
+    '''
+    flat = {}
+    for name, key in data_keys.items():
+        if isinstance(key, dict):
+            flat.update(_flatten_data_keys(key, path + (name,)))
+        elif key is None or not path:
+            flat[name] = key
+        else:
+            flat[name] = path + (key if isinstance(key, tuple) else (key,))
+    return flat
+
+
+def _field_kind(field_type):
+    '''
+    'list' for the lists of nested forms, 'nested' for the nested form and None for plain values
+    '''
+    if isinstance(field_type, type) and is_dataclass(field_type):
+        return 'nested'
+    # List[...] has the origin list (typing.List in python 3.6)
+    if getattr(field_type, '__origin__', None) in (list, List):
+        arguments = getattr(field_type, '__args__', None) or ()
+        if any(isinstance(argument, type) and is_dataclass(argument) for argument in arguments):
+            return 'list'
+    return None
+
+
+def _generate(form_class):
+    keys = data_keys_of(form_class)
+    kinds = {field.name: _field_kind(field.type) for field in fields(form_class)}
+
+    # The tree of nested dicts: {key: field name or subtree}
+    tree = {}
+    for name, path in keys.items():
+        node = tree
+        for key in path[:-1]:
+            node = node.setdefault(key, {})
+        node[path[-1]] = name
+
+    lines = ['def serialize(form):']
+    for name in getattr(form_class, 'data_requires', ()):
+        lines.append('    if form.{} is None:'.format(name))
+        lines.append('        return None')
+    counter = [0]
+
+    def emit(node, variable, indent):
+        lines.append('{}{} = {{}}'.format(indent, variable))
+        for key, item in node.items():
+            if isinstance(item, dict) and len(item) == 1 and key not in KEEP_EMPTY_KEYS and \
+                    not isinstance(next(iter(item.values())), dict):
+                # The group of one field (like marketVersion) is created only if the field is sent
+                (inner_key, name), = item.items()
+                emit_field(name, inner_key, variable, indent, key)
+            elif isinstance(item, dict):
+                counter[0] += 1
+                group = 'group_{}'.format(counter[0])
+                emit(item, group, indent)
+                if key in KEEP_EMPTY_KEYS:
+                    lines.append('{}{}[{!r}] = {}'.format(indent, variable, key, group))
+                else:
+                    lines.append('{}if {}:'.format(indent, group))
+                    lines.append('{}    {}[{!r}] = {}'.format(indent, variable, key, group))
+            else:
+                emit_field(item, key, variable, indent)
+
+    def emit_field(name, key, variable, indent, group_key=None):
+        lines.append('{}value = form.{}'.format(indent, name))
+        if kinds[name] == 'list':
+            lines.append('{}if value:'.format(indent))
+            lines.append('{}    value = _serialize_list(value)'.format(indent))
+        elif kinds[name] == 'nested':
+            lines.append('{}if value is not None:'.format(indent))
+            lines.append('{}    value = _serialize_value(value)'.format(indent))
+        if key in KEEP_EMPTY_KEYS:
+            condition = 'value is not None'
+        else:
+            condition = 'value or (value is not None and not isinstance(value, _EMPTY_TYPES))'
+        lines.append('{}if {}:'.format(indent, condition))
+        if group_key is None:
+            lines.append('{}    {}[{!r}] = value'.format(indent, variable, key))
+        else:
+            lines.append('{}    {}[{!r}] = {{{!r}: value}}'.format(indent, variable, group_key, key))
+
+    emit(tree, 'data', '    ')
+    lines.append('    return data')
+
+    namespace = {'_EMPTY_TYPES': _EMPTY_TYPES, '_serialize_list': _serialize_list,
+                 '_serialize_value': _serialize_value}
+    exec('\n'.join(lines), namespace)
+    serializer = namespace['serialize']
+    serializer.__name__ = serializer.__qualname__ = 'serialize_{}'.format(form_class.__name__)
+    serializer.source = '\n'.join(lines)
+    return serializer
@@ -0,0 +1,59 @@
+from datetime import date, datetime
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class JSONBackend:
+    '''
+    The json library wrapper, which used by managers for the request
+    and response bodies.
+    The default one is based on the standard json module.
+    If you want to use other library, inherit from this class,
+    override the methods and set the object of your class
+    to the json_backend attribute of manager
+    '''
+
+    def dumps(self, data):
+        '''
+        Compact representation of data (without spaces and indents)
+        :return: str or bytes
+        '''
+        return json.dumps(data, separators=(',', ':'), default=self._default)
+
+    def loads(self, content):
+        '''
+        Decode the response body
+        :param content: bytes or str
+        '''
+        return json.loads(content)
+
+    @staticmethod
+    def _default(value):
+        if isinstance(value, (date, datetime)):
+            return value.isoformat()
+        raise TypeError('Object of type {} is not JSON serializable'.format(type(value).__name__))
+
+
+class OrjsonBackend(JSONBackend):
+    '''
+    Backend based on orjson library. It is used by default, if orjson is installed
+    '''
+
+    def dumps(self, data):
+        return orjson.dumps(data)
+
+    def loads(self, content):
+        return orjson.loads(content)
+
+
+def get_default_json_backend():
+    '''
+    The fastest available backend
+    '''
+    if orjson is not None:
+        return OrjsonBackend()
+    return JSONBackend()
@@ -0,0 +1,36 @@
+# The keys which are required by the API even if they are empty
+# (i.e. listEventTypes without any filter must be sent with "filter": {})
+KEEP_EMPTY_KEYS = frozenset(['filter'])
+
+
+def prune_empty(data, keep_empty=KEEP_EMPTY_KEYS):
+    '''
+    Recursively remove the None and empty values from the request data.
+    The forms fill all optional keys with None, and the API treats
+    the missing key the same way as null, so there is no
+    need to send them.
+    Zero and False values are kept.
+    :param data: dict, list or plain value
+    :param keep_empty: the dict keys, which should be kept
+    even if their values are empty
+    '''
+    if isinstance(data, dict):
+        pruned = {}
+        for key, value in data.items():
+            if isinstance(value, (dict, list, tuple)):
+                value = prune_empty(value, keep_empty)
+            if value is None or (not value and isinstance(value, (dict, list, str))
+                                 and key not in keep_empty):
+                continue
+            pruned[key] = value
+        return pruned
+    if isinstance(data, (list, tuple)):
+        pruned = []
+        for value in data:
+            if isinstance(value, (dict, list, tuple)):
+                value = prune_empty(value, keep_empty)
+            if value is None:
+                continue
+            pruned.append(value)
+        return pruned
+    return data
@@ -0,0 +1,5 @@
+from .ticks import (PRICES, PRICE_CENTS, TICKS_COUNT, MIN_PRICE, MAX_PRICE, is_valid_price,
+                    price_to_tick, tick_to_price, round_price_down, round_price_up, round_price,
+                    ticks_away, ticks_between, check_price, valid_prices, prices_to_ticks,
+                    ticks_to_prices, round_prices_down, round_prices_up, ticks_away_array)
+from .pnl import PositionBook, ProfitAndLoss
@@ -0,0 +1,217 @@
+import threading
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+def _check_numpy():
+    if np is None:
+        raise ImportError('The profit and loss engine requires numpy package. '
+                          'Install it with: pip install betfair_python_rest[numpy]')
+
+
+class ProfitAndLoss:
+    '''
+    Result of PositionBook.calculate(). The arrays have one item for each runner
+    (market_id, selection_id, handicap) with matched bets:
+    if_win - profit and loss, if the runner wins,
+    if_lose - profit and loss of the bets on the runner, if it loses.
+    The arrays of markets have one item for each market of market_ids:
+    if_other_wins - profit and loss, if the runner without bets wins,
+    market_exposure - the worst outcome of market (negative or zero),
+    the outcome, when the runner without bets wins, is included
+    '''
+    __slots__ = ('market_ids', 'runner_market_ids', 'selection_ids', 'handicaps',
+                 'if_win', 'if_lose', 'if_other_wins', 'market_exposure')
+
+    def __init__(self, market_ids, runner_market_ids, selection_ids, handicaps, if_win, if_lose,
+                 if_other_wins, market_exposure):
+        self.market_ids = market_ids
+        self.runner_market_ids = runner_market_ids
+        self.selection_ids = selection_ids
+        self.handicaps = handicaps
+        self.if_win = if_win
+        self.if_lose = if_lose
+        self.if_other_wins = if_other_wins
+        self.market_exposure = market_exposure
+
+    @property
+    def total_exposure(self):
+        return float(self.market_exposure.sum())
+
+    def exposure(self, market_id):
+        for market_id_, exposure in zip(self.market_ids, self.market_exposure):
+            if market_id_ == market_id:
+                return float(exposure)
+        return 0.0
+
+    def to_response(self):
+        '''
+        The result in the format of listMarketProfitAndLoss response
+        '''
+        markets = {market_id: [] for market_id in self.market_ids}
+        for market_id, selection_id, handicap, if_win, if_lose in zip(
+                self.runner_market_ids, self.selection_ids, self.handicaps,
+                self.if_win.tolist(), self.if_lose.tolist()):
+            markets[market_id].append({'selectionId': selection_id, 'ifWin': round(if_win, 2),
+                                       'ifLose': round(if_lose, 2)})
+        return [{'marketId': market_id, 'profitAndLosses': profit_and_losses}
+                for market_id, profit_and_losses in markets.items()]
+
+
+class PositionBook:
+    '''
+    Local position of matched bets, which gives the profit and loss of runners and
+    the exposure of markets without the listMarketProfitAndLoss requests.
+    The bets are added from listCurrentOrders and placeOrders responses (the bet with
+    the same betId is replaced, because the responses contain the total matched size),
+    the calculation is vectorized over all bets of all markets at once:
+    ___
+    positions = PositionBook()
+    positions.add_place_report(api_manager.place_orders(place_orders_form))
+    positions.add_current_orders(api_manager.list_current_orders(current_orders_form))
+    profit_and_loss = positions.calculate()
+    if profit_and_loss.total_exposure < -max_exposure:
+        ...
+    mismatches = positions.reconcile(api_manager.list_market_profit_and_loss(pnl_form))
+    ___
+    Like listMarketProfitAndLoss, the calculation is exact for the markets
+    with one winner (the handicap runners are the separate runners)
+    '''
+
+    def __init__(self, commission=0.0):
+        '''
+        :param commission: the commission rate (0.05 for 5%), which is taken from
+         the positive if_win values (listMarketProfitAndLoss with netOfCommission)
+        '''
+        _check_numpy()
+        self.commission = commission
+        self._rows = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._rows)
+
+    def clear(self):
+        with self._lock:
+            self._rows.clear()
+
+    def remove_market(self, market_id):
+        with self._lock:
+            for bet_id in [bet_id for bet_id, row in self._rows.items() if row[0] == market_id]:
+                del self._rows[bet_id]
+
+    def add_bet(self, bet_id, market_id, selection_id, handicap, side, size_matched, average_price_matched):
+        '''
+        Add or replace the matched part of bet
+        :param side: BACK or LAY
+        '''
+        with self._lock:
+            if size_matched:
+                self._rows[bet_id] = (market_id, selection_id, handicap or 0.0, side == 'BACK',
+                                      float(size_matched), float(average_price_matched))
+            else:
+                self._rows.pop(bet_id, None)
+
+    def add_current_orders(self, orders):
+        '''
+        :param orders: listCurrentOrders response or the list of its currentOrders
+         (dicts or models.CurrentOrder)
+        '''
+        if not isinstance(orders, list):
+            orders = orders.to_dict() if not isinstance(orders, dict) else orders
+            orders = orders.get('currentOrders') or []
+        for order in orders:
+            if not isinstance(order, dict):
+                order = order.to_dict()
+            self.add_bet(order.get('betId'), order.get('marketId'), order.get('selectionId'),
+                         order.get('handicap'), order.get('side'), order.get('sizeMatched'),
+                         order.get('averagePriceMatched'))
+
+    def add_place_report(self, report):
+        '''
+        :param report: placeOrders response (dict or models.PlaceExecutionReport)
+        '''
+        if not isinstance(report, dict):
+            report = report.to_dict()
+        market_id = report.get('marketId')
+        for instruction_report in report.get('instructionReports') or ():
+            if instruction_report.get('status') != 'SUCCESS':
+                continue
+            instruction = instruction_report.get('instruction') or {}
+            self.add_bet(instruction_report.get('betId'), market_id, instruction.get('selectionId'),
+                         instruction.get('handicap'), instruction.get('side'),
+                         instruction_report.get('sizeMatched'), instruction_report.get('averagePriceMatched'))
+
+    def calculate(self, market_ids=None):
+        '''
+        :param market_ids: calculate only these markets, all markets by default
+        :return: ProfitAndLoss
+        '''
+        with self._lock:
+            rows = list(self._rows.values())
+        if market_ids is not None:
+            market_ids = set(market_ids)
+            rows = [row for row in rows if row[0] in market_ids]
+
+        runner_indexes = {}
+        market_indexes = {}
+        bet_runners = np.fromiter((runner_indexes.setdefault(row[:3], len(runner_indexes)) for row in rows),
+                                  dtype=np.int64, count=len(rows))
+        runner_markets = np.fromiter((market_indexes.setdefault(market_id, len(market_indexes))
+                                      for market_id, selection_id, handicap in runner_indexes),
+                                     dtype=np.int64, count=len(runner_indexes))
+        is_back = np.fromiter((row[3] for row in rows), dtype=bool, count=len(rows))
+        sizes = np.fromiter((row[4] for row in rows), dtype=float, count=len(rows))
+        prices = np.fromiter((row[5] for row in rows), dtype=float, count=len(rows))
+
+        # The result of each bet, if its runner wins and if it loses
+        win = np.where(is_back, sizes * (prices - 1), -sizes * (prices - 1))
+        lose = np.where(is_back, -sizes, sizes)
+        runner_win = np.bincount(bet_runners, win, minlength=len(runner_indexes))
+        runner_lose = np.bincount(bet_runners, lose, minlength=len(runner_indexes))
+        market_lose = np.bincount(runner_markets, runner_lose, minlength=len(market_indexes))
+
+        # The runner wins: its bets win, the bets on the other runners of market lose
+        if_win = runner_win + market_lose[runner_markets] - runner_lose
+        if_other_wins = market_lose
+        if self.commission:
+            if_win = np.where(if_win > 0, if_win * (1 - self.commission), if_win)
+            if_other_wins = np.where(market_lose > 0, market_lose * (1 - self.commission), market_lose)
+        worst = if_other_wins.copy()
+        np.minimum.at(worst, runner_markets, if_win)
+        keys = list(runner_indexes)
+        return ProfitAndLoss(list(market_indexes), [key[0] for key in keys], [key[1] for key in keys],
+                             [key[2] for key in keys], if_win, runner_lose, if_other_wins,
+                             np.minimum(worst, 0.0))
+
+    def reconcile(self, response, tolerance=0.01):
+        '''
+        Compare the local profit and loss with listMarketProfitAndLoss response
+        (it should be requested with the same netOfCommission, without settled and BSP bets)
+        :return: list of differences: (market_id, selection_id, local if_win, server if_win),
+         None means, that the server hasn't returned the runner with local bets.
+         The empty list - the position is consistent
+        '''
+        if not isinstance(response, list):
+            raise ValueError('The response is not a list of markets: {}'.format(response))
+        profit_and_loss = self.calculate([market.get('marketId') for market in response])
+        other_wins = dict(zip(profit_and_loss.market_ids, profit_and_loss.if_other_wins.tolist()))
+        local = {(market_id, selection_id): if_win for market_id, selection_id, if_win in zip(
+            profit_and_loss.runner_market_ids, profit_and_loss.selection_ids, profit_and_loss.if_win.tolist())}
+
+        differences = []
+        for market in response:
+            market_id = market.get('marketId')
+            for runner in market.get('profitAndLosses') or ():
+                key = (market_id, runner.get('selectionId'))
+                # The runners without local bets get the result of bets on the other runners
+                local_value = local.pop(key, other_wins.get(market_id, 0.0))
+                server_value = runner.get('ifWin') or 0.0
+                if abs(local_value - server_value) > tolerance:
+                    differences.append((key[0], key[1], round(local_value, 2), server_value))
+        differences.extend((market_id, selection_id, round(if_win, 2), None)
+                           for (market_id, selection_id), if_win in local.items())
+        return differences
@@ -0,0 +1,240 @@
+from array import array
+import math
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# The Betfair price ladder: (the lowest price of band, the increment) in cents,
+# the last band ends at MAX_PRICE
+PRICE_BANDS = ((101, 1), (200, 2), (300, 5), (400, 10), (600, 20),
+               (1000, 50), (2000, 100), (3000, 200), (5000, 500), (10000, 1000))
+MIN_PRICE = 1.01
+MAX_PRICE = 1000.0
+
+
+def _build_price_cents():
+    price_cents = array('l')
+    for band, (band_start, increment) in enumerate(PRICE_BANDS):
+        band_end = PRICE_BANDS[band + 1][0] if band + 1 < len(PRICE_BANDS) else int(MAX_PRICE * 100) + increment
+        price_cents.extend(range(band_start, band_end, increment))
+    return price_cents
+
+
+def _build_floor_ticks(price_cents):
+    floor_ticks = array('H', [0]) * (price_cents[-1] + 1)
+    for tick, cents in enumerate(price_cents):
+        end = price_cents[tick + 1] if tick + 1 < len(price_cents) else len(floor_ticks)
+        floor_ticks[cents:end] = array('H', [tick]) * (end - cents)
+    return floor_ticks
+
+
+# The prices of ladder in cents, the index is the tick
+PRICE_CENTS = _build_price_cents()
+PRICES = tuple(cents / 100 for cents in PRICE_CENTS)
+TICKS_COUNT = len(PRICES)
+_TICK_BY_CENTS = {cents: tick for tick, cents in enumerate(PRICE_CENTS)}
+# The tick of the highest price, which isn't greater than the index (in cents).
+# It gives O(1) rounding of any price inside the ladder
+_FLOOR_TICK = _build_floor_ticks(PRICE_CENTS)
+
+# The prices are compared in cents with this tolerance of float arithmetic
+_EPSILON = 1e-6
+_numpy_tables = None
+
+
+def _cents(price):
+    '''
+    The price in cents and flag, if it's the whole number of cents
+    '''
+    if not math.isfinite(price):
+        raise ValueError('The price must be a finite number, got {!r}'.format(price))
+    value = price * 100
+    whole = round(value)
+    if abs(value - whole) < _EPSILON:
+        return whole, True
+    return value, False
+
+
+def is_valid_price(price):
+    '''
+    True, if the price is on the ladder
+    '''
+    cents, whole = _cents(price)
+    return whole and cents in _TICK_BY_CENTS
+
+
+def price_to_tick(price):
+    '''
+    The index of price in the ladder (0 for 1.01, TICKS_COUNT - 1 for 1000)
+    '''
+    cents, whole = _cents(price)
+    tick = _TICK_BY_CENTS.get(cents) if whole else None
+    if tick is None:
+        raise ValueError('The price {} is not on the Betfair price ladder'.format(price))
+    return tick
+
+
+def tick_to_price(tick):
+    if not 0 <= tick < TICKS_COUNT:
+        raise ValueError('The tick {} is out of the price ladder (0 - {})'.format(tick, TICKS_COUNT - 1))
+    return PRICES[tick]
+
+
+def round_price_down(price):
+    '''
+    The highest valid price, which isn't greater than the price
+    (MIN_PRICE for the prices below the ladder)
+    '''
+    return PRICES[_floor_tick(price)]
+
+
+def round_price_up(price):
+    '''
+    The lowest valid price, which isn't less than the price
+    (MAX_PRICE for the prices above the ladder)
+    '''
+    return PRICES[_ceil_tick(price)]
+
+
+def round_price(price):
+    '''
+    The nearest valid price (the higher one, if the price is in the middle)
+    '''
+    down, up = round_price_down(price), round_price_up(price)
+    return down if price - down < up - price else up
+
+
+def ticks_away(price, ticks):
+    '''
+    The price, which is ticks away from the valid price (down, if ticks is negative).
+    The result is limited by the ends of ladder
+    '''
+    return PRICES[min(max(price_to_tick(price) + ticks, 0), TICKS_COUNT - 1)]
+
+
+def ticks_between(price, other_price):
+    '''
+    Number of ticks from price to other_price (negative, if other_price is lower)
+    '''
+    return price_to_tick(other_price) - price_to_tick(price)
+
+
+def _floor_tick(price):
+    cents, whole = _cents(price)
+    if cents < PRICE_CENTS[0]:
+        return 0
+    if cents >= PRICE_CENTS[-1]:
+        return TICKS_COUNT - 1
+    return _FLOOR_TICK[int(cents)]
+
+
+def _ceil_tick(price):
+    cents, whole = _cents(price)
+    if cents <= PRICE_CENTS[0]:
+        return 0
+    if cents > PRICE_CENTS[-1]:
+        return TICKS_COUNT - 1
+    tick = _FLOOR_TICK[int(cents)]
+    if not whole or PRICE_CENTS[tick] != cents:
+        tick += 1
+    return tick
+
+
+# The vectorized versions for numpy arrays
+
+
+def _get_numpy_tables():
+    global _numpy_tables
+    if np is None:
+        raise ImportError('The vectorized tick functions require numpy package. '
+                          'Install it with: pip install betfair_python_rest[numpy]')
+    if _numpy_tables is None:
+        _numpy_tables = (np.array(PRICES), np.array(PRICE_CENTS, dtype=np.int64),
+                         np.array(_FLOOR_TICK, dtype=np.int64))
+    return _numpy_tables
+
+
+def _cents_array(prices):
+    '''
+    The prices in cents (rounded to the whole cents within the tolerance) and the mask of whole values
+    '''
+    values = np.asarray(prices, dtype=float) * 100
+    finite = np.isfinite(values)
+    if not finite.all():
+        raise ValueError('The prices must be finite numbers, got {}'.format(
+            np.asarray(prices, dtype=float)[~finite].tolist()))
+    whole = np.round(values)
+    is_whole = np.abs(values - whole) < _EPSILON
+    values = np.where(is_whole, whole, values)
+    return values, is_whole
+
+
+def _floor_ticks(values, cents_table, floor_table):
+    clipped = np.clip(values, cents_table[0], cents_table[-1])
+    return floor_table[np.floor(clipped).astype(np.int64)]
+
+
+def valid_prices(prices):
+    '''
+    Boolean array: True for the prices on the ladder
+    '''
+    prices_table, cents_table, floor_table = _get_numpy_tables()
+    values, is_whole = _cents_array(prices)
+    ticks = _floor_ticks(values, cents_table, floor_table)
+    return is_whole & (cents_table[ticks] == values)
+
+
+def prices_to_ticks(prices):
+    '''
+    The ticks of prices, raises ValueError if any price isn't on the ladder
+    '''
+    prices_table, cents_table, floor_table = _get_numpy_tables()
+    values, is_whole = _cents_array(prices)
+    ticks = _floor_ticks(values, cents_table, floor_table)
+    invalid = ~(is_whole & (cents_table[ticks] == values))
+    if invalid.any():
+        raise ValueError('The prices {} are not on the Betfair price ladder'.format(
+            np.asarray(prices)[invalid].tolist()))
+    return ticks
+
+
+def ticks_to_prices(ticks):
+    prices_table, cents_table, floor_table = _get_numpy_tables()
+    ticks = np.asarray(ticks, dtype=np.int64)
+    if ((ticks < 0) | (ticks >= TICKS_COUNT)).any():
+        raise ValueError('The ticks are out of the price ladder (0 - {})'.format(TICKS_COUNT - 1))
+    return prices_table[ticks]
+
+
+def round_prices_down(prices):
+    prices_table, cents_table, floor_table = _get_numpy_tables()
+    values, is_whole = _cents_array(prices)
+    return prices_table[_floor_ticks(values, cents_table, floor_table)]
+
+
+def round_prices_up(prices):
+    prices_table, cents_table, floor_table = _get_numpy_tables()
+    values, is_whole = _cents_array(prices)
+    ticks = _floor_ticks(values, cents_table, floor_table)
+    ticks = ticks + (cents_table[ticks] < values)
+    return prices_table[np.minimum(ticks, TICKS_COUNT - 1)]
+
+
+def ticks_away_array(prices, ticks):
+    '''
+    The prices, which are ticks away from the valid prices (ticks can be one number
+    or array), the results are limited by the ends of ladder
+    '''
+    prices_table, cents_table, floor_table = _get_numpy_tables()
+    return prices_table[np.clip(prices_to_ticks(prices) + np.asarray(ticks, dtype=np.int64), 0, TICKS_COUNT - 1)]
+
+
+def check_price(price, name='price'):
+    '''
+    Raise ValueError, if the price is not on the ladder (used by the forms validation)
+    '''
+    if price is not None and not is_valid_price(price):
+        raise ValueError('The {} {} is not on the Betfair price ladder, the nearest valid prices are {} and {}'.format(
+            name, price, round_price_down(price), round_price_up(price)))
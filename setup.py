@@ -17,6 +17,12 @@ setuptools.setup(
     url='https://github.com/Sibiryakanton/betfair_python_rest',
     packages=setuptools.find_packages(),
     install_requires=requires,
+    extras_require={
+        'async': ['aiohttp'],
+        'speedups': ['orjson'],
+        'numpy': ['numpy'],
+        'tests': ['pytest', 'numpy'],
+    },
     classifiers=[
         "Programming Language :: Python :: 3",
     ],
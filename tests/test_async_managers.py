@@ -0,0 +1,258 @@
+from datetime import datetime
+import asyncio
+import json
+
+import pytest
+
+pytest.importorskip('aiohttp')
+
+from betfair_python_rest.caching import AsyncSingleFlight, READ_OPERATIONS, ACCOUNT_READ_OPERATIONS
+from betfair_python_rest.forms import (ListMarketBookForm, ListMarketCatalogueForm, ListCurrentOrdersForm,
+                                      ListClearedOrdersForm)
+from betfair_python_rest.managers import AsyncBetFairAPIManagerBetting, AsyncBetFairAPIManagerAccounts
+
+
+class FakeResponse:
+    def __init__(self, body):
+        self.body = body
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        pass
+
+    async def read(self):
+        return json.dumps(self.body).encode()
+
+    async def json(self, content_type=None):
+        return self.body
+
+
+class FakeSession:
+    '''
+    The transport instead of aiohttp.ClientSession: it records the requests
+    and answers them with handler(operation, decoded body of request)
+    '''
+
+    def __init__(self, handler):
+        self.handler = handler
+        self.requests = []
+        self.closed = False
+
+    def post(self, url, data=None, headers=None, **kwargs):
+        operation = url.rstrip('/').rsplit('/', 1)[-1]
+        body = json.loads(data) if data else {}
+        self.requests.append((operation, body, headers))
+        return FakeResponse(self.handler(operation, body))
+
+    async def close(self):
+        self.closed = True
+
+
+class Betting(AsyncBetFairAPIManagerBetting):
+    crt_path = 'client.crt'
+    crt_key_path = 'client.key'
+
+
+class Accounts(AsyncBetFairAPIManagerAccounts):
+    crt_path = 'client.crt'
+    crt_key_path = 'client.key'
+
+
+def make_manager(manager_class, handler, session_token='token', **kwargs):
+    manager = manager_class('login', 'password', 'api_key', session_token=session_token, **kwargs)
+    manager.session = FakeSession(handler)
+    return manager
+
+
+def test_request_goes_through_session():
+    async def main():
+        manager = make_manager(Betting, lambda operation, body: [{'marketId': market_id}
+                                                                  for market_id in body['marketIds']])
+        session = manager.session
+        async with manager:
+            response = await manager.list_market_book(ListMarketBookForm(market_ids=['1.1', '1.2']))
+        assert response == [{'marketId': '1.1'}, {'marketId': '1.2'}]
+        [(operation, body, headers)] = session.requests
+        assert operation == 'listMarketBook'
+        assert body['marketIds'] == ['1.1', '1.2']
+        assert headers['X-Application'] == 'api_key'
+        assert headers['X-Authentication'] == 'token'
+
+    asyncio.run(main())
+
+
+def test_concurrent_requests_share_login():
+    async def main():
+        manager = make_manager(Accounts, lambda operation, body: {'availableToBetBalance': 10.0},
+                               session_token=None)
+        logins = []
+
+        async def login():
+            logins.append(1)
+            await asyncio.sleep(0.01)
+            manager.session_token = 'new_token'
+
+        manager.login = login
+        responses = await asyncio.gather(*[manager.get_account_funds() for _ in range(3)])
+        assert responses == [{'availableToBetBalance': 10.0}] * 3
+        assert len(logins) == 1
+        assert [headers['X-Authentication'] for _, _, headers in manager.session.requests] == ['new_token'] * 3
+
+    asyncio.run(main())
+
+
+def test_context_manager_closes_session():
+    async def main():
+        manager = make_manager(Accounts, lambda operation, body: {})
+        session = manager.session
+        async with manager:
+            await manager.get_account_details()
+        assert session.closed
+        assert manager.session is None
+
+    asyncio.run(main())
+
+
+def make_expiring_manager(password='password'):
+    invalid_session = {'detail': {'APINGException': {'errorCode': 'INVALID_SESSION_INFORMATION'}}}
+    managers = []
+
+    def handler(operation, body):
+        if operation == 'keepAlive':
+            return {'status': 'FAIL', 'error': 'NO_SESSION'}
+        return invalid_session if managers[0].session_token == 'old_token' else {'availableToBetBalance': 10.0}
+
+    manager = Accounts('login', password, 'api_key', session_token='old_token')
+    manager.session = FakeSession(handler)
+    managers.append(manager)
+    logins = []
+
+    async def login():
+        logins.append(1)
+        manager.session_token = 'new_token'
+
+    manager.login = login
+    return manager, logins
+
+
+def test_relogin_and_retry_on_expired_session():
+    async def main():
+        manager, logins = make_expiring_manager()
+        responses = await asyncio.gather(*[manager.get_account_funds() for _ in range(3)])
+        assert responses == [{'availableToBetBalance': 10.0}] * 3
+        assert len(logins) == 1
+        assert [headers['X-Authentication'] for _, _, headers in manager.session.requests[-3:]] == ['new_token'] * 3
+
+    asyncio.run(main())
+
+
+def test_keep_alive_logs_in_again_only_with_password():
+    async def main():
+        manager, logins = make_expiring_manager()
+        await manager.keep_alive()
+        assert len(logins) == 1
+        manager, logins = make_expiring_manager(password=None)
+        await manager.keep_alive()
+        assert not logins
+        assert manager.session_token == 'old_token'
+
+    asyncio.run(main())
+
+
+def test_too_much_data_is_rejected_without_request():
+    async def main():
+        # Without market ids the request can't be split
+        form = ListMarketCatalogueForm(market_projection=['MARKET_DESCRIPTION', 'RUNNER_METADATA'], max_results=1000)
+        manager = make_manager(Betting, lambda operation, body: [])
+        response = await manager.list_market_catalogue(form)
+        assert response['detail']['APINGException']['errorCode'] == 'TOO_MUCH_DATA'
+        assert manager.session.requests == []
+
+    asyncio.run(main())
+
+
+def test_heavy_market_book_is_split():
+    async def main():
+        market_ids = ['1.{}'.format(index) for index in range(100)]
+        manager = make_manager(Betting, lambda operation, body: [{'marketId': market_id}
+                                                                  for market_id in reversed(body['marketIds'])])
+        response = await manager.list_market_book(ListMarketBookForm(market_ids=market_ids,
+                                                                     price_data=['EX_BEST_OFFERS']))
+        assert response == [{'marketId': market_id} for market_id in market_ids]
+        assert sorted(len(body['marketIds']) for _, body, _ in manager.session.requests) == [20, 40, 40]
+
+    asyncio.run(main())
+
+
+def orders_handler(operation, body):
+    items_key = {'listCurrentOrders': 'currentOrders', 'listClearedOrders': 'clearedOrders'}[operation]
+    records = [{'betId': str(index)} for index in range(7)]
+    from_record, record_count = body.get('fromRecord', 0), body['recordCount']
+    return {items_key: records[from_record:from_record + record_count],
+            'moreAvailable': from_record + record_count < len(records)}
+
+
+def test_iter_orders():
+    async def main():
+        manager = make_manager(Betting, orders_handler)
+        current_orders = [order['betId'] async for order in manager.iter_current_orders(
+            ListCurrentOrdersForm(from_record=2), page_size=2, look_ahead=0)]
+        assert current_orders == ['2', '3', '4', '5', '6']
+        assert [(body['fromRecord'], body['recordCount']) for _, body, _ in manager.session.requests] == [
+            (2, 2), (4, 2), (6, 2)]
+        cleared_orders = [order['betId'] async for order in manager.iter_cleared_orders(
+            ListClearedOrdersForm(bet_status='SETTLED', from_date=None, to_date=None), page_size=3, look_ahead=2)]
+        assert cleared_orders == [str(index) for index in range(7)]
+
+    asyncio.run(main())
+
+
+CLEARED_ORDERS = [{'betId': str(index), 'settledDate': '2020-01-{:02d}T{:02d}:00:00Z'.format(1 + index // 4,
+                                                                                         index % 4 * 6)}
+                  for index in range(16)]
+
+
+def cleared_orders_handler(operation, body):
+    date_range = body['settledDateRange']
+    orders = [order for order in CLEARED_ORDERS if date_range['from'] <= order['settledDate'] <= date_range['to']]
+    from_record, record_count = body.get('fromRecord', 0), body['recordCount']
+    return {'clearedOrders': orders[from_record:from_record + record_count],
+            'moreAvailable': from_record + record_count < len(orders)}
+
+
+def test_backfill_cleared_orders():
+    async def main():
+        manager = make_manager(Betting, cleared_orders_handler)
+        form = ListClearedOrdersForm(bet_status='SETTLED', from_date=datetime(2020, 1, 1),
+                                     to_date=datetime(2020, 1, 5))
+        assert await manager.backfill_cleared_orders(form, partitions=4, page_size=3) == CLEARED_ORDERS
+        orders = []
+        assert await manager.backfill_cleared_orders(form, partitions=3, page_size=2, sink=orders.append) == 16
+        assert orders == CLEARED_ORDERS
+
+    asyncio.run(main())
+
+
+def test_single_flight():
+    async def main():
+        manager = make_manager(Betting, lambda operation, body: [{'marketId': market_id}
+                                                                  for market_id in body['marketIds']],
+                               single_flight=AsyncSingleFlight())
+        responses = await asyncio.gather(*[manager.list_market_book(ListMarketBookForm(market_ids=['1.1']))
+                                           for _ in range(3)])
+        assert responses == [[{'marketId': '1.1'}]] * 3
+        assert len(manager.session.requests) == 1
+
+        manager = make_manager(Accounts, lambda operation, body: {'availableToBetBalance': 10.0},
+                               single_flight=AsyncSingleFlight())
+        await asyncio.gather(*[manager.get_account_funds() for _ in range(3)])
+        assert len(manager.session.requests) == 3
+        manager = make_manager(Accounts, lambda operation, body: {'availableToBetBalance': 10.0},
+                               single_flight=AsyncSingleFlight(READ_OPERATIONS + ACCOUNT_READ_OPERATIONS))
+        responses = await asyncio.gather(*[manager.get_account_funds() for _ in range(3)])
+        assert responses == [{'availableToBetBalance': 10.0}] * 3
+        assert len(manager.session.requests) == 1
+
+    asyncio.run(main())
@@ -0,0 +1,100 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+import pytest
+
+from betfair_python_rest.forms import ListClearedOrdersForm
+from betfair_python_rest.managers.backfill import (split_time_range, partition_cleared_orders_form,
+                                                   stream_partitions, ClearedOrdersCollector, parse_datetime)
+
+
+def test_split_time_range_shares_boundaries():
+    start = datetime(2020, 1, 1)
+    ranges = split_time_range(start, start + timedelta(days=90), 8)
+    assert len(ranges) == 8
+    assert ranges[0][0] == start
+    assert ranges[-1][1] == start + timedelta(days=90)
+    for (_, previous_to), (next_from, _) in zip(ranges, ranges[1:]):
+        assert previous_to == next_from
+
+
+def test_split_time_range_rounds_to_seconds():
+    start = datetime(2020, 1, 1)
+    ranges = split_time_range(start, start + timedelta(seconds=10), 3)
+    assert [(range_from - start).total_seconds() for range_from, _ in ranges] == [0, 3, 6]
+    assert all(range_from.microsecond == 0 for range_from, _ in ranges)
+
+
+def test_split_time_range_short_range():
+    start = datetime(2020, 1, 1)
+    assert split_time_range(start, start + timedelta(seconds=2), 8) == [
+        (start, start + timedelta(seconds=1)), (start + timedelta(seconds=1), start + timedelta(seconds=2))]
+
+
+def test_partition_cleared_orders_form():
+    form = ListClearedOrdersForm(bet_status='SETTLED', from_date='2020-01-01', to_date=datetime(2020, 1, 5),
+                                 event_type_ids=['1'], from_record=100, record_count=10)
+    forms = partition_cleared_orders_form(form, 4)
+    assert [(part.from_date, part.to_date) for part in forms] == [
+        ('2020-01-01T00:00:00Z', '2020-01-02T00:00:00Z'), ('2020-01-02T00:00:00Z', '2020-01-03T00:00:00Z'),
+        ('2020-01-03T00:00:00Z', '2020-01-04T00:00:00Z'), ('2020-01-04T00:00:00Z', '2020-01-05T00:00:00Z')]
+    assert all(part.event_type_ids == ['1'] and part.bet_status == 'SETTLED' for part in forms)
+    assert all(part.from_record is None and part.record_count is None for part in forms)
+
+
+def test_partition_cleared_orders_form_default_period():
+    forms = partition_cleared_orders_form(ListClearedOrdersForm(bet_status='SETTLED', from_date=None, to_date=None), 2)
+    assert parse_datetime(forms[-1].to_date) - parse_datetime(forms[0].from_date) == timedelta(days=90)
+
+
+def order(bet_id, settled_date):
+    return {'betId': bet_id, 'settledDate': settled_date}
+
+
+def test_collector_removes_boundary_duplicates():
+    collector = ClearedOrdersCollector()
+    collector.start_partition('2020-01-02T00:00:00Z')
+    collector.add([order('1', '2020-01-01T10:00:00.000Z'), order('2', '2020-01-02T00:00:00.000Z')])
+    collector.start_partition('2020-01-03T00:00:00Z')
+    collector.add([order('2', '2020-01-02T00:00:00.000Z'), order('3', '2020-01-02T00:00:00.500Z'),
+                   order('4', '2020-01-02T12:00:00.000Z')])
+    assert [item['betId'] for item in collector.result] == ['1', '2', '3', '4']
+
+
+def test_collector_keeps_only_boundary_ids():
+    collector = ClearedOrdersCollector()
+    collector.start_partition('2020-01-02T00:00:00Z')
+    collector.add([order(str(index), '2020-01-01T10:00:00.000Z') for index in range(100)])
+    assert not collector._boundary_bet_ids
+    # The ids from the middle of partitions are not deduplicated (they can't be repeated)
+    collector.start_partition('2020-01-03T00:00:00Z')
+    collector.add([order('5', '2020-01-02T10:00:00.000Z')])
+    assert collector.count == 101
+
+
+def test_collector_sink():
+    received = []
+    collector = ClearedOrdersCollector(received.append)
+    collector.start_partition('2020-01-02T00:00:00Z')
+    collector.add([order('1', '2020-01-01T10:00:00.000Z')])
+    assert collector.result == 1
+    assert received == [order('1', '2020-01-01T10:00:00.000Z')] and collector.orders == []
+
+
+def test_stream_partitions_keeps_order():
+    partitions = [lambda index=index: iter([[index, 1], [index, 2]]) for index in range(5)]
+    with ThreadPoolExecutor(3) as executor:
+        pages = list(stream_partitions(executor, partitions))
+    assert pages == [(index, [index, page]) for index in range(5) for page in (1, 2)]
+
+
+def test_stream_partitions_raises_error_of_partition():
+    def failed():
+        yield ['page']
+        raise ValueError('failed')
+
+    with ThreadPoolExecutor(2) as executor:
+        pages = stream_partitions(executor, [failed, lambda: iter([['other']])])
+        assert next(pages) == (0, ['page'])
+        with pytest.raises(ValueError):
+            next(pages)
@@ -0,0 +1,359 @@
+from datetime import datetime
+import json
+import threading
+import time
+
+import pytest
+from requests.adapters import HTTPAdapter
+
+from betfair_python_rest.api_exceptions.base_exception import BetFairAPIManagerException
+from betfair_python_rest.forms import (MarketFilterAndLocaleForm, ListMarketBookForm, ListMarketCatalogueForm,
+                                      ListCurrentOrdersForm, ListClearedOrdersForm)
+from betfair_python_rest.managers import BetFairAPIManagerBetting, BetFairAPIManagerAccounts
+from betfair_python_rest.models import MarketBook, CurrentOrder
+from betfair_python_rest.serialization import JSONBackend
+
+
+class FakeResponse:
+    def __init__(self, body):
+        self.body = body
+        self.content = json.dumps(body).encode()
+
+    def json(self):
+        return self.body
+
+
+class FakeSession:
+    '''
+    The transport instead of requests.Session: it records the requests
+    and answers them with handler(operation, decoded body of request)
+    '''
+
+    def __init__(self, handler):
+        self.handler = handler
+        self.requests = []
+        self.headers = {}
+        self.closed = False
+
+    def post(self, url, data=None, headers=None, cert=None, **kwargs):
+        operation = url.rstrip('/').rsplit('/', 1)[-1]
+        body = json.loads(data) if isinstance(data, (str, bytes)) else data
+        self.requests.append({'operation': operation, 'body': body, 'headers': headers, 'cert': cert,
+                              'session_token': self.headers.get('X-Authentication')})
+        return FakeResponse(self.handler(operation, body))
+
+    def close(self):
+        self.closed = True
+
+
+def make_manager(handler, manager_class=BetFairAPIManagerBetting, login='login', password='password', **kwargs):
+    fake_class = type('Fake' + manager_class.__name__, (manager_class,), {
+        'crt_path': 'client.crt', 'crt_key_path': 'client.key',
+        '_create_session': lambda self: FakeSession(handler)})
+    return fake_class(login, password, 'api_key', **kwargs)
+
+
+def login_handler(operation, body):
+    if operation == 'certlogin':
+        return {'loginStatus': 'SUCCESS', 'sessionToken': 'token'}
+    return []
+
+
+def test_login_with_certificate():
+    manager = make_manager(login_handler)
+    [request] = manager.session.requests
+    assert request['operation'] == 'certlogin'
+    assert request['body'] == {'username': 'login', 'password': 'password'}
+    assert request['cert'] == ('/client.crt', '/client.key')
+    assert request['headers']['Content-Type'] == 'application/x-www-form-urlencoded'
+    assert manager.session_token == 'token'
+    assert manager.session.headers['X-Authentication'] == 'token'
+    assert manager.login_duration >= 0
+
+
+def test_login_failure_raises():
+    with pytest.raises(BetFairAPIManagerException, match='The username or password are invalid'):
+        make_manager(lambda operation, body: {'loginStatus': 'INVALID_USERNAME_OR_PASSWORD'})
+
+
+def test_login_is_skipped_with_session_token():
+    manager = make_manager(login_handler, session_token='old_token')
+    assert manager.session.requests == []
+    assert manager.session.headers['X-Authentication'] == 'old_token'
+
+
+def test_each_manager_has_own_session():
+    first = make_manager(login_handler, session_token='first_token')
+    second = make_manager(login_handler, session_token='second_token')
+    assert first.session is not second.session
+    assert first.session.headers['X-Authentication'] == 'first_token'
+    assert second.session.headers['X-Authentication'] == 'second_token'
+
+
+def test_requests_reuse_session():
+    manager = make_manager(login_handler)
+    session = manager.session
+    manager.list_event_types(MarketFilterAndLocaleForm())
+    manager.list_event_types(MarketFilterAndLocaleForm())
+    assert manager.session is session
+    assert [request['operation'] for request in session.requests] == ['certlogin', 'listEventTypes',
+                                                                      'listEventTypes']
+    manager.close()
+    assert session.closed
+
+
+def test_session_pool_settings():
+    manager = BetFairAPIManagerBetting('login', 'password', 'api_key', session_token='token',
+                                       pool_maxsize=32, pool_block=True, connection_keep_alive=False)
+    adapter = manager.session.get_adapter('https://api.betfair.com')
+    assert isinstance(adapter, HTTPAdapter)
+    assert adapter._pool_maxsize == 32
+    assert adapter._pool_block
+    assert manager.session.headers['Connection'] == 'close'
+    manager.close()
+
+
+def test_accounts_methods_return_decoded_json():
+    manager = make_manager(lambda operation, body: {'availableToBetBalance': 10.0, 'wallet': body.get('wallet')},
+                           manager_class=BetFairAPIManagerAccounts, session_token='token')
+    assert manager.get_account_funds(wallet='UK') == {'availableToBetBalance': 10.0, 'wallet': 'UK'}
+    assert manager.session.requests[0]['operation'] == 'getAccountFunds'
+
+
+def test_accounts_errors_raise():
+    error = {'faultcode': 'Client', 'detail': {'AccountAPINGException': {'errorCode': 'INVALID_APP_KEY'}}}
+    manager = make_manager(lambda operation, body: error, manager_class=BetFairAPIManagerAccounts,
+                           session_token='token', raise_exceptions=True)
+    with pytest.raises(BetFairAPIManagerException):
+        manager.get_account_details()
+    manager.raise_exceptions = False
+    assert manager.get_account_details() == error
+
+
+def test_response_is_decoded_once():
+    class CountingBackend(JSONBackend):
+        loads_calls = 0
+
+        def loads(self, content):
+            CountingBackend.loads_calls += 1
+            return JSONBackend.loads(self, content)
+
+    manager = make_manager(login_handler, session_token='token')
+    manager.json_backend = CountingBackend()
+    assert manager.list_event_types(MarketFilterAndLocaleForm()) == []
+    assert CountingBackend.loads_calls == 1
+
+
+class ExpiringSessionHandler:
+    '''
+    The server, which rejects the requests of the old session token
+    '''
+    invalid_session = {'faultcode': 'Client',
+                       'detail': {'APINGException': {'errorCode': 'INVALID_SESSION_INFORMATION'}}}
+
+    def __init__(self, manager_tokens):
+        self.manager_tokens = manager_tokens
+        self.logins = 0
+        self.lock = threading.Lock()
+
+    def __call__(self, operation, body):
+        if operation == 'certlogin':
+            with self.lock:
+                self.logins += 1
+            time.sleep(0.01)
+            return {'loginStatus': 'SUCCESS', 'sessionToken': 'new_token'}
+        if operation == 'keepAlive':
+            return {'status': 'FAIL', 'error': 'NO_SESSION'}
+        if self.manager_tokens() == 'old_token':
+            return self.invalid_session
+        return [{'eventType': {'id': '1'}}]
+
+
+def make_expiring_manager(**kwargs):
+    managers = []
+    handler = ExpiringSessionHandler(lambda: managers[0].session.headers['X-Authentication'])
+    managers.append(make_manager(handler, session_token='old_token', **kwargs))
+    return managers[0], handler
+
+
+def test_relogin_and_retry_on_expired_session():
+    manager, handler = make_expiring_manager()
+    assert manager.list_event_types(MarketFilterAndLocaleForm()) == [{'eventType': {'id': '1'}}]
+    assert [(request['operation'], request['session_token']) for request in manager.session.requests] == [
+        ('listEventTypes', 'old_token'), ('certlogin', 'old_token'), ('listEventTypes', 'new_token')]
+    assert handler.logins == 1
+
+
+def test_concurrent_expired_requests_log_in_once():
+    manager, handler = make_expiring_manager()
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(manager.list_event_types(MarketFilterAndLocaleForm())))
+               for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert results == [[{'eventType': {'id': '1'}}]] * 5
+    assert handler.logins == 1
+
+
+def test_expired_session_is_returned_without_password():
+    manager, handler = make_expiring_manager(password=None)
+    assert manager.list_event_types(MarketFilterAndLocaleForm()) == ExpiringSessionHandler.invalid_session
+    manager.keep_alive()
+    assert handler.logins == 0
+
+
+def test_keep_alive_logs_in_again():
+    manager, handler = make_expiring_manager()
+    manager.keep_alive()
+    assert handler.logins == 1
+    assert manager.session_token == 'new_token'
+    assert manager.session.headers['X-Authentication'] == 'new_token'
+
+
+def test_keep_alive_thread():
+    manager = make_manager(lambda operation, body: {'status': 'SUCCESS', 'token': 'token'}, session_token='token',
+                           session_keep_alive_interval=0.01)
+    deadline = time.monotonic() + 5
+    while len(manager.session.requests) < 2 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    manager.close()
+    assert {request['operation'] for request in manager.session.requests} == {'keepAlive'}
+    assert len(manager.session.requests) >= 2
+    assert manager._keep_alive_thread is None
+    count = len(manager.session.requests)
+    time.sleep(0.05)
+    assert len(manager.session.requests) == count
+
+
+def test_too_much_data_is_rejected_without_request():
+    # Without market ids the request can't be split
+    form = ListMarketCatalogueForm(market_projection=['MARKET_DESCRIPTION', 'RUNNER_METADATA'], max_results=1000)
+    manager = make_manager(login_handler, session_token='token')
+    response = manager.list_market_catalogue(form)
+    assert response['detail']['APINGException']['errorCode'] == 'TOO_MUCH_DATA'
+    manager.raise_exceptions = True
+    with pytest.raises(BetFairAPIManagerException):
+        manager.list_market_catalogue(form)
+    assert manager.session.requests == []
+
+
+def test_heavy_market_book_is_split():
+    market_ids = ['1.{}'.format(index) for index in range(100)]
+    manager = make_manager(lambda operation, body: [{'marketId': market_id}
+                                                    for market_id in reversed(body['marketIds'])],
+                           session_token='token')
+    response = manager.list_market_book(ListMarketBookForm(market_ids=market_ids, price_data=['EX_BEST_OFFERS']))
+    assert response == [{'marketId': market_id} for market_id in market_ids]
+    assert sorted(len(request['body']['marketIds']) for request in manager.session.requests) == [20, 40, 40]
+    manager.close()
+
+
+def json_rpc_handler(operation, body):
+    return [{'jsonrpc': '2.0', 'result': [call['method']], 'id': call['id']} for call in body]
+
+
+def test_execute_many_sends_one_request():
+    manager = make_manager(json_rpc_handler, session_token='token')
+    heavy_form = ListMarketCatalogueForm(market_projection=['MARKET_DESCRIPTION', 'RUNNER_METADATA'], max_results=1000)
+    results = manager.execute_many([('listEventTypes', MarketFilterAndLocaleForm()),
+                                    ('listMarketCatalogue', heavy_form),
+                                    ('listCurrentOrders', ListCurrentOrdersForm())])
+    assert results[0] == ['SportsAPING/v1.0/listEventTypes']
+    assert results[1]['detail']['APINGException']['errorCode'] == 'TOO_MUCH_DATA'
+    assert results[2] == ['SportsAPING/v1.0/listCurrentOrders']
+    [request] = manager.session.requests
+    assert request['operation'] == 'v1'
+    assert [call['method'] for call in request['body']] == ['SportsAPING/v1.0/listEventTypes',
+                                                            'SportsAPING/v1.0/listCurrentOrders']
+
+
+def test_batch():
+    manager = make_manager(json_rpc_handler, session_token='token')
+    with manager.batch() as batch:
+        event_types = batch.add('listEventTypes', MarketFilterAndLocaleForm())
+        current_orders = batch.add('listCurrentOrders', ListCurrentOrdersForm())
+    assert event_types.result == ['SportsAPING/v1.0/listEventTypes']
+    assert current_orders.result == ['SportsAPING/v1.0/listCurrentOrders']
+    assert len(manager.session.requests) == 1
+
+
+def orders_handler(operation, body):
+    items_key = {'listCurrentOrders': 'currentOrders', 'listClearedOrders': 'clearedOrders',
+                 'getAccountStatement': 'accountStatement'}[operation]
+    records = [{'betId': str(index)} for index in range(7)]
+    from_record, record_count = body.get('fromRecord', 0), body['recordCount']
+    return {items_key: records[from_record:from_record + record_count],
+            'moreAvailable': from_record + record_count < len(records)}
+
+
+def test_iter_orders():
+    manager = make_manager(orders_handler, session_token='token')
+    current_orders = manager.iter_current_orders(ListCurrentOrdersForm(from_record=2), page_size=2, look_ahead=0)
+    assert [order['betId'] for order in current_orders] == ['2', '3', '4', '5', '6']
+    assert [(request['body']['fromRecord'], request['body']['recordCount'])
+            for request in manager.session.requests] == [(2, 2), (4, 2), (6, 2)]
+    cleared_orders = manager.iter_cleared_orders(ListClearedOrdersForm(bet_status='SETTLED', from_date=None,
+                                                                       to_date=None), page_size=3)
+    assert [order['betId'] for order in cleared_orders] == [str(index) for index in range(7)]
+    manager.close()
+
+
+def test_iter_account_statement():
+    manager = make_manager(orders_handler, manager_class=BetFairAPIManagerAccounts, session_token='token')
+    assert len(list(manager.iter_account_statement(page_size=3, look_ahead=2))) == 7
+    manager.close()
+
+
+# Every 6 hours, the orders on the boundaries of days are returned by both partitions
+CLEARED_ORDERS = [{'betId': str(index), 'settledDate': '2020-01-{:02d}T{:02d}:00:00Z'.format(1 + index // 4,
+                                                                                         index % 4 * 6)}
+                  for index in range(16)]
+
+
+def cleared_orders_handler(operation, body):
+    date_range = body['settledDateRange']
+    orders = [order for order in CLEARED_ORDERS if date_range['from'] <= order['settledDate'] <= date_range['to']]
+    from_record, record_count = body.get('fromRecord', 0), body['recordCount']
+    return {'clearedOrders': orders[from_record:from_record + record_count],
+            'moreAvailable': from_record + record_count < len(orders)}
+
+
+def test_backfill_cleared_orders():
+    manager = make_manager(cleared_orders_handler, session_token='token')
+    form = ListClearedOrdersForm(bet_status='SETTLED', from_date=datetime(2020, 1, 1), to_date=datetime(2020, 1, 5))
+    assert manager.backfill_cleared_orders(form, partitions=4, page_size=3) == CLEARED_ORDERS
+    assert len({request['body']['settledDateRange']['from'] for request in manager.session.requests}) == 4
+    orders = []
+    assert manager.backfill_cleared_orders(form, partitions=3, page_size=2, sink=orders.append) == 16
+    assert orders == CLEARED_ORDERS
+    manager.close()
+
+
+def test_response_models():
+    manager = make_manager(lambda operation, body: [{'marketId': market_id, 'runners': [{'selectionId': 1}]}
+                                                    for market_id in body['marketIds']],
+                           session_token='token', response_models=True)
+    [market_book] = manager.list_market_book(ListMarketBookForm(market_ids=['1.1']))
+    assert isinstance(market_book, MarketBook)
+    assert market_book.runners[0].selection_id == 1
+    error = {'detail': {'APINGException': {'errorCode': 'TOO_MANY_REQUESTS'}}}
+    manager.session.handler = lambda operation, body: error
+    assert manager.list_market_book(ListMarketBookForm(market_ids=['1.1'])) == error
+
+
+def test_iter_orders_with_response_models():
+    manager = make_manager(orders_handler, session_token='token', response_models=True)
+    orders = list(manager.iter_current_orders(ListCurrentOrdersForm(), page_size=3))
+    assert all(isinstance(order, CurrentOrder) for order in orders)
+    assert [order.bet_id for order in orders] == [str(index) for index in range(7)]
+    manager.close()
+
+
+def test_list_currency_rates():
+    manager = make_manager(lambda operation, body: [{'currencyCode': 'EUR', 'rate': 1.2}],
+                           manager_class=BetFairAPIManagerAccounts, session_token='token')
+    assert manager.list_currency_rates(from_currency='GBP') == [{'currencyCode': 'EUR', 'rate': 1.2}]
+    [request] = manager.session.requests
+    assert (request['operation'], request['body']) == ('listCurrencyRates', {'fromCurrency': 'GBP'})
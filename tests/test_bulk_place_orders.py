@@ -0,0 +1,100 @@
+import pytest
+
+from betfair_python_rest.forms import BulkPlaceOrderForm, PlaceOrderForm, PlaceInstruction, LimitOrder, freeze
+from betfair_python_rest.serialization import serialize_form
+
+np = pytest.importorskip('numpy')
+
+
+def bulk_form(count, **kwargs):
+    return BulkPlaceOrderForm(market_id='1.1', selection_ids=np.arange(count), sides='BACK',
+                              prices=np.full(count, 2.0), sizes=np.full(count, 2.0), **kwargs)
+
+
+def test_data_is_the_same_as_place_order_form():
+    form = BulkPlaceOrderForm(market_id='1.1', selection_ids=[1, 2], sides=['BACK', 'LAY'], prices=[2.02, 3.05],
+                              sizes=[2.0, 5.0], persistence_types=['LAPSE', 'PERSIST'],
+                              customer_order_refs=['r1', ''], handicaps=[0.0, -0.5], customer_ref='c',
+                              market_version=3)
+    instructions = [
+        PlaceInstruction(selection_id=1, order_type='LIMIT', side='BACK', handicap=0.0, customer_order_ref='r1',
+                         limit_order=LimitOrder(size=2.0, price=2.02, persistence_type='LAPSE')),
+        PlaceInstruction(selection_id=2, order_type='LIMIT', side='LAY', handicap=-0.5,
+                         limit_order=LimitOrder(size=5.0, price=3.05, persistence_type='PERSIST'))]
+    expected = serialize_form(PlaceOrderForm(market_id='1.1', instructions=instructions, customer_ref='c',
+                                             market_version=3))
+    assert form.data == expected
+    assert serialize_form(form) == expected
+
+
+def test_none_customer_order_refs_are_skipped():
+    form = bulk_form(3, customer_order_refs=['r1', None, ''])
+    assert form.customer_order_refs.tolist() == ['r1', '', '']
+    assert [instruction.get('customerOrderRef') for instruction in form.data['instructions']] == ['r1', None, None]
+    assert form[1:].customer_order_refs.tolist() == ['', '']
+
+
+def test_split():
+    form = bulk_form(450)
+    chunks = form.split()
+    assert [len(chunk) for chunk in chunks] == [200, 200, 50]
+    assert np.concatenate([chunk.selection_ids for chunk in chunks]).tolist() == form.selection_ids.tolist()
+    assert [len(chunk.data['instructions']) for chunk in chunks] == [200, 200, 50]
+
+
+def test_split_within_limit():
+    form = bulk_form(200)
+    assert form.split() == [form]
+    assert [len(chunk) for chunk in form.split(60)] == [60, 60, 60, 20]
+
+
+def test_split_gives_unique_customer_refs():
+    chunks = bulk_form(450, customer_ref='x').split()
+    assert [chunk.data['customerRef'] for chunk in chunks] == ['x-0', 'x-1', 'x-2']
+
+
+def test_split_customer_refs_within_limit():
+    chunks = bulk_form(2200, customer_ref='r' * 32).split()
+    refs = [chunk.customer_ref for chunk in chunks]
+    assert len(set(refs)) == len(chunks)
+    assert all(len(ref) <= 32 for ref in refs)
+
+
+def test_split_without_customer_ref():
+    assert all('customerRef' not in chunk.data for chunk in bulk_form(450).split())
+
+
+def test_slice_has_no_customer_ref():
+    form = bulk_form(10, customer_ref='x')
+    assert form[2:5].customer_ref is None
+    assert form[2:5].selection_ids.tolist() == [2, 3, 4]
+    assert form[3].selection_ids.tolist() == [3]
+    assert form[form.selection_ids % 2 == 0].selection_ids.tolist() == [0, 2, 4, 6, 8]
+
+
+def test_equality_compares_orders():
+    form = bulk_form(10)
+    assert form == bulk_form(10)
+    assert form == form[:]
+    assert form != bulk_form(10, customer_ref='x')
+    assert form != form[:5]
+    assert form != BulkPlaceOrderForm(market_id='1.1', selection_ids=np.arange(10), sides='BACK',
+                                      prices=np.full(10, 2.02), sizes=np.full(10, 2.0))
+    assert freeze(form) == freeze(bulk_form(10))
+
+
+@pytest.mark.parametrize('kwargs, message', [
+    (dict(prices=[2.0, 2.01]), r'prices of orders \[1\]'),
+    (dict(prices=[float('nan'), 2.0]), r'prices of orders \[0\] are not finite numbers'),
+    (dict(sizes=[2.0, 0.5]), r'sizes of orders \[1\]'),
+    (dict(sizes=[2.0, float('nan')]), r'sizes of orders \[1\]'),
+    (dict(sides=['BACK', 'BUY']), r'sides of orders \[1\]'),
+    (dict(persistence_types='KEEP'), r'persistence types of orders \[0, 1\]'),
+    (dict(customer_order_refs=['r', 'r' * 33]), r'customer order refs of orders \[1\]'),
+    (dict(prices=[2.0, 2.0, 2.0]), 'length of prices'),
+])
+def test_validation(kwargs, message):
+    values = dict(market_id='1.1', selection_ids=[1, 2], sides='BACK', prices=[2.0, 2.0], sizes=[2.0, 2.0])
+    values.update(kwargs)
+    with pytest.raises(ValueError, match=message):
+        BulkPlaceOrderForm(**values)
@@ -0,0 +1,113 @@
+import json
+
+import pytest
+
+from betfair_python_rest.caching import TTLCache, ResponseCache, canonical_key
+from betfair_python_rest.caching import ttl_cache
+from betfair_python_rest.forms import MarketFilterAndLocaleForm, ListMarketBookForm
+from betfair_python_rest.managers import BetFairAPIManagerBetting
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(ttl_cache.time, 'monotonic', clock)
+    return clock
+
+
+def test_ttl_cache_expires_values(clock):
+    cache = TTLCache(ttl=10)
+    cache.set('a', 1)
+    cache.set('b', 2, ttl=20)
+    clock.now += 9.9
+    assert cache.get('a') == 1
+    clock.now += 0.1
+    assert cache.get('a') is None
+    assert cache.get('b') == 2
+    assert len(cache) == 1
+    clock.now += 10
+    cache.expire()
+    assert len(cache) == 0
+
+
+def test_ttl_cache_removes_least_recently_used(clock):
+    cache = TTLCache(maxsize=2)
+    cache.set('a', 1)
+    cache.set('b', 2)
+    cache.get('a')
+    cache.set('c', 3)
+    assert (cache.get('a'), cache.get('b'), cache.get('c')) == (1, None, 3)
+    assert cache.pop('a') == 1 and cache.pop('a', 'missing') == 'missing'
+    cache.remove_where(lambda key: key == 'c')
+    assert len(cache) == 0
+
+
+def test_canonical_key():
+    assert canonical_key('listEventTypes', {'filter': {'textQuery': 'x', 'eventIds': []}, 'locale': None}) == \
+        canonical_key('listEventTypes', {'locale': None, 'filter': {'textQuery': 'x'}})
+    assert canonical_key('listEventTypes', {'filter': {'textQuery': 'x'}}) != \
+        canonical_key('listEventTypes', {'filter': {'textQuery': 'y'}})
+    assert canonical_key('listEventTypes', None)[0] == 'listEventTypes'
+
+
+def test_response_cache(clock):
+    cache = ResponseCache(ttls={'listEventTypes': 60})
+    key = canonical_key('listEventTypes', {})
+    assert cache.is_cached('listEventTypes') and not cache.is_cached('listMarketBook')
+    assert cache.get(key) is None
+    cache.set(key, [{'eventType': {'id': '1'}}])
+    assert cache.get(key) == [{'eventType': {'id': '1'}}]
+    assert cache.stats == {'listEventTypes': {'hits': 1, 'misses': 1}}
+    clock.now += 60
+    assert cache.get(key) is None
+    cache.set(key, [])
+    cache.invalidate('listEventTypes')
+    assert len(cache) == 0
+
+
+class FakeResponse:
+    def __init__(self, body):
+        self.content = json.dumps(body).encode()
+
+
+class FakeSession:
+    def __init__(self):
+        self.operations = []
+        self.headers = {}
+
+    def post(self, url, data=None, **kwargs):
+        operation = url.rstrip('/').rsplit('/', 1)[-1]
+        self.operations.append(operation)
+        return FakeResponse(navigation_handler(operation, json.loads(data)))
+
+
+def navigation_handler(operation, body):
+    if body.get('filter', {}).get('textQuery') == 'error':
+        return {'detail': {'APINGException': {'errorCode': 'TOO_MANY_REQUESTS'}}}
+    return [{'operation': operation}]
+
+
+def test_manager_reuses_cached_responses():
+    manager = BetFairAPIManagerBetting('login', 'password', 'api_key', session_token='token',
+                                       response_cache=ResponseCache())
+    manager.session = FakeSession()
+    first = manager.list_event_types(MarketFilterAndLocaleForm(text_query='football'))
+    second = manager.list_event_types(MarketFilterAndLocaleForm(text_query='football'))
+    manager.list_event_types(MarketFilterAndLocaleForm(text_query='tennis'))
+    assert first == second == [{'operation': 'listEventTypes'}]
+    # The market books are not in NAVIGATION_TTLS, the errors are not cached
+    manager.list_market_book(ListMarketBookForm(market_ids=['1.1']))
+    manager.list_market_book(ListMarketBookForm(market_ids=['1.1']))
+    manager.list_event_types(MarketFilterAndLocaleForm(text_query='error'))
+    manager.list_event_types(MarketFilterAndLocaleForm(text_query='error'))
+    assert manager.session.operations == [
+        'listEventTypes', 'listEventTypes', 'listMarketBook', 'listMarketBook', 'listEventTypes', 'listEventTypes']
+    assert manager.response_cache.stats['listEventTypes'] == {'hits': 1, 'misses': 4}
@@ -0,0 +1,88 @@
+from datetime import datetime
+
+import pytest
+
+from betfair_python_rest.caching import ttl_cache
+from betfair_python_rest.forms import ListMarketCatalogueForm
+from betfair_python_rest.market_data import CatalogueStore
+
+
+def catalogue(market_id, event_id='10', event_type_id='1', start_time='2020-01-01T12:00:00.000Z'):
+    return {'marketId': market_id, 'marketName': 'Match Odds', 'marketStartTime': start_time,
+            'event': {'id': event_id}, 'eventType': {'id': event_type_id}}
+
+
+class FakeManager:
+    '''
+    Returns the catalogues of known markets only, like the server does for the closed markets
+    '''
+
+    def __init__(self, known_market_ids):
+        self.known_market_ids = known_market_ids
+        self.requests = []
+
+    def list_market_catalogue(self, form):
+        self.requests.append(form)
+        return [catalogue(market_id) for market_id in form.market_ids if market_id in self.known_market_ids]
+
+
+def test_put_and_get():
+    with CatalogueStore() as store:
+        assert store.put([catalogue('1.1'), catalogue('1.2', event_id='11'),
+                          catalogue('1.3', event_type_id='2', start_time='2020-01-01T10:00:00.000Z')]) == 3
+        assert len(store) == 3 and '1.1' in store and '1.4' not in store
+        assert store.get('1.1') == catalogue('1.1')
+        assert store.get('1.4') is None
+        assert set(store.get_many(['1.1', '1.2', '1.4'])) == {'1.1', '1.2'}
+        assert store.missing(['1.4', '1.1', '1.5']) == ['1.4', '1.5']
+        assert [market['marketId'] for market in store.markets_of_event('10')] == ['1.3', '1.1']
+        assert [market['marketId'] for market in store.markets_of_event_type('1')] == ['1.1', '1.2']
+        with pytest.raises(ValueError):
+            store.put({'faultcode': 'Client'})
+
+
+def test_store_is_shared_by_file(tmp_path):
+    path = str(tmp_path / 'catalogue.sqlite')
+    with CatalogueStore(path) as store:
+        store.put([catalogue('1.1')])
+    with CatalogueStore(path) as store, CatalogueStore(path) as other_store:
+        assert store.get('1.1') == catalogue('1.1')
+        other_store.put([catalogue('1.2')])
+        assert '1.2' in store
+
+
+def test_fetch_missing():
+    store = CatalogueStore()
+    store.put([catalogue('1.1')])
+    manager = FakeManager({'1.1', '1.2', '1.3'})
+    form = ListMarketCatalogueForm(market_projection=['EVENT'], locale='en')
+    catalogues = store.fetch_missing(manager, ['1.1', '1.2', '1.3'], form)
+    assert set(catalogues) == {'1.1', '1.2', '1.3'}
+    [request] = manager.requests
+    assert (request.market_ids, request.max_results, request.market_projection, request.locale) == (
+        ['1.2', '1.3'], 2, ['EVENT'], 'en')
+    store.fetch_missing(manager, ['1.1', '1.2', '1.3'])
+    assert len(manager.requests) == 1
+
+
+def test_fetch_missing_remembers_misses(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(ttl_cache.time, 'monotonic', lambda: now[0])
+    store = CatalogueStore(miss_ttl=60)
+    manager = FakeManager({'1.1'})
+    assert set(store.fetch_missing(manager, ['1.1', '1.2'])) == {'1.1'}
+    assert store.fetch_missing(manager, ['1.1', '1.2', '1.3']).keys() == {'1.1'}
+    assert [request.market_ids for request in manager.requests] == [['1.1', '1.2'], ['1.3']]
+    now[0] += 60
+    store.fetch_missing(manager, ['1.1', '1.2'])
+    assert manager.requests[-1].market_ids == ['1.2']
+
+
+def test_evict():
+    store = CatalogueStore()
+    store.put([catalogue('1.1'), catalogue('1.2', start_time='2020-01-02T12:00:00.000Z'), catalogue('1.3')])
+    assert store.evict_closed([{'marketId': '1.1', 'status': 'CLOSED'}, {'marketId': '1.2', 'status': 'OPEN'}]) == 1
+    assert store.evict_started_before(datetime(2020, 1, 2)) == 1
+    assert store.missing(['1.1', '1.2', '1.3']) == ['1.1', '1.3']
+    assert store.evict(['1.2', '1.4']) == 1
+    assert len(store) == 0
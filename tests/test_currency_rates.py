@@ -0,0 +1,53 @@
+import pytest
+
+from betfair_python_rest.caching import CurrencyRates
+from betfair_python_rest.caching import currency_rates
+
+
+class FakeAccountsManager:
+    def __init__(self):
+        self.calls = []
+
+    def list_currency_rates(self, from_currency='GBP'):
+        self.calls.append(from_currency)
+        return [{'currencyCode': 'EUR', 'rate': 1.2}, {'currencyCode': 'USD', 'rate': 1.25}]
+
+
+def test_rates_are_cached_until_next_hour(monkeypatch):
+    now = [7200.0 + 100]
+    monkeypatch.setattr(currency_rates.time, 'time', lambda: now[0])
+    manager = FakeAccountsManager()
+    rates = CurrencyRates(manager, refresh_delay=30)
+    assert rates.rate('EUR') == 1.2
+    assert rates.expires_at == 3 * 3600 + 30
+    now[0] = 3 * 3600 + 29
+    assert rates.convert(12.0, 'EUR', 'USD') == pytest.approx(12.5)
+    assert len(manager.calls) == 1
+    now[0] = 3 * 3600 + 30
+    rates.rate('GBP')
+    assert manager.calls == ['GBP', 'GBP']
+    with pytest.raises(ValueError, match='Unknown currency: XYZ'):
+        rates.rate('XYZ')
+
+
+def test_next_refresh_time():
+    rates = CurrencyRates(refresh_delay=30)
+    assert rates.next_refresh_time(3600 + 10) == 3600 + 30
+    assert rates.next_refresh_time(3600 + 30) == 7200 + 30
+
+
+def test_update_without_manager():
+    rates = CurrencyRates()
+    rates.update([{'currencyCode': 'EUR', 'rate': 1.2}])
+    assert rates.rates == {'GBP': 1.0, 'EUR': 1.2}
+    with pytest.raises(ValueError):
+        rates.update({'faultcode': 'Client'})
+
+
+def test_convert_array():
+    np = pytest.importorskip('numpy')
+    rates = CurrencyRates()
+    rates.update([{'currencyCode': 'EUR', 'rate': 1.2}, {'currencyCode': 'USD', 'rate': 1.25}])
+    converted = rates.convert_array(np.array([12.0, 10.0, 25.0]), ['EUR', 'GBP', 'USD'], 'GBP')
+    assert converted.tolist() == pytest.approx([10.0, 10.0, 20.0])
+    assert rates.convert_array([10.0], 'GBP', ['EUR']).tolist() == pytest.approx([12.0])
@@ -0,0 +1,79 @@
+import copy
+
+from betfair_python_rest.market_data.diff import MarketBookDiffer, runner_key
+from betfair_python_rest.models import MarketBook
+
+
+def market_book(back_price=2.5, lay_size=5.0, status='OPEN', runners=(11, 12), total_matched=100.0):
+    return {
+        'marketId': '1.1', 'status': status, 'totalMatched': total_matched,
+        'runners': [{'selectionId': selection_id, 'handicap': 0.0, 'status': 'ACTIVE',
+                     'ex': {'availableToBack': [{'price': back_price if selection_id == 11 else 4.0, 'size': 10.0}],
+                            'availableToLay': [{'price': 4.2 if selection_id == 12 else 2.52, 'size': lay_size}],
+                            'tradedVolume': []}}
+                    for selection_id in runners],
+    }
+
+
+def test_first_snapshot_is_new():
+    differ = MarketBookDiffer()
+    [change] = differ.update([market_book()])
+    assert change.is_new
+    assert change.changed == {'marketId', 'status', 'totalMatched'}
+    assert [runner.selection_id for runner in change.runners] == [11, 12]
+    assert all(runner.is_new for runner in change.runners)
+    assert 'availableToBack' in change.runners[0]
+    assert len(differ) == 1
+
+
+def test_same_snapshot_has_no_changes():
+    differ = MarketBookDiffer()
+    differ.update([market_book()])
+    assert differ.update([copy.deepcopy(market_book())]) == []
+
+
+def test_only_changed_runner_and_ladder():
+    differ = MarketBookDiffer()
+    differ.update([market_book()])
+    [change] = differ.update([market_book(back_price=2.52)])
+    assert not change.is_new
+    assert change.changed == frozenset()
+    [runner_change] = change.runners
+    assert (runner_change.selection_id, runner_change.handicap) == (11, 0.0)
+    assert runner_change.changed == {'availableToBack'}
+    assert runner_change.previous['ex']['availableToBack'][0]['price'] == 2.5
+    assert runner_change.runner['ex']['availableToBack'][0]['price'] == 2.52
+
+
+def test_market_keys_and_removed_runners():
+    differ = MarketBookDiffer()
+    differ.update([market_book()])
+    [change] = differ.update([market_book(status='SUSPENDED', runners=(11,), total_matched=150.0)])
+    assert change.changed == {'status', 'totalMatched'}
+    assert change.runners == []
+    assert change.removed_runners == [(12, 0.0)]
+    assert change.previous['status'] == 'OPEN'
+
+
+def test_added_runner_and_models():
+    differ = MarketBookDiffer()
+    differ.update([market_book(runners=(11,))])
+    [change] = differ.update([MarketBook.from_dict(market_book(lay_size=7.0))])
+    assert [(runner.selection_id, runner.is_new) for runner in change.runners] == [(11, False), (12, True)]
+    assert change.runners[0].changed == {'availableToLay'}
+
+
+def test_missing_markets_are_kept_until_forget():
+    differ = MarketBookDiffer()
+    differ.update([market_book()])
+    assert differ.update([]) == []
+    assert differ.get('1.1')['status'] == 'OPEN'
+    differ.forget('1.1')
+    assert differ.get('1.1') is None
+    [change] = differ.update([market_book()])
+    assert change.is_new
+
+
+def test_runner_key_of_handicap_markets():
+    assert runner_key({'selectionId': 1, 'handicap': -1.5}) == (1, -1.5)
+    assert runner_key({'selectionId': 1}) == (1, 0.0)
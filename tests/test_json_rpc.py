@@ -0,0 +1,27 @@
+from betfair_python_rest.managers.json_rpc import build_json_rpc_body, demultiplex_json_rpc_response
+
+
+def test_build_json_rpc_body():
+    body = build_json_rpc_body('SportsAPING/v1.0/', [('listEventTypes', {'filter': {}, 'locale': None}),
+                                                     ('listCurrentOrders', None)])
+    assert body == [
+        {'jsonrpc': '2.0', 'method': 'SportsAPING/v1.0/listEventTypes', 'params': {'filter': {}}, 'id': 0},
+        {'jsonrpc': '2.0', 'method': 'SportsAPING/v1.0/listCurrentOrders', 'params': {}, 'id': 1}]
+
+
+def test_demultiplex_in_order_of_calls():
+    response = [{'jsonrpc': '2.0', 'result': ['b'], 'id': 1}, {'jsonrpc': '2.0', 'result': ['a'], 'id': 0}]
+    assert demultiplex_json_rpc_response(response, 2) == [['a'], ['b']]
+
+
+def test_demultiplex_converts_errors_to_rest_format():
+    error = {'code': -32099, 'message': 'ANGX-0003',
+             'data': {'APINGException': {'errorCode': 'INVALID_SESSION_INFORMATION'}}}
+    response = [{'jsonrpc': '2.0', 'result': [], 'id': 0}, {'jsonrpc': '2.0', 'error': error, 'id': 1}]
+    assert demultiplex_json_rpc_response(response, 2) == [
+        [], {'faultstring': 'ANGX-0003', 'detail': {'APINGException': {'errorCode': 'INVALID_SESSION_INFORMATION'}}}]
+
+
+def test_demultiplex_error_of_whole_request():
+    response = {'jsonrpc': '2.0', 'error': {'code': -32700, 'message': 'Parse error'}}
+    assert demultiplex_json_rpc_response(response, 2) == [{'faultstring': 'Parse error', 'detail': {}}] * 2
@@ -0,0 +1,77 @@
+import pytest
+
+np = pytest.importorskip('numpy')
+
+from betfair_python_rest.market_data.ladders import (BACK, LAY, TRADED, ladder_array, market_book_ladders,
+                                                     MarketLadders)
+from betfair_python_rest.models import MarketBook
+
+MARKET_BOOK = {
+    'marketId': '1.1',
+    'runners': [
+        {'selectionId': 11, 'handicap': 0.0, 'lastPriceTraded': 2.5, 'totalMatched': 150.0,
+         'ex': {'availableToBack': [{'price': 2.5, 'size': 10.0}, {'price': 2.48, 'size': 20.0}],
+                'availableToLay': [{'price': 2.52, 'size': 5.0}, {'price': 2.54, 'size': 15.0},
+                                   {'price': 2.56, 'size': 1.0}],
+                'tradedVolume': [{'price': 2.5, 'size': 100.0}, {'price': 2.52, 'size': 50.0}]}},
+        {'selectionId': 12, 'handicap': 0.0,
+         'ex': {'availableToBack': [{'price': 4.0, 'size': 3.0}], 'availableToLay': [], 'tradedVolume': []}},
+    ],
+}
+
+
+def nan_equal(actual, expected):
+    return np.allclose(actual, expected, equal_nan=True)
+
+
+def test_ladder_array():
+    assert ladder_array([{'price': 2.5, 'size': 10.0}, {'price': 2.48, 'size': 20.0}]).tolist() == [
+        [2.5, 10.0], [2.48, 20.0]]
+    assert ladder_array(None).shape == (0, 2)
+
+
+def test_market_arrays_are_padded():
+    [market] = market_book_ladders([MARKET_BOOK])
+    assert market.market_id == '1.1'
+    assert market.selection_ids.tolist() == [11, 12]
+    assert nan_equal(market.back_prices, [[2.5, 2.48], [4.0, np.nan]])
+    assert market.back_sizes.tolist() == [[10.0, 20.0], [3.0, 0.0]]
+    assert nan_equal(market.lay_prices, [[2.52, 2.54, 2.56], [np.nan, np.nan, np.nan]])
+    assert nan_equal(market.last_price_traded, [2.5, np.nan])
+    assert nan_equal(market.total_matched, [150.0, np.nan])
+
+
+def test_best_and_spread():
+    [market] = market_book_ladders([MARKET_BOOK])
+    back_prices, back_sizes = market.best(BACK)
+    assert back_prices.tolist() == [2.5, 4.0]
+    assert back_sizes.tolist() == [10.0, 3.0]
+    lay_prices, lay_sizes = market.best(LAY)
+    assert nan_equal(lay_prices, [2.52, np.nan])
+    assert lay_sizes.tolist() == [5.0, 0.0]
+    assert nan_equal(market.spread(), [0.02, np.nan])
+
+
+def test_depth_and_vwap():
+    [market] = market_book_ladders([MARKET_BOOK])
+    assert market.depth(LAY).tolist() == [21.0, 0.0]
+    assert market.depth(LAY, levels=2).tolist() == [20.0, 0.0]
+    assert nan_equal(market.vwap(TRADED), [(2.5 * 100 + 2.52 * 50) / 150, np.nan])
+    assert nan_equal(market.vwap(BACK), [(2.5 * 10 + 2.48 * 20) / 30, 4.0])
+
+
+def test_liquidity():
+    [market] = market_book_ladders([MARKET_BOOK])
+    assert market.liquidity(BACK, 2.49).tolist() == [10.0, 3.0]
+    assert market.liquidity(LAY, 2.54).tolist() == [20.0, 0.0]
+    assert market.liquidity(BACK, [2.45, 5.0]).tolist() == [30.0, 0.0]
+    with pytest.raises(ValueError):
+        market.liquidity(TRADED, 2.5)
+
+
+def test_runner_index_and_models():
+    market = MarketLadders.from_market_book(MarketBook.from_dict(MARKET_BOOK))
+    assert market.runner_index(12) == 1
+    with pytest.raises(KeyError):
+        market.runner_index(13)
+    assert market.runners[0].lay[:, 1].tolist() == [5.0, 15.0, 1.0]
@@ -0,0 +1,125 @@
+import threading
+import time
+
+from betfair_python_rest.forms import ListMarketBookForm, ListMarketCatalogueForm, PlaceOrderForm, PlaceInstruction
+from betfair_python_rest.limits import (RateLimiter, TokenBucket, request_weight, price_data_weight, split_request,
+                                       merge_market_responses, markets_per_request)
+
+
+def market_ids(count):
+    return ['1.{}'.format(index) for index in range(count)]
+
+
+def test_price_data_weight():
+    assert price_data_weight(None) == 2
+    assert price_data_weight(['EX_BEST_OFFERS']) == 5
+    assert price_data_weight(['EX_BEST_OFFERS'], best_prices_depth=6) == 10
+    assert price_data_weight(['EX_BEST_OFFERS', 'EX_TRADED']) == 20
+    assert price_data_weight(['EX_ALL_OFFERS', 'EX_BEST_OFFERS', 'EX_TRADED']) == 32
+
+
+def test_request_weight():
+    assert request_weight('listMarketBook', ListMarketBookForm(market_ids=market_ids(40),
+                                                               price_data=['EX_BEST_OFFERS'])) == 200
+    assert request_weight('listMarketCatalogue', ListMarketCatalogueForm(
+        market_projection=['MARKET_DESCRIPTION', 'RUNNER_METADATA'], max_results=100)) == 200
+    assert request_weight('listCurrentOrders', None) == 0
+
+
+def test_weight_error():
+    rate_limiter = RateLimiter()
+    form = ListMarketBookForm(market_ids=market_ids(40), price_data=['EX_BEST_OFFERS'])
+    assert rate_limiter.weight_error('listMarketBook', form) is None
+    form.market_ids = market_ids(41)
+    error = rate_limiter.weight_error('listMarketBook', form)
+    assert error['detail']['APINGException']['errorCode'] == 'TOO_MUCH_DATA'
+
+
+def test_concurrency_limit():
+    rate_limiter = RateLimiter(concurrency_limits={'listCurrentOrders': 2})
+    lock = threading.Lock()
+    running = []
+    peak = []
+
+    def request():
+        with rate_limiter.acquire('listCurrentOrders', None):
+            with lock:
+                running.append(1)
+                peak.append(len(running))
+            time.sleep(0.02)
+            with lock:
+                running.pop()
+
+    threads = [threading.Thread(target=request) for _ in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert max(peak) == 2
+    assert rate_limiter.stats['listCurrentOrders']['calls'] == 6
+
+
+def test_market_book_without_projections_is_not_limited_by_concurrency():
+    rate_limiter = RateLimiter()
+    assert rate_limiter.concurrency_key('listMarketBook', ListMarketBookForm(market_ids=['1.1'])) is None
+    assert rate_limiter.concurrency_key('listMarketBook', ListMarketBookForm(
+        market_ids=['1.1'], order_projection='ALL')) == 'listMarketBook'
+
+
+def test_token_bucket():
+    bucket = TokenBucket(rate=10, capacity=2)
+    assert bucket.reserve() == 0
+    assert bucket.reserve() == 0
+    assert 0.05 < bucket.reserve() <= 0.1
+
+
+def test_instructions_are_transactions():
+    form = PlaceOrderForm(market_id='1.1', instructions=[PlaceInstruction(selection_id=1, order_type='LIMIT',
+                                                                          side='BACK')] * 3)
+    assert RateLimiter.transactions('placeOrders', form) == 3
+    assert RateLimiter.transactions('listMarketBook', None) == 1
+
+
+def test_markets_per_request():
+    assert markets_per_request(5) == 40
+    assert markets_per_request(17) == 11
+    assert markets_per_request(0) == 250
+    assert markets_per_request(300) == 1
+
+
+def test_split_request_by_weight():
+    form = ListMarketBookForm(market_ids=market_ids(100), price_data=['EX_BEST_OFFERS'])
+    chunks = split_request('listMarketBook', form)
+    assert [len(chunk.market_ids) for chunk in chunks] == [40, 40, 20]
+    assert [market_id for chunk in chunks for market_id in chunk.market_ids] == form.market_ids
+    assert all(chunk.price_data == ['EX_BEST_OFFERS'] for chunk in chunks)
+
+
+def test_split_request_within_limit():
+    form = ListMarketBookForm(market_ids=market_ids(10), price_data=['EX_BEST_OFFERS'])
+    assert split_request('listMarketBook', form) == [form]
+    assert split_request('listCurrentOrders', form) == [form]
+
+
+def test_split_catalogue_request():
+    form = ListMarketCatalogueForm(market_ids=market_ids(300), market_projection=['MARKET_DESCRIPTION'],
+                                   max_results=300)
+    chunks = split_request('listMarketCatalogue', form)
+    assert [(len(chunk.market_ids), chunk.max_results) for chunk in chunks] == [(200, 200), (100, 100)]
+
+
+def test_catalogue_request_cut_by_max_results_is_not_split():
+    form = ListMarketCatalogueForm(market_ids=market_ids(300), market_projection=['MARKET_DESCRIPTION'],
+                                   max_results=10)
+    assert split_request('listMarketCatalogue', form) == [form]
+
+
+def test_merge_market_responses_keeps_order_of_market_ids():
+    responses = [[{'marketId': '1.3'}, {'marketId': '1.1'}], [{'marketId': '1.2'}], []]
+    assert merge_market_responses(['1.1', '1.2', '1.3'], responses) == [
+        {'marketId': '1.1'}, {'marketId': '1.2'}, {'marketId': '1.3'}]
+
+
+def test_merge_market_responses_returns_error():
+    error = {'faultstring': 'x', 'detail': {'APINGException': {'errorCode': 'TOO_MUCH_DATA'}}}
+    assert merge_market_responses(['1.1', '1.2'], [[{'marketId': '1.1'}], error]) is error
@@ -0,0 +1,160 @@
+import time
+
+from betfair_python_rest.forms import ListMarketBookForm, ListMarketCatalogueForm, FrozenForm
+from betfair_python_rest.market_data import MarketCache, MarketPoller
+
+
+def catalogue(market_id, event_id='29000000', selection_ids=(11, 12)):
+    return {'marketId': market_id, 'marketName': 'Match Odds', 'event': {'id': event_id},
+            'runners': [{'selectionId': selection_id} for selection_id in selection_ids]}
+
+
+def book(market_id, back_price=2.5, status='OPEN'):
+    return {'marketId': market_id, 'status': status,
+            'runners': [{'selectionId': 11, 'handicap': 0.0, 'ex': {'availableToBack': [{'price': back_price,
+                                                                                         'size': 10.0}]}},
+                        {'selectionId': 12, 'handicap': 0.0}]}
+
+
+class FakeManager:
+    '''
+    The betting manager, which returns the books and catalogues of any requested markets
+    '''
+    log_mode = False
+
+    def __init__(self):
+        self.back_price = 2.5
+        self.catalogue_error = None
+        self.book_requests = []
+        self.book_forms = []
+        self.catalogue_requests = []
+
+    def list_market_book(self, form):
+        self.book_forms.append(form)
+        self.book_requests.append(list(form.market_ids))
+        return [book(market_id, self.back_price) for market_id in form.market_ids]
+
+    def list_market_catalogue(self, form):
+        self.catalogue_requests.append((list(form.market_ids), form.max_results))
+        if isinstance(self.catalogue_error, Exception):
+            raise self.catalogue_error
+        if self.catalogue_error is not None:
+            return self.catalogue_error
+        return [catalogue(market_id) for market_id in form.market_ids]
+
+
+def test_cache_indexes():
+    cache = MarketCache()
+    cache.update_catalogue([catalogue('1.1'), catalogue('1.2', event_id='29000001', selection_ids=(12, 13))])
+    cache.update_books([book('1.1')])
+    assert len(cache) == 2
+    assert [market.market_id for market in cache.markets_of_event('29000000')] == ['1.1']
+    assert sorted(market.market_id for market in cache.markets_of_selection(12)) == ['1.1', '1.2']
+    assert cache.runner('1.1', 11)['ex']['availableToBack'][0]['price'] == 2.5
+    assert cache.get('1.1').catalogue['marketName'] == 'Match Odds'
+    assert cache.get('1.1').status == 'OPEN'
+
+
+def test_unchanged_runners_are_shared():
+    cache = MarketCache()
+    cache.update_books([book('1.1')])
+    previous = cache.get('1.1')
+    [change] = cache.update_books([book('1.1', back_price=2.52)])
+    assert [runner.selection_id for runner in change.runners] == [11]
+    market = cache.get('1.1')
+    assert market.version == previous.version + 1
+    assert market.runner(12) is previous.runner(12)
+    assert previous.runner(11)['ex']['availableToBack'][0]['price'] == 2.5
+    assert cache.update_books([book('1.1', back_price=2.52)]) == []
+
+
+def test_evict_closed():
+    cache = MarketCache()
+    cache.update_catalogue([catalogue('1.1')])
+    cache.update_books([book('1.1', status='CLOSED'), book('1.2')])
+    assert cache.evict_closed() == ['1.1']
+    assert '1.1' not in cache
+    assert cache.markets_of_event('29000000') == []
+    assert list(cache.snapshot()) == ['1.2']
+
+
+def test_poll():
+    manager = FakeManager()
+    poller = MarketPoller(manager, book_form=ListMarketBookForm(market_ids=[], price_data=['EX_BEST_OFFERS']),
+                          catalogue_form=ListMarketCatalogueForm(market_projection=['EVENT']))
+    received = []
+    poller.add_listener(received.append)
+    poller.subscribe(['1.1', '1.2'])
+    assert len(poller.poll()) == 2
+    assert poller.poll() == []
+    manager.back_price = 2.52
+    assert len(poller.poll()) == 2
+    assert manager.catalogue_requests == [(['1.1', '1.2'], 2)]
+    assert manager.book_requests == [['1.1', '1.2']] * 3
+    assert poller.cache.get('1.1').catalogue['event']['id'] == '29000000'
+    assert len(received) == 2
+
+
+def test_poll_forms_are_split_frozen_and_kept():
+    manager = FakeManager()
+    poller = MarketPoller(manager, book_form=ListMarketBookForm(market_ids=[], price_data=['EX_BEST_OFFERS']))
+    market_ids = ['1.{}'.format(index) for index in range(100)]
+    poller.subscribe(market_ids)
+    assert len(poller.poll()) == 100
+    # EX_BEST_OFFERS weighs 5 points, so 40 markets fit the limit of 200 points
+    assert [len(request) for request in manager.book_requests] == [40, 40, 20]
+    assert sum(manager.book_requests, []) == market_ids
+    first_forms = manager.book_forms[:]
+    assert all(isinstance(form, FrozenForm) for form in first_forms)
+    poller.poll()
+    assert all(form is first_form for form, first_form in zip(manager.book_forms[3:], first_forms))
+    poller.subscribe(['1.100'])
+    poller.poll()
+    assert manager.book_forms[-1] is not first_forms[-1]
+    assert [len(request) for request in manager.book_requests[-3:]] == [40, 40, 21]
+    poller.book_form = ListMarketBookForm(market_ids=[], price_data=['EX_ALL_OFFERS'])
+    poller.poll()
+    assert manager.book_forms[-1].price_data == ('EX_ALL_OFFERS',)
+
+
+def test_unsubscribe_is_counted():
+    manager = FakeManager()
+    poller = MarketPoller(manager)
+    poller.subscribe(['1.1', '1.2'])
+    poller.subscribe(['1.1'])
+    poller.unsubscribe(['1.1', '1.2'])
+    assert poller.market_ids == ['1.1']
+    poller.unsubscribe(['1.1'])
+    assert poller.poll() == []
+    assert manager.book_requests == []
+
+
+def test_catalogue_error_does_not_stop_poll():
+    manager = FakeManager()
+    poller = MarketPoller(manager, catalogue_form=ListMarketCatalogueForm(market_projection=['EVENT']))
+    poller.subscribe(['1.1'])
+    manager.catalogue_error = {'faultcode': 'Client', 'faultstring': 'ANGX-0001',
+                               'detail': {'APINGException': {'errorCode': 'TOO_MANY_REQUESTS'}}}
+    assert len(poller.poll()) == 1
+    manager.catalogue_error = ConnectionError('connection reset')
+    assert poller.poll() == []
+    assert manager.book_requests == [['1.1'], ['1.1']]
+    assert poller.cache.get('1.1').catalogue is None
+    # The failed catalogues are requested again
+    manager.catalogue_error = None
+    poller.poll()
+    assert len(manager.catalogue_requests) == 3
+    assert poller.cache.get('1.1').catalogue is not None
+
+
+def test_background_thread():
+    manager = FakeManager()
+    poller = MarketPoller(manager, interval=0.01)
+    poller.subscribe(['1.1'])
+    poller.start()
+    deadline = time.monotonic() + 5
+    while len(manager.book_requests) < 3 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    poller.stop()
+    assert len(manager.book_requests) >= 3
+    assert '1.1' in poller.cache
@@ -0,0 +1,66 @@
+import copy
+
+from betfair_python_rest.models import (MarketBook, Runner, PriceSize, CurrentOrderSummaryReport,
+                                        PlaceExecutionReport)
+
+MARKET_BOOK = {
+    'marketId': '1.1', 'isMarketDataDelayed': False, 'status': 'OPEN', 'betDelay': 0, 'inplay': False,
+    'numberOfRunners': 2, 'totalMatched': 1520.5, 'version': 42, 'newFlag': 'unknown key',
+    'runners': [
+        {'selectionId': 11, 'handicap': 0.0, 'status': 'ACTIVE', 'lastPriceTraded': 2.5,
+         'ex': {'availableToBack': [{'price': 2.5, 'size': 10.0}, {'price': 2.48, 'size': 20.0}],
+                'availableToLay': [{'price': 2.52, 'size': 5.5}],
+                'tradedVolume': []},
+         'sp': {'nearPrice': 2.4, 'backStakeTaken': [{'price': 2.4, 'size': 2.0}]},
+         'orders': [{'betId': '100', 'side': 'BACK', 'price': 2.5, 'size': 2.0, 'sizeMatched': 1.0}]},
+        {'selectionId': 12, 'handicap': 0.0, 'status': 'REMOVED', 'removalDate': '2020-01-01T10:00:00.000Z',
+         'ex': {'availableToBack': [{'price': 1.5, 'size': 1.0, 'extraLevelKey': 1}]}},
+    ],
+}
+
+
+def test_dict_round_trip():
+    market_book = MarketBook.from_dict(copy.deepcopy(MARKET_BOOK))
+    assert market_book.to_dict() == MARKET_BOOK
+    assert MarketBook.from_dict(market_book.to_dict()) == market_book
+
+
+def test_nested_models():
+    market_book = MarketBook.from_dict(MARKET_BOOK)
+    runner = market_book.runners[0]
+    assert isinstance(runner, Runner)
+    assert runner.ex.available_to_back[0].price == 2.5
+    assert runner.ex.available_to_lay[0] == PriceSize(2.52, 5.5)
+    assert runner.sp.back_stake_taken[0].size == 2.0
+    assert runner.orders[0].bet_id == '100'
+    assert runner.orders[0].size_matched == 1.0
+    assert runner.matches is None
+    assert market_book.runners[1].removal_date == '2020-01-01T10:00:00.000Z'
+
+
+def test_unknown_keys_are_kept_in_extra():
+    market_book = MarketBook.from_dict(MARKET_BOOK)
+    assert market_book.extra == {'newFlag': 'unknown key'}
+    assert market_book.runners[0].extra is None
+    level = market_book.runners[1].ex.available_to_back[0]
+    assert (level.price, level.size, level.extra) == (1.5, 1.0, {'extraLevelKey': 1})
+
+
+def test_models_have_no_dict():
+    market_book = MarketBook.from_dict(MARKET_BOOK)
+    for model in (market_book, market_book.runners[0], market_book.runners[0].ex.available_to_back[0]):
+        assert not hasattr(model, '__dict__')
+
+
+def test_order_reports():
+    report = CurrentOrderSummaryReport.from_dict({
+        'currentOrders': [{'betId': '1', 'priceSize': {'price': 3.0, 'size': 4.0}, 'side': 'LAY'}],
+        'moreAvailable': False})
+    assert report.current_orders[0].price_size.price == 3.0
+    assert report.more_available is False
+    execution_report = PlaceExecutionReport.from_dict({
+        'status': 'SUCCESS', 'marketId': '1.1',
+        'instructionReports': [{'status': 'SUCCESS', 'betId': '7', 'sizeMatched': 0.0}]})
+    assert execution_report.instruction_reports[0].bet_id == '7'
+    assert execution_report.to_dict()['instructionReports'] == [{'status': 'SUCCESS', 'betId': '7',
+                                                                 'sizeMatched': 0.0}]
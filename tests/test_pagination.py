@@ -0,0 +1,110 @@
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import threading
+import time
+
+import pytest
+
+from betfair_python_rest.api_exceptions.base_exception import BetFairAPIManagerException
+from betfair_python_rest.managers.base_api_manager import BaseAPIManager
+from betfair_python_rest.managers.pagination import PagesPrefetcher, iterate_pages, aiterate_pages
+
+
+class Pages:
+    '''
+    The server with records_count records, which returns page_size records from from_record
+    '''
+
+    def __init__(self, records_count, page_size, always_more=False):
+        self.records = list(range(records_count))
+        self.page_size = page_size
+        self.always_more = always_more
+        self.requested = []
+        self.lock = threading.Lock()
+
+    def __call__(self, from_record):
+        with self.lock:
+            self.requested.append(from_record)
+        page = self.records[from_record:from_record + self.page_size]
+        return {'currentOrders': page,
+                'moreAvailable': self.always_more or from_record + self.page_size < len(self.records)}
+
+    async def fetch(self, from_record):
+        await asyncio.sleep(0)
+        return self(from_record)
+
+
+def prefetcher(pages, from_record=0, look_ahead=0):
+    return PagesPrefetcher(pages, 'currentOrders', pages.page_size, from_record, look_ahead,
+                           BaseAPIManager._get_error_code)
+
+
+def test_iteration_stops_when_more_is_not_available():
+    pages = Pages(7, 3)
+    assert list(iterate_pages(prefetcher(pages))) == list(range(7))
+    assert pages.requested == [0, 3, 6]
+
+
+def test_iteration_stops_on_empty_page():
+    # moreAvailable of the last page is true, but the next page is empty
+    pages = Pages(6, 3, always_more=True)
+    assert list(iterate_pages(prefetcher(pages))) == list(range(6))
+    assert pages.requested == [0, 3, 6]
+
+
+def test_from_record_offsets():
+    pages = Pages(10, 4)
+    assert list(iterate_pages(prefetcher(pages, from_record=3))) == list(range(3, 10))
+    assert pages.requested == [3, 7]
+
+
+def test_look_ahead_requests_next_pages_in_background():
+    pages = Pages(20, 2)
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        assert list(iterate_pages(prefetcher(pages, look_ahead=2), executor)) == list(range(20))
+    # The pages after the last one can be requested in advance, but not more than look_ahead of them
+    assert sorted(pages.requested)[:10] == list(range(0, 20, 2))
+    assert len(pages.requested) <= 12
+
+
+def test_look_ahead_is_bounded():
+    pages = Pages(100, 1)
+    release = threading.Event()
+    started = []
+
+    def fetch(from_record):
+        started.append(from_record)
+        if from_record > 0:
+            release.wait(1)
+        return pages(from_record)
+
+    with ThreadPoolExecutor(max_workers=10) as executor:
+        records = iterate_pages(PagesPrefetcher(fetch, 'currentOrders', 1, 0, 3, BaseAPIManager._get_error_code),
+                                executor)
+        assert next(records) == 0
+        deadline = time.monotonic() + 5
+        while len(started) < 4 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        time.sleep(0.05)
+        assert sorted(started) == [0, 1, 2, 3]
+        release.set()
+        records.close()
+
+
+def test_error_page_raises():
+    def fetch(from_record):
+        return {'detail': {'APINGException': {'errorCode': 'TOO_MANY_REQUESTS'}}}
+
+    with pytest.raises(BetFairAPIManagerException):
+        list(iterate_pages(PagesPrefetcher(fetch, 'currentOrders', 10, 0, 0, BaseAPIManager._get_error_code)))
+
+
+def test_async_iteration():
+    async def main():
+        pages = Pages(7, 2)
+        records = [record async for record in aiterate_pages(PagesPrefetcher(
+            pages.fetch, 'currentOrders', 2, 1, 1, BaseAPIManager._get_error_code))]
+        assert records == list(range(1, 7))
+        assert sorted(pages.requested)[:3] == [1, 3, 5]
+
+    asyncio.run(main())
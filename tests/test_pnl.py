@@ -0,0 +1,77 @@
+import pytest
+
+pytest.importorskip('numpy')
+
+from betfair_python_rest.trading import PositionBook
+
+
+def make_position_book(commission=0.0):
+    '''
+    Market 1.1 (runners 10, 20 and 30 without bets):
+    back 10 @ 3.0 on 10: +20 / -10, back 4 @ 2.5 on 10: +6 / -4, lay 5 @ 4.0 on 20: -15 / +5.
+    If 10 wins: 20 + 6 + 5 = 31, if 20 wins: -10 - 4 - 15 = -29, if 30 wins: -10 - 4 + 5 = -9.
+    Market 1.2: back 2 @ 1.5 on 10: +1 / -2
+    '''
+    positions = PositionBook(commission=commission)
+    positions.add_current_orders({'currentOrders': [
+        {'betId': '1', 'marketId': '1.1', 'selectionId': 10, 'handicap': 0.0, 'side': 'BACK',
+         'sizeMatched': 10.0, 'averagePriceMatched': 3.0},
+        {'betId': '2', 'marketId': '1.1', 'selectionId': 20, 'handicap': 0.0, 'side': 'LAY',
+         'sizeMatched': 5.0, 'averagePriceMatched': 4.0},
+    ]})
+    positions.add_place_report({'marketId': '1.1', 'status': 'SUCCESS', 'instructionReports': [
+        {'status': 'SUCCESS', 'betId': '3', 'sizeMatched': 4.0, 'averagePriceMatched': 2.5,
+         'instruction': {'selectionId': 10, 'handicap': 0.0, 'side': 'BACK'}},
+        {'status': 'FAILURE', 'errorCode': 'INVALID_ODDS',
+         'instruction': {'selectionId': 30, 'handicap': 0.0, 'side': 'BACK'}},
+    ]})
+    positions.add_bet('4', '1.2', 10, 0.0, 'BACK', 2.0, 1.5)
+    return positions
+
+
+def test_back_and_lay_position():
+    profit_and_loss = make_position_book().calculate()
+    assert profit_and_loss.market_ids == ['1.1', '1.2']
+    assert list(zip(profit_and_loss.runner_market_ids, profit_and_loss.selection_ids)) == [
+        ('1.1', 10), ('1.1', 20), ('1.2', 10)]
+    assert profit_and_loss.if_win.tolist() == pytest.approx([31.0, -29.0, 1.0])
+    assert profit_and_loss.if_lose.tolist() == pytest.approx([-14.0, 5.0, -2.0])
+    assert profit_and_loss.if_other_wins.tolist() == pytest.approx([-9.0, -2.0])
+    assert profit_and_loss.exposure('1.1') == pytest.approx(-29.0)
+    assert profit_and_loss.exposure('1.3') == 0.0
+    assert profit_and_loss.total_exposure == pytest.approx(-31.0)
+    assert profit_and_loss.to_response() == [
+        {'marketId': '1.1', 'profitAndLosses': [{'selectionId': 10, 'ifWin': 31.0, 'ifLose': -14.0},
+                                                {'selectionId': 20, 'ifWin': -29.0, 'ifLose': 5.0}]},
+        {'marketId': '1.2', 'profitAndLosses': [{'selectionId': 10, 'ifWin': 1.0, 'ifLose': -2.0}]}]
+
+
+def test_commission_is_taken_from_profit():
+    profit_and_loss = make_position_book(commission=0.1).calculate(['1.1'])
+    assert profit_and_loss.market_ids == ['1.1']
+    assert profit_and_loss.if_win.tolist() == pytest.approx([27.9, -29.0])
+
+
+def test_bet_is_replaced_and_removed():
+    positions = make_position_book()
+    # The bet is matched more: the response has the total matched size
+    positions.add_bet('2', '1.1', 20, 0.0, 'LAY', 10.0, 4.0)
+    assert positions.calculate(['1.1']).if_win.tolist() == pytest.approx([36.0, -44.0])
+    positions.add_bet('2', '1.1', 20, 0.0, 'LAY', 0.0, 0.0)
+    assert len(positions) == 3
+    positions.remove_market('1.2')
+    assert positions.calculate().market_ids == ['1.1']
+
+
+def test_reconcile():
+    positions = make_position_book()
+    response = [{'marketId': '1.1', 'profitAndLosses': [{'selectionId': 10, 'ifWin': 31.0},
+                                                        {'selectionId': 20, 'ifWin': -29.0},
+                                                        {'selectionId': 30, 'ifWin': -9.0}]},
+                {'marketId': '1.2', 'profitAndLosses': [{'selectionId': 10, 'ifWin': 1.5}]}]
+    assert positions.reconcile(response) == [('1.2', 10, 1.0, 1.5)]
+    assert positions.reconcile(response[:1]) == []
+    assert positions.reconcile([{'marketId': '1.1', 'profitAndLosses': []}]) == [
+        ('1.1', 10, 31.0, None), ('1.1', 20, -29.0, None)]
+    with pytest.raises(ValueError):
+        positions.reconcile({'faultcode': 'Client'})
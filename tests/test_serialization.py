@@ -0,0 +1,174 @@
+from dataclasses import FrozenInstanceError, replace
+from datetime import datetime
+
+import pytest
+
+from betfair_python_rest.forms import (
+    MarketFilterAndLocaleForm, MarketFilterAndTimeGranularityForm, ListMarketCatalogueForm,
+    ListMarketBookForm, ListRunnerBookForm, ListMarketProfitAndLossForm, ListCurrentOrdersForm,
+    ListClearedOrdersForm, PlaceOrderForm, CancelOrdersForm, ReplaceOrdersForm, UpdateOrdersForm,
+    PlaceInstruction, LimitOrder, LimitOrderOnClose, CancelInstruction, ReplaceInstruction,
+    UpdateInstruction, freeze)
+from betfair_python_rest.serialization import serialize_form, prune_empty, JSONBackend
+
+FROM_DATE, TO_DATE = datetime(2020, 1, 1), datetime(2020, 2, 1)
+
+MARKET_FILTER = dict(
+    text_query='q', event_type_ids=['1'], event_ids=['2'], competitions_ids=['3'], market_ids=['1.1'],
+    venues=['v'], bsp_only=False, in_play_enabled=True, in_play_only=False, market_betting_types=['ODDS'],
+    market_countries=['GB'], market_type_codes=['WIN'], market_start_time=FROM_DATE,
+    with_orders=['EXECUTABLE'], race_types=['Flat'])
+MARKET_FILTER_DATA = {
+    'textQuery': 'q', 'eventTypeIds': ['1'], 'eventIds': ['2'], 'competitionIds': ['3'], 'marketIds': ['1.1'],
+    'venues': ['v'], 'bspOnly': False, 'turnInPlayEnabled': True, 'inPlayOnly': False,
+    'marketBettingTypes': ['ODDS'], 'marketCountries': ['GB'], 'marketTypeCodes': ['WIN'],
+    'marketStartTime': FROM_DATE, 'withOrders': ['EXECUTABLE'], 'raceTypes': ['Flat']}
+
+BOOK = dict(
+    price_data=['EX_BEST_OFFERS'], best_prices_depth=3, rollup_model='STAKE', rollup_limit=0,
+    rollup_liability_threshold=1.5, rollup_liability_factor=2, virtualise=True, rollover_stakes=False,
+    order_projection='ALL', match_projection='ROLLED_UP_BY_PRICE', include_overall_position=False,
+    partition_matched_by_strategy_ref=True, customer_strategy_refs=['s'], currency_code='EUR', locale='en',
+    matched_since=TO_DATE, bet_ids=['b'])
+BOOK_DATA = {
+    'priceProjection': {'priceData': ['EX_BEST_OFFERS'], 'virtualise': True, 'rolloverStakes': False,
+                        'exBestOffersOverrides': {'bestPricesDepth': 3, 'rollupModel': 'STAKE', 'rollupLimit': 0,
+                                                  'rollupLiabilityThreshold': 1.5, 'rollupLiabilityFactor': 2}},
+    'orderProjection': 'ALL', 'matchProjection': 'ROLLED_UP_BY_PRICE', 'includeOverallPosition': False,
+    'partitionMatchedByStrategyRef': True, 'customerStrategyRefs': ['s'], 'currencyCode': 'EUR', 'locale': 'en',
+    'matchedSince': TO_DATE, 'betIds': ['b']}
+
+
+def place_instructions():
+    limit_order = LimitOrder(size=2, price=1.5, persistence_type='LAPSE', min_fill_size=0, bet_target_type='X',
+                             bet_target_size=3.0)
+    return [PlaceInstruction(selection_id=1, order_type='LIMIT', side='BACK', handicap=0, limit_order=limit_order,
+                             customer_order_ref='r1'),
+            PlaceInstruction(selection_id=9, order_type='MARKET_ON_CLOSE', side='LAY',
+                             market_on_close_order_liability=5,
+                             limit_on_close_order=LimitOrderOnClose(selection_id=1, liability=2, price=3))]
+
+
+PLACE_INSTRUCTIONS_DATA = [
+    {'orderType': 'LIMIT', 'selectionId': 1, 'side': 'BACK', 'handicap': 0, 'customerOrderRef': 'r1',
+     'limitOrder': {'size': 2, 'price': 1.5, 'persistenceType': 'LAPSE', 'minFillSize': 0, 'betTargetType': 'X',
+                    'betTargetSize': 3.0}},
+    {'orderType': 'MARKET_ON_CLOSE', 'selectionId': 9, 'side': 'LAY', 'marketOnCloseOrder': {'liability': 5},
+     'limitOnCloseOrder': {'liability': 2, 'price': 3}}]
+
+# The data of the hand-written data properties (pruned by prune_empty), which the generated serializers replaced
+CASES = [
+    (lambda: MarketFilterAndLocaleForm(), {'filter': {}}),
+    (lambda: MarketFilterAndLocaleForm(locale='ru', **MARKET_FILTER), {'filter': MARKET_FILTER_DATA, 'locale': 'ru'}),
+    (lambda: MarketFilterAndTimeGranularityForm(time_granularity='DAYS'), {'filter': {}, 'granularity': 'DAYS'}),
+    (lambda: ListMarketCatalogueForm(), {'filter': {}, 'maxResults': 500}),
+    (lambda: ListMarketCatalogueForm(market_projection=['EVENT'], market_sort='FIRST_TO_START', max_results=10,
+                                     locale='en', **MARKET_FILTER),
+     {'filter': MARKET_FILTER_DATA, 'locale': 'en', 'marketProjection': ['EVENT'], 'maxResults': 10,
+      'sort': 'FIRST_TO_START'}),
+    (lambda: ListMarketBookForm(market_ids=['1.1']), {'marketIds': ['1.1']}),
+    (lambda: ListMarketBookForm(market_ids=['1.1'], **BOOK), dict(BOOK_DATA, marketIds=['1.1'])),
+    (lambda: ListRunnerBookForm(market_id='1.1', selection_id=5), {'marketId': '1.1', 'selectionId': 5}),
+    (lambda: ListRunnerBookForm(market_id='1.1', selection_id=5, handicap=0.5, **BOOK),
+     dict(BOOK_DATA, marketId='1.1', selectionId=5, handicap=0.5)),
+    (lambda: ListMarketProfitAndLossForm(market_ids=['1'], include_settle_bets=True, include_bsp_bets=False,
+                                         net_of_commission=True),
+     {'marketIds': ['1'], 'includeSettledBets': True, 'includeBspBets': False, 'netOfCommission': True}),
+    (lambda: ListCurrentOrdersForm(), {}),
+    (lambda: ListCurrentOrdersForm(bet_ids=['1'], market_ids=['2'], order_projection='ALL', customer_order_refs=['c'],
+                                   customer_strategy_refs=['s'], order_by='BY_BET', sort_dir='EARLIEST_TO_LATEST',
+                                   from_record=0, record_count=10),
+     {'betIds': ['1'], 'marketIds': ['2'], 'orderProjection': 'ALL', 'customerOrderRefs': ['c'],
+      'customerStrategyRefs': ['s'], 'orderBy': 'BY_BET', 'sortDir': 'EARLIEST_TO_LATEST', 'fromRecord': 0,
+      'recordCount': 10}),
+    (lambda: ListClearedOrdersForm(bet_status='SETTLED', from_date=None, to_date=None), {'betStatus': 'SETTLED'}),
+    (lambda: ListClearedOrdersForm(bet_status='SETTLED', from_date=FROM_DATE, to_date=TO_DATE, event_type_ids=['1'],
+                                   event_ids=['2'], market_ids=['3'], runner_ids=[4], bet_ids=['5'], side='BACK',
+                                   group_by='MARKET', locale='en', include_item_description=True, from_record=0,
+                                   record_count=5),
+     {'betStatus': 'SETTLED', 'settledDateRange': {'from': FROM_DATE, 'to': TO_DATE}, 'eventTypeIds': ['1'],
+      'eventIds': ['2'], 'marketIds': ['3'], 'runnerIds': [4], 'betIds': ['5'], 'side': 'BACK', 'groupBy': 'MARKET',
+      'locale': 'en', 'includeItemDescription': True, 'fromRecord': 0, 'recordCount': 5}),
+    (lambda: PlaceOrderForm(market_id='1.1', instructions=place_instructions()),
+     {'marketId': '1.1', 'instructions': PLACE_INSTRUCTIONS_DATA}),
+    (lambda: PlaceOrderForm(market_id='1.1', instructions=place_instructions(), customer_ref='x', market_version=3,
+                            customer_strategy_refs='s', is_async=False),
+     {'marketId': '1.1', 'instructions': PLACE_INSTRUCTIONS_DATA, 'customerRef': 'x', 'marketVersion': {'version': 3},
+      'customerStrategyRef': 's', 'async': False}),
+    (lambda: PlaceOrderForm(market_id='1.1', instructions=[]), {'marketId': '1.1'}),
+    (lambda: CancelOrdersForm(), None),
+    (lambda: CancelOrdersForm(market_id='1.1', customer_ref='c',
+                              instructions=[CancelInstruction(bet_id='1'),
+                                            CancelInstruction(bet_id='2', size_reduction=1.0)]),
+     {'marketId': '1.1', 'customerRef': 'c', 'instructions': [{'betId': '1'}, {'betId': '2', 'sizeReduction': 1.0}]}),
+    (lambda: ReplaceOrdersForm(market_id='1', instructions=None), None),
+    (lambda: ReplaceOrdersForm(market_id='1', instructions=[ReplaceInstruction(bet_id='1', new_price=2.0)],
+                               market_version=1, is_async=True, customer_ref='r'),
+     {'marketId': '1', 'instructions': [{'betId': '1', 'newPrice': 2.0}], 'marketVersion': {'version': 1},
+      'async': True, 'customerRef': 'r'}),
+    (lambda: UpdateOrdersForm(market_id='1', instructions=None), None),
+    (lambda: UpdateOrdersForm(market_id='1', customer_ref='r',
+                              instructions=[UpdateInstruction(bet_id='1', new_persistence_type='PERSIST')]),
+     {'marketId': '1', 'customerRef': 'r', 'instructions': [{'betId': '1', 'newPersistenceType': 'PERSIST'}]}),
+]
+
+
+@pytest.mark.parametrize('make_form, expected', CASES)
+def test_form_data(make_form, expected):
+    form = make_form()
+    assert serialize_form(form) == expected
+    assert form.data == expected
+
+
+
+@pytest.mark.parametrize('make_form, expected', CASES)
+def test_frozen_form_body(make_form, expected):
+    # The frozen form keeps the lists as tuples, so the decoded bodies are compared
+    json_backend = JSONBackend()
+    body = freeze(make_form()).encode(json_backend)
+    assert json_backend.loads(body) == json_backend.loads(json_backend.dumps(expected if expected is not None else {}))
+
+
+def test_frozen_form_canonical_key():
+    form = ListMarketBookForm(market_ids=['1.1', '1.2'], **BOOK)
+    assert freeze(form).canonical_key('listMarketBook') == freeze(form).canonical_key('listMarketBook')
+    assert freeze(form).canonical_key('listMarketBook') != freeze(ListMarketBookForm(
+        market_ids=['1.1'], **BOOK)).canonical_key('listMarketBook')
+
+
+def test_frozen_form_is_immutable():
+    form = freeze(ListMarketBookForm(market_ids=['1.1'], price_data=['EX_BEST_OFFERS']))
+    assert freeze(form) is form
+    assert isinstance(form, ListMarketBookForm) and form.market_ids == ('1.1',)
+    with pytest.raises(FrozenInstanceError):
+        form.market_ids = ['1.2']
+    other_form = replace(form, market_ids=['1.2'])
+    assert type(other_form) is type(form)
+    assert other_form.data == {'marketIds': ('1.2',), 'priceProjection': {'priceData': ('EX_BEST_OFFERS',)}}
+
+
+def test_prune_empty_removes_none_and_empty_values():
+    data = {'marketIds': ['1.1'], 'locale': None, 'betIds': [], 'priceProjection': {'priceData': None},
+            'instructions': [{'betId': '1', 'sizeReduction': None}, None]}
+    assert prune_empty(data) == {'marketIds': ['1.1'], 'instructions': [{'betId': '1'}]}
+
+
+def test_prune_empty_keeps_zero_false_and_filter():
+    data = {'filter': {'textQuery': None}, 'fromRecord': 0, 'inPlayOnly': False, 'textQuery': ''}
+    assert prune_empty(data) == {'filter': {}, 'fromRecord': 0, 'inPlayOnly': False}
+
+
+def test_json_backend_dumps_compact_body():
+    body = JSONBackend().dumps({'marketIds': ['1.1'], 'from': datetime(2020, 1, 2, 3, 4)})
+    assert body == '{"marketIds":["1.1"],"from":"2020-01-02T03:04:00"}'
+
+
+def test_grouped_data_keys():
+    from betfair_python_rest.serialization.compiled import data_keys_of
+    keys = data_keys_of(ListMarketBookForm)
+    assert keys['market_ids'] == ('marketIds',)
+    assert keys['price_data'] == ('priceProjection', 'priceData')
+    assert keys['rollup_model'] == ('priceProjection', 'exBestOffersOverrides', 'rollupModel')
+    assert 'ex_best_offers_overrides' not in keys
+    assert data_keys_of(MarketFilterAndLocaleForm)['in_play_enabled'] == ('filter', 'turnInPlayEnabled')
+    assert data_keys_of(ListClearedOrdersForm)['from_date'] == ('settledDateRange', 'from')
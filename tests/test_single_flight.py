@@ -0,0 +1,110 @@
+import asyncio
+import json
+import threading
+import time
+
+import pytest
+
+from betfair_python_rest.caching import (SingleFlight, AsyncSingleFlight, READ_OPERATIONS, ORDER_READ_OPERATIONS,
+                                        ACCOUNT_READ_OPERATIONS)
+from betfair_python_rest.forms import ListMarketBookForm
+from betfair_python_rest.managers import BetFairAPIManagerBetting
+
+
+def test_single_flight_shares_one_call():
+    single_flight = SingleFlight()
+    calls = []
+
+    def request():
+        calls.append(1)
+        time.sleep(0.1)
+        return 'result'
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(single_flight.do(('listMarketBook', 'k'), request)))
+               for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert results == ['result'] * 5
+    assert len(calls) == 1
+    assert single_flight.stats == {'listMarketBook': {'calls': 5, 'coalesced': 4}}
+
+
+def test_single_flight_shares_exception():
+    single_flight = SingleFlight()
+
+    def request():
+        raise ValueError('failed')
+
+    with pytest.raises(ValueError):
+        single_flight.do(('listMarketBook', 'k'), request)
+    assert single_flight.do(('listMarketBook', 'k'), lambda: 'next') == 'next'
+
+
+def test_async_waiters_survive_cancelled_first_caller():
+    async def main():
+        single_flight = AsyncSingleFlight()
+        calls = []
+
+        async def request():
+            calls.append(1)
+            await asyncio.sleep(0.05)
+            return 'result'
+
+        first = asyncio.ensure_future(single_flight.do(('listMarketBook', 'k'), request))
+        await asyncio.sleep(0)
+        waiters = [asyncio.ensure_future(single_flight.do(('listMarketBook', 'k'), request)) for _ in range(3)]
+        await asyncio.sleep(0.01)
+        first.cancel()
+        assert await asyncio.gather(*waiters) == ['result'] * 3
+        assert first.cancelled()
+        assert len(calls) == 1
+        await asyncio.sleep(0)
+        assert not single_flight._flights
+
+    asyncio.run(main())
+
+
+def test_coalesced_operations():
+    single_flight = SingleFlight()
+    assert single_flight.is_coalesced('listMarketBook') and single_flight.is_coalesced('listEventTypes')
+    for operation in ('placeOrders', 'cancelOrders', 'listCurrentOrders', 'getAccountFunds'):
+        assert not single_flight.is_coalesced(operation)
+    single_flight = SingleFlight(READ_OPERATIONS + ORDER_READ_OPERATIONS + ACCOUNT_READ_OPERATIONS)
+    assert single_flight.is_coalesced('listCurrentOrders') and single_flight.is_coalesced('getAccountFunds')
+    assert not single_flight.is_coalesced('placeOrders')
+
+
+class FakeResponse:
+    def __init__(self, body):
+        self.content = json.dumps(body).encode()
+
+
+class SlowSession:
+    def __init__(self):
+        self.operations = []
+        self.headers = {}
+
+    def post(self, url, data=None, **kwargs):
+        self.operations.append(url.rstrip('/').rsplit('/', 1)[-1])
+        time.sleep(0.1)
+        return FakeResponse([{'marketId': market_id} for market_id in json.loads(data)['marketIds']])
+
+
+def test_manager_coalesces_concurrent_requests():
+    manager = BetFairAPIManagerBetting('login', 'password', 'api_key', session_token='token',
+                                       single_flight=SingleFlight())
+    manager.session = SlowSession()
+    results = []
+    threads = [threading.Thread(target=lambda market_ids=market_ids: results.append(
+        manager.list_market_book(ListMarketBookForm(market_ids=market_ids))))
+        for market_ids in (['1.1'], ['1.1'], ['1.1'], ['1.2'])]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert sorted(result[0]['marketId'] for result in results) == ['1.1', '1.1', '1.1', '1.2']
+    assert manager.session.operations == ['listMarketBook', 'listMarketBook']
+    assert manager.single_flight.stats == {'listMarketBook': {'calls': 4, 'coalesced': 2}}
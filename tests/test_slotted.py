@@ -0,0 +1,68 @@
+from dataclasses import dataclass, fields, replace
+import pickle
+
+import pytest
+
+from betfair_python_rest.forms import (PlaceInstruction, LimitOrder, LimitOrderOnClose, CancelInstruction,
+                                       ReplaceInstruction, UpdateInstruction)
+from betfair_python_rest.forms.abstract_forms.base import BaseForm
+from betfair_python_rest.forms.abstract_forms.slotted import slotted
+
+
+@slotted
+@dataclass
+class Order(BaseForm):
+    size: float
+    price: float = 2.0
+
+
+@slotted
+@dataclass
+class PersistentOrder(Order):
+    persistence_type: str = 'LAPSE'
+
+
+def test_slots_and_defaults():
+    order = PersistentOrder(size=5)
+    assert PersistentOrder.__slots__ == ('persistence_type',)
+    assert not hasattr(order, '__dict__')
+    assert (order.size, order.price, order.persistence_type) == (5, 2.0, 'LAPSE')
+    assert [field.name for field in fields(order)] == ['size', 'price', 'persistence_type']
+    assert isinstance(order, Order) and PersistentOrder.__qualname__ == 'PersistentOrder'
+    with pytest.raises(AttributeError):
+        order.other = 1
+
+
+def test_replace_round_trip():
+    order = PersistentOrder(size=5, price=3.0)
+    other = replace(order, price=3.5)
+    assert type(other) is PersistentOrder
+    assert (other.size, other.price, other.persistence_type) == (5, 3.5, 'LAPSE')
+    assert other == PersistentOrder(5, 3.5) and other != order
+    assert pickle.loads(pickle.dumps(other)) == other
+
+
+@pytest.mark.parametrize('instruction', [
+    LimitOrder(size=2, price=1.5, persistence_type='LAPSE'),
+    LimitOrderOnClose(selection_id=1, liability=2, price=3),
+    PlaceInstruction(selection_id=1, order_type='LIMIT', side='BACK',
+                     limit_order=LimitOrder(size=2, price=1.5, persistence_type='LAPSE')),
+    CancelInstruction(bet_id='1'),
+    ReplaceInstruction(bet_id='1', new_price=2.0),
+    UpdateInstruction(bet_id='1', new_persistence_type='PERSIST'),
+])
+def test_instructions_have_no_dict(instruction):
+    assert not hasattr(instruction, '__dict__')
+    assert replace(instruction).data == instruction.data
+
+
+def test_subclass_of_instruction():
+    class ValidatedPlaceInstruction(PlaceInstruction):
+        validate_price = True
+
+    with pytest.raises(ValueError):
+        ValidatedPlaceInstruction(selection_id=1, order_type='LIMIT', side='BACK',
+                                  limit_order=LimitOrder(size=2, price=2.01, persistence_type='LAPSE'))
+    instruction = ValidatedPlaceInstruction(selection_id=1, order_type='LIMIT', side='BACK')
+    assert instruction.handicap is None and instruction.data == {'selectionId': 1, 'orderType': 'LIMIT',
+                                                                 'side': 'BACK'}
@@ -0,0 +1,105 @@
+import pytest
+
+from betfair_python_rest.trading import (PRICES, TICKS_COUNT, MIN_PRICE, MAX_PRICE, is_valid_price, price_to_tick,
+                                         tick_to_price, round_price_down, round_price_up, round_price, ticks_away,
+                                         ticks_between, check_price)
+
+
+def test_ladder():
+    assert TICKS_COUNT == 350
+    assert PRICES[0] == MIN_PRICE == 1.01 and PRICES[-1] == MAX_PRICE == 1000.0
+    assert list(PRICES) == sorted(set(PRICES))
+
+
+@pytest.mark.parametrize('price, next_price', [
+    (1.01, 1.02), (1.99, 2.0), (2.0, 2.02), (2.98, 3.0), (3.0, 3.05), (4.0, 4.1), (6.0, 6.2), (10.0, 10.5),
+    (20.0, 21.0), (30.0, 32.0), (50.0, 55.0), (100.0, 110.0), (990.0, 1000.0)])
+def test_tick_sizes(price, next_price):
+    assert ticks_away(price, 1) == next_price
+    assert ticks_away(next_price, -1) == price
+
+
+def test_price_to_tick_round_trip():
+    for tick, price in enumerate(PRICES):
+        assert price_to_tick(price) == tick
+        assert tick_to_price(tick) == price
+
+
+@pytest.mark.parametrize('price, valid', [
+    (1.01, True), (1.0, False), (2.01, False), (2.02, True), (3.02, False), (1000.0, True), (1010.0, False),
+    # The float errors of arithmetic are tolerated
+    (0.1 + 0.2 + 1.2, True), (1.1 + 0.2, True), (1.105, False)])
+def test_is_valid_price(price, valid):
+    assert is_valid_price(price) == valid
+
+
+def test_invalid_price_and_tick():
+    with pytest.raises(ValueError):
+        price_to_tick(2.01)
+    with pytest.raises(ValueError):
+        tick_to_price(TICKS_COUNT)
+
+
+@pytest.mark.parametrize('price, down, up, nearest', [
+    (2.013, 2.0, 2.02, 2.02), (3.03, 3.0, 3.05, 3.05), (3.01, 3.0, 3.05, 3.0), (3.04, 3.0, 3.05, 3.05),
+    (1.0, 1.01, 1.01, 1.01), (2000.0, 1000.0, 1000.0, 1000.0), (5.5, 5.5, 5.5, 5.5)])
+def test_rounding(price, down, up, nearest):
+    assert round_price_down(price) == down
+    assert round_price_up(price) == up
+    assert round_price(price) == nearest
+
+
+def test_ticks_away_limited_by_ladder():
+    assert ticks_away(1.02, -5) == 1.01
+    assert ticks_away(990.0, 5) == 1000.0
+
+
+def test_ticks_between():
+    assert ticks_between(1.99, 2.02) == 2
+    assert ticks_between(2.02, 1.99) == -2
+
+
+def test_check_price():
+    check_price(None)
+    check_price(2.02)
+    with pytest.raises(ValueError, match='nearest valid prices are 2.0 and 2.02'):
+        check_price(2.01)
+
+
+@pytest.mark.parametrize('price', [float('nan'), float('inf'), float('-inf')])
+def test_non_finite_price(price):
+    for function in (is_valid_price, price_to_tick, round_price_down, round_price_up, round_price, check_price):
+        with pytest.raises(ValueError, match='finite'):
+            function(price)
+
+
+class TestArrays:
+    np = pytest.importorskip('numpy')
+
+    def test_valid_prices(self):
+        from betfair_python_rest.trading import valid_prices
+        assert valid_prices([1.01, 2.01, 1000.0, 0.5, 1100.0]).tolist() == [True, False, True, False, False]
+
+    def test_ticks_and_prices(self):
+        from betfair_python_rest.trading import prices_to_ticks, ticks_to_prices
+        prices = self.np.array(PRICES)
+        assert prices_to_ticks(prices).tolist() == list(range(TICKS_COUNT))
+        assert ticks_to_prices(self.np.arange(TICKS_COUNT)).tolist() == list(PRICES)
+        with pytest.raises(ValueError):
+            prices_to_ticks([2.01])
+
+    def test_rounding(self):
+        from betfair_python_rest.trading import round_prices_down, round_prices_up
+        prices = [2.01, 3.01, 1.0, 2000.0, 5.5]
+        assert round_prices_down(prices).tolist() == [round_price_down(price) for price in prices]
+        assert round_prices_up(prices).tolist() == [round_price_up(price) for price in prices]
+
+    def test_ticks_away_array(self):
+        from betfair_python_rest.trading import ticks_away_array
+        assert ticks_away_array([2.0, 2.0, 1.02], [1, -1, -5]).tolist() == [2.02, 1.99, 1.01]
+
+    def test_non_finite_prices(self):
+        from betfair_python_rest.trading import valid_prices, prices_to_ticks, round_prices_down, round_prices_up
+        for function in (valid_prices, prices_to_ticks, round_prices_down, round_prices_up):
+            with pytest.raises(ValueError, match=r'finite numbers, got \[nan, inf\]'):
+                function([2.0, float('nan'), float('inf')])